@@ -8,19 +8,21 @@ import threading
 import time
 
 import darkdetect
-import pyperclip
 from pynput import keyboard as pykeyboard
 from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtCore import QLocale, Signal, Slot
 from PySide6.QtGui import QCursor, QGuiApplication
 from PySide6.QtWidgets import QApplication, QMessageBox
 
+import desktop_io
+import telemetry
 import ui.AboutWindow
 import ui.CustomPopupWindow
 import ui.OnboardingWindow
 import ui.ResponseWindow
 import ui.SettingsWindow
 from aiprovider import GeminiProvider, OllamaProvider, OpenAICompatibleProvider
+from rate_limiter import RequestCancelled, estimate_tokens
 from update_checker import UpdateChecker
 
 _ = gettext.gettext
@@ -34,6 +36,7 @@ class WritingToolApp(QtWidgets.QApplication):
     show_message_signal = Signal(str, str)  # a signal for showing message boxes
     hotkey_triggered_signal = Signal()
     followup_response_signal = Signal(str)
+    provider_status_signal = Signal(str)  # the current provider's model status changed
 
 
     def __init__(self, argv):
@@ -43,6 +46,7 @@ class WritingToolApp(QtWidgets.QApplication):
         self.output_ready_signal.connect(self.replace_text)
         self.show_message_signal.connect(self.show_message_box)
         self.hotkey_triggered_signal.connect(self.on_hotkey_pressed)
+        self.provider_status_signal.connect(self.show_provider_status)
         self.config = None
         self.config_path = None
         self.load_config()
@@ -160,6 +164,7 @@ class WritingToolApp(QtWidgets.QApplication):
         Load the configuration file.
         """
         self.config_path = os.path.join(os.path.dirname(sys.argv[0]), 'config.json')
+        telemetry.configure_telemetry(os.path.join(os.path.dirname(sys.argv[0]), 'telemetry.jsonl'))
         logging.debug(f'Loading config from {self.config_path}')
         if os.path.exists(self.config_path):
             with open(self.config_path, 'r') as f:
@@ -266,6 +271,8 @@ class WritingToolApp(QtWidgets.QApplication):
             logging.debug("Cancelling current provider's request")
             self.current_provider.cancel()
             self.output_queue = ""
+            # Load a local model that went idle while the user is still picking an option.
+            self.current_provider.warm_up()
 
         # noinspection PyTypeChecker
         QtCore.QMetaObject.invokeMethod(self, "_show_popup", QtCore.Qt.ConnectionType.QueuedConnection)
@@ -276,13 +283,13 @@ class WritingToolApp(QtWidgets.QApplication):
         Show the popup window when the hotkey is pressed.
         """
         logging.debug('Showing popup window')
-        # First attempt with default sleep
+        # Returns as soon as the clipboard changes; slow applications get up to the full timeout
         selected_text = self.get_selected_text()
 
-        # Retry with longer sleep if no text captured
+        # Retry, giving the application longer, if no text was captured
         if not selected_text:
-            logging.debug('No text captured, retrying with longer sleep')
-            selected_text = self.get_selected_text(sleep_duration=0.5)
+            logging.debug('No text captured, retrying and waiting longer for the clipboard')
+            selected_text = self.get_selected_text(settle=0.5)
 
         logging.debug(f'Selected text: "{selected_text}"')
         try:
@@ -329,52 +336,31 @@ class WritingToolApp(QtWidgets.QApplication):
         except Exception as e:
             logging.error(f'Error showing popup window: {e}', exc_info=True)
 
-    def get_selected_text(self, sleep_duration=0.2):
+    @Slot(str)
+    def show_provider_status(self, status):
+        """
+        Show the current provider's model status in the tray tooltip and the open popup.
+        """
+        if self.tray_icon:
+            self.tray_icon.setToolTip(f"WritingTools\n{status}" if status else "WritingTools")
+        if self.popup_window is not None:
+            self.popup_window.set_provider_status(status)
+
+    def get_selected_text(self, timeout=0.7, settle=0.0):
         """
         Get the currently selected text from any application.
         Args:
-            sleep_duration (float): Time to wait for clipboard update
+            timeout (float): Longest time to wait for the clipboard update
+            settle (float): Extra time to wait for text when the clipboard is still empty
         """
-        # Backup the clipboard
-        clipboard_backup = pyperclip.paste()
-        logging.debug(f'Clipboard backup: "{clipboard_backup}" (sleep: {sleep_duration}s)')
-
-        # Clear the clipboard
-        self.clear_clipboard()
-
-        # Simulate Ctrl+C
-        logging.debug('Simulating Ctrl+C')
-        kbrd = pykeyboard.Controller()
-
-        def press_ctrl_c():
-            kbrd.press(pykeyboard.Key.ctrl.value)
-            kbrd.press('c')
-            kbrd.release('c')
-            kbrd.release(pykeyboard.Key.ctrl.value)
-
-        press_ctrl_c()
-
-        # Wait for the clipboard to update
-        time.sleep(sleep_duration)
-        logging.debug(f'Waited {sleep_duration}s for clipboard')
-
-        # Get the selected text
-        selected_text = pyperclip.paste()
-
-        # Restore the clipboard
-        pyperclip.copy(clipboard_backup)
-
-        return selected_text
+        return desktop_io.copy_selection(timeout, settle)
 
     @staticmethod
     def clear_clipboard():
         """
         Clear the system clipboard.
         """
-        try:
-            pyperclip.copy('')
-        except Exception as e:
-            logging.error(f'Error clearing clipboard: {e}')
+        desktop_io.clear_clipboard()
 
     def process_option(self, option, selected_text, custom_change=None):
         """
@@ -404,7 +390,8 @@ class WritingToolApp(QtWidgets.QApplication):
             if hasattr(self, 'current_response_window'):
                 delattr(self, 'current_response_window')
                 
-        threading.Thread(target=self.process_option_thread, args=(option, selected_text, custom_change), daemon=True).start()
+        threading.Thread(target=telemetry.labelled(option, self.process_option_thread),
+                         args=(option, selected_text, custom_change), daemon=True).start()
 
     def process_option_thread(self, option, selected_text, custom_change=None):
             """
@@ -460,6 +447,8 @@ class WritingToolApp(QtWidgets.QApplication):
                     self.current_provider.get_response(system_instruction, prompt)
                     logging.debug('Response processed')
 
+            except RequestCancelled:
+                logging.debug(f'Request for option {option} was cancelled')
             except Exception as e:
                 logging.error(f'An error occurred: {e}', exc_info=True)
 
@@ -521,20 +510,7 @@ class WritingToolApp(QtWidgets.QApplication):
                         })
                 else:
                     # For other options, use the original clipboard-based replacement
-                    clipboard_backup = pyperclip.paste()
-                    cleaned_text = self.output_queue.rstrip('\n')
-                    pyperclip.copy(cleaned_text)
-                    
-                    kbrd = pykeyboard.Controller()
-                    def press_ctrl_v():
-                        kbrd.press(pykeyboard.Key.ctrl.value)
-                        kbrd.press('v')
-                        kbrd.release('v')
-                        kbrd.release(pykeyboard.Key.ctrl.value)
-
-                    press_ctrl_v()
-                    time.sleep(0.2)
-                    pyperclip.copy(clipboard_backup)
+                    desktop_io.paste_text(self.output_queue.rstrip('\n'))
 
                 if not hasattr(self, 'current_response_window'):
                     self.output_queue = ""
@@ -561,7 +537,9 @@ class WritingToolApp(QtWidgets.QApplication):
         else:
             self.tray_icon = QtWidgets.QSystemTrayIcon(QtGui.QIcon(icon_path), self)
         # Set the tooltip (hover name) for the tray icon
-        self.tray_icon.setToolTip("WritingTools")
+        provider = getattr(self, "current_provider", None)
+        status = provider.status_text() if provider else None
+        self.tray_icon.setToolTip(f"WritingTools\n{status}" if status else "WritingTools")
         self.tray_menu = QtWidgets.QMenu()
         self.tray_icon.setContextMenu(self.tray_menu)
 
@@ -642,16 +620,17 @@ class WritingToolApp(QtWidgets.QApplication):
     
     b) OpenAI-compatible:
         - Uses standard OpenAI message array format
-        - Includes system instruction and full conversation history
+        - Includes system instruction and the token-budgeted conversation window
         - Properly maps internal roles to OpenAI roles
 
     3. Flow:
     a) User asks follow-up question
     b) Question is added to chat history
-    c) Full history is formatted for the current provider
+    c) Recent history (older turns folded into a rolling summary) is formatted for the current provider
     d) Response is generated while maintaining context
     e) Response is displayed in chat UI
     f) New response is added to history for future context
+    g) Once the verbatim history outgrows its token budget, older turns are folded into the summary
 
     4. Threading:
     - Runs in a separate thread to prevent UI freezing
@@ -679,14 +658,15 @@ class WritingToolApp(QtWidgets.QApplication):
                     self.show_message_signal.emit('Error', 'Chat history not found')
                     return
 
-                # Add current question to chat history
-                response_window.chat_history.append({
-                    "role": "user",
-                    "content": question
-                })
+                # Add current question to chat history (send_message() usually has already)
+                if response_window.chat_history[-1] != {"role": "user", "content": question}:
+                    response_window.chat_history.append({
+                        "role": "user",
+                        "content": question
+                    })
                 
-                # Get chat history
-                history = response_window.chat_history.copy()
+                # Only the recent turns are sent verbatim; older ones are folded into a summary
+                history = response_window.conversation.messages(response_window.chat_history)
                 
                 # System instruction based on original option
                 system_instruction = "You are a helpful AI assistant. Provide clear and direct responses, maintaining the same format and style as your previous responses. If appropriate, use Markdown formatting to make your response more readable."
@@ -699,19 +679,23 @@ class WritingToolApp(QtWidgets.QApplication):
                     chat_messages = []
                     
                     # Convert our roles to Gemini's expected roles
-                    for msg in history:
+                    for msg in history[:-1]:
                         gemini_role = "model" if msg["role"] == "assistant" else "user"
                         chat_messages.append({
                             "role": gemini_role,
                             "parts": msg["content"]
                         })
                     
-                    # Start chat with history
+                    # Start chat with history; the question itself is sent as the new message
                     chat = self.current_provider.model.start_chat(history=chat_messages)
                     
                     # Get response using the chat
-                    response = chat.send_message(question)
-                    response_text = response.text
+                    response_text = self.current_provider.send_request(
+                        lambda cancelled: GeminiProvider.collect_stream(
+                            chat.send_message(history[-1]["content"], stream=True), cancelled,
+                            self.current_provider),
+                        tokens=estimate_tokens(*(msg["content"] for msg in history))
+                    )
 
                 elif isinstance(self.current_provider, OllamaProvider):  #
                     # For Ollama, prepare messages with system instruction and history
@@ -758,6 +742,16 @@ class WritingToolApp(QtWidgets.QApplication):
                 # Emit response via signal
                 self.followup_response_signal.emit(response_text)
 
+                # While the user reads the reply, fold older turns into the summary if needed.
+                # A background copy keeps the summary request out of the provider's request slot,
+                # so cancelling the next follow-up cannot abort it (or the reverse).
+                response_window.conversation.compact(response_window.chat_history,
+                                                     self.current_provider.background_copy().generate)
+
+            except RequestCancelled:
+                logging.debug('Follow-up question was cancelled')
+                response_window.chat_history.pop()
+                self.followup_response_signal.emit("")
             except Exception as e:
                 logging.error(f'Error processing follow-up question: {e}', exc_info=True)
 
@@ -769,7 +763,7 @@ class WritingToolApp(QtWidgets.QApplication):
                     self.followup_response_signal.emit("Sorry, an error occurred while processing your question.")
 
         # Start the thread
-        threading.Thread(target=process_thread, daemon=True).start()
+        threading.Thread(target=telemetry.labelled('Follow-up', process_thread), daemon=True).start()
 
     def show_settings(self, providers_only=False):
 
@@ -28,11 +28,41 @@ Response Flow:
    • For direct text replacement, the provider emits the full text via the output_ready_signal.
    • Conversation history (for follow-up questions) is maintained by the main app.
 
-Note: Streaming has been fully removed throughout the code.
+Rate Limits:
+   • Every provider call goes through rate_limiter.call_with_retries(), so requests queue behind a
+     per provider/model budget and 429 / 5xx errors are retried instead of failing immediately.
+   • OpenAI-compatible replies pass their x-ratelimit-* headers on, so the budget follows the server's.
+
+Cancellation:
+   • Requests run through AIProvider.send_request(). cancel() aborts the in-flight request: the
+     provider closes its connection and get_response() raises RequestCancelled, so a stale
+     result is never pasted.
+
+Prompt Caching:
+   • System instructions are sent first and unchanged between calls so providers can reuse them
+     from their prompt-prefix cache. record_usage() logs how many prompt tokens were cached.
+
+Telemetry:
+   • send_request() times every request (first chunk, total latency, retries, token usage) and
+     records it with telemetry.py. Providers call first_token() when the first chunk arrives.
+
+Warm-up:
+   • The app calls warm_up() when the hotkey is pressed, before the user picks an option, so a
+     local model that was unloaded while idle is loaded again in the meantime. status_text() is
+     shown in the popup and the tray tooltip.
+
+Note: Streaming has been removed from the UI. Providers read responses as a stream internally
+only so a cancelled request can stop between chunks; callers always get the full text.
 """
 
+import copy
 import logging
+import re
+import socket
+import threading
+import time
 import webbrowser
+from contextlib import closing
 from abc import ABC, abstractmethod
 from typing import List
 
@@ -43,6 +73,8 @@ from ollama import Client as OllamaClient
 from openai import OpenAI
 from PySide6 import QtWidgets
 from PySide6.QtWidgets import QVBoxLayout
+from rate_limiter import RequestCancelled, call_with_retries, estimate_tokens, get_rate_limiter
+from telemetry import RequestTrace, error_kind, first_token
 from ui.UIUtils import colorMode
 
 
@@ -150,9 +182,11 @@ class AIProvider(ABC):
     
     All providers must implement:
       • get_response(system_instruction, prompt) -> str
+      • generate(system_instruction, prompt) -> str, the same request without UI error reporting
       • after_load() to create their client or model instance
       • before_load() to cleanup any existing client
-      • cancel() to cancel an ongoing request
+
+    Providers may override abort_connection() so cancel() can close an in-flight connection.
     """
     def __init__(self, app, provider_name: str, settings: List[AIProviderSetting],
                  description: str = "An unfinished AI provider!",
@@ -166,6 +200,49 @@ class AIProvider(ABC):
         self.logo = logo
         self.button_text = button_text
         self.button_action = button_action
+        self.request_lock = threading.Lock()
+        self.active_request = None
+        self.last_usage = None
+        self.background_of = None  # the provider this one is a background_copy() of
+
+    def background_copy(self):
+        """
+        This provider with its own request state, for background work such as summarising a
+        conversation: cancel() on the original then never aborts it, and it never clears the
+        original's live response or overwrites its usage. The API client is shared.
+        """
+        clone = copy.copy(self)
+        clone.request_lock = threading.Lock()
+        clone.active_request = None
+        clone.last_usage = None
+        clone.background_of = self
+        if hasattr(clone, 'live_response'):
+            clone.live_response = None
+        return clone
+
+    # Client-side budget for providers that do not set their own: OpenAI's tier-1 limits for
+    # gpt-4o-mini. Servers that send x-ratelimit-* headers replace it with their real limits.
+    REQUESTS_PER_MINUTE = 500
+    TOKENS_PER_MINUTE = 200_000
+
+    def requests_per_minute(self) -> float:
+        """
+        Client-side request budget for the current model (429s are still retried).
+        """
+        return self.REQUESTS_PER_MINUTE
+
+    def tokens_per_minute(self) -> float:
+        """
+        Client-side token budget (prompt plus expected output) for the current model.
+        """
+        return self.TOKENS_PER_MINUTE
+
+    def rate_limiter(self):
+        """
+        Shared limiter for this provider and its current model.
+        """
+        model = getattr(self, 'model_name', None) or getattr(self, 'api_model', '')
+        return get_rate_limiter(self.provider_name, model, self.requests_per_minute(), self.tokens_per_minute())
 
     @abstractmethod
     def get_response(self, system_instruction: str, prompt: str) -> str:
@@ -174,6 +251,14 @@ class AIProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    def generate(self, system_instruction: str, prompt) -> str:
+        """
+        Return the model's reply to prompt without touching the UI: errors are raised, not shown.
+        Used for background work such as summarising a long conversation.
+        """
+        pass
+
     def load_config(self, config: dict):
         """
         Load configuration settings into the provider.
@@ -210,23 +295,121 @@ class AIProvider(ABC):
         """
         pass
 
-    @abstractmethod
+    def send_request(self, func, tokens: int = 0):
+        """
+        Run func(cancelled) as this provider's current request: rate limited, retried on 429s,
+        and aborted by cancel(). func should stop reading once the cancelled event is set.
+        Raises RequestCancelled if the request was cancelled before it finished.
+        """
+        cancelled = threading.Event()
+        with self.request_lock:
+            self.active_request = cancelled
+        model = getattr(self, 'model_name', None) or getattr(self, 'api_model', '')
+        trace = RequestTrace(self.provider_name, model)
+        self.last_usage = None
+        try:
+            with trace.active():
+                result = call_with_retries(self.rate_limiter(), lambda: func(cancelled), tokens=tokens,
+                                           cancelled=cancelled, on_retry=trace.retried)
+        except RequestCancelled:
+            trace.finish('cancelled')
+            raise
+        except Exception as e:
+            trace.finish(error_kind(e))
+            raise
+        finally:
+            with self.request_lock:
+                if self.active_request is cancelled:
+                    self.active_request = None
+        if cancelled.is_set():
+            trace.finish('cancelled')
+            raise RequestCancelled()
+        trace.finish(usage=self.last_usage, output=result if isinstance(result, str) else None)
+        return result
+
     def cancel(self):
         """
-        Cancel any ongoing API request.
+        Cancel the ongoing API request (if any) and close its connection.
+        """
+        with self.request_lock:
+            cancelled, self.active_request = self.active_request, None
+        if cancelled is None:
+            return
+        cancelled.set()
+        try:
+            self.abort_connection()
+        except Exception as e:
+            logging.debug(f'Error while aborting {self.provider_name} request: {e}')
+
+    def warm_up(self):
+        """
+        Get the model ready for a request that is probably about to come (e.g. the popup just
+        opened). Must return at once; by default there is nothing to warm up.
         """
         pass
 
+    def status_text(self):
+        """
+        Short model status to show in the popup and tray tooltip, or None if there is nothing to say.
+        """
+        return None
+
+    def abort_connection(self):
+        """
+        Close the connection of the request being cancelled. By default the request only stops
+        at its next chunk; providers override this when their SDK exposes the connection.
+        """
+        pass
+
+    def record_usage(self, prompt_tokens: int, cached_tokens: int = 0, output_tokens: int = 0):
+        """
+        Remember and log the token usage the server reported for the last request, including
+        how many prompt tokens were served from its prefix cache.
+        """
+        self.last_usage = {"prompt_tokens": prompt_tokens, "cached_tokens": cached_tokens,
+                           "output_tokens": output_tokens}
+        logging.debug(f'{self.provider_name} usage: {prompt_tokens} prompt tokens '
+                      f'({cached_tokens} cached), {output_tokens} output tokens')
+
+
+def shutdown_http_response(response):
+    """
+    Shut down the socket behind an httpx response so a read blocked in another thread returns at once.
+    """
+    try:
+        stream = response.extensions.get("network_stream")
+        sock = stream.get_extra_info("socket") if stream is not None else None
+        if sock is not None:
+            sock.shutdown(socket.SHUT_RDWR)
+    except (AttributeError, OSError):
+        pass
+    response.close()
+
 
 class GeminiProvider(AIProvider):
     """
     Provider for Google's Gemini API.
     
     Uses google.generativeai.GenerativeModel.generate_content() to generate text.
-    Streaming is no longer offered so we always do a single-shot call.
+    The reply is read as a stream only so a cancelled request stops between chunks.
     """
+    # Free-tier requests and tokens per minute, matching the model descriptions below.
+    REQUESTS_PER_MINUTE = {
+        "gemini-2.0-flash-lite-preview-02-05": 30,
+        "gemini-2.0-flash": 15,
+        "gemini-2.0-flash-thinking-exp-01-21": 10,
+        "gemini-2.0-pro-exp-02-05": 2,
+    }
+    TOKENS_PER_MINUTE = {
+        "gemini-2.0-flash-lite-preview-02-05": 1_000_000,
+        "gemini-2.0-flash": 1_000_000,
+        "gemini-2.0-flash-thinking-exp-01-21": 4_000_000,
+        "gemini-2.0-pro-exp-02-05": 1_000_000,
+    }
+    # Output cap shared by the Gemini 2.0 models offered below.
+    MAX_OUTPUT_TOKENS = 8192
+
     def __init__(self, app):
-        self.close_requested = False
         self.model = None
 
         settings = [
@@ -256,20 +439,14 @@ class GeminiProvider(AIProvider):
         """
         Generate content using Gemini.
         
-        Always performs a single-shot request with streaming disabled.
         Returns the full response text if return_response is True,
         otherwise emits the text via the output_ready_signal.
+        Raises RequestCancelled if cancel() is called before the reply is complete.
         """
-        self.close_requested = False
-
-        # Single-shot call with streaming disabled
-        response = self.model.generate_content(
-            contents=[system_instruction, prompt],
-            stream=False
-        )
+        response_text = self.generate(system_instruction, prompt)
 
         try:
-            response_text = response.text.rstrip('\n')
+            response_text = response_text.rstrip('\n')
             if not return_response and not hasattr(self.app, 'current_response_window'):
                 self.app.output_ready_signal.emit(response_text)
                 self.app.replace_text(True)
@@ -278,11 +455,59 @@ class GeminiProvider(AIProvider):
         except Exception as e:
             logging.error(f"Error processing Gemini response: {e}")
             self.app.output_ready_signal.emit("An error occurred while processing the response.")
-        finally:
-            self.close_requested = False
 
         return ""
 
+    def generate(self, system_instruction: str, prompt: str) -> str:
+        """
+        Return Gemini's reply, queued behind the model's rate limit.
+        """
+        return self.send_request(
+            lambda cancelled: self.collect_stream(
+                self.model.generate_content(
+                    contents=[system_instruction, prompt],
+                    generation_config={"max_output_tokens": self.output_token_budget(prompt)},
+                    stream=True), cancelled, self),
+            tokens=estimate_tokens(system_instruction, prompt) + self.output_token_budget(prompt)
+        )
+
+    @staticmethod
+    def collect_stream(response, cancelled: threading.Event, provider=None) -> str:
+        """
+        Join a streamed Gemini response, stopping early once cancelled is set.
+        If provider is given, the usage reported with the response is recorded on it.
+        """
+        parts = []
+        for chunk in response:
+            if cancelled.is_set():
+                break
+            first_token()
+            parts.append(chunk.text)
+        usage = getattr(response, 'usage_metadata', None)
+        if provider is not None and usage:
+            try:
+                # Older SDKs and models without context caching leave fields out; accounting
+                # must never fail the request.
+                provider.record_usage(getattr(usage, 'prompt_token_count', 0) or 0,
+                                      getattr(usage, 'cached_content_token_count', 0) or 0,
+                                      getattr(usage, 'candidates_token_count', 0) or 0)
+            except Exception as e:
+                logging.debug(f'Could not read Gemini usage: {e}')
+        return "".join(parts)
+
+    def output_token_budget(self, prompt: str) -> int:
+        """
+        max_output_tokens for a rewrite of prompt: about twice its estimated size,
+        never below the old fixed 1000 and never above the model's cap.
+        """
+        return min(self.MAX_OUTPUT_TOKENS, max(1000, 2 * estimate_tokens(prompt) + 256))
+
+    def requests_per_minute(self) -> float:
+        return self.REQUESTS_PER_MINUTE.get(self.model_name, 2)
+
+    def tokens_per_minute(self) -> float:
+        return self.TOKENS_PER_MINUTE.get(self.model_name, 1_000_000)
+
     def after_load(self):
         """
         Configure the google.generativeai client and create the generative model.
@@ -292,7 +517,7 @@ class GeminiProvider(AIProvider):
             model_name=self.model_name,
             generation_config=genai.types.GenerationConfig(
                 candidate_count=1,
-                max_output_tokens=1000,
+                max_output_tokens=self.MAX_OUTPUT_TOKENS,
                 temperature=0.5
             ),
             safety_settings={
@@ -307,20 +532,17 @@ class GeminiProvider(AIProvider):
     def before_load(self):
         self.model = None
 
-    def cancel(self):
-        self.close_requested = True
-
 
 class OpenAICompatibleProvider(AIProvider):
     """
     Provider for OpenAI-compatible APIs.
     
     Uses self.client.chat.completions.create() to obtain a response.
-    Streaming is fully removed.
+    The reply is read as a stream only so cancel() can shut its connection down.
     """
     def __init__(self, app):
-        self.close_requested = None
         self.client = None
+        self.live_response = None
 
         settings = [
             TextSetting(name="api_key", display_name="API Key", description="API key for the OpenAI-compatible API."),
@@ -338,34 +560,20 @@ class OpenAICompatibleProvider(AIProvider):
         """
         Send a chat request to the OpenAI-compatible API.
         
-        Always performs a non-streaming request.
         If prompt is not a list, builds a simple two-message conversation.
         Returns the response text if return_response is True,
         otherwise emits it via output_ready_signal.
+        Raises RequestCancelled if cancel() is called before the reply is complete.
         """
-        self.close_requested = False
-
-        if isinstance(prompt, list):
-            messages = prompt
-        else:
-            messages = [
-                {"role": "system", "content": system_instruction},
-                {"role": "user", "content": prompt}
-            ]
-
         try:
-            response = self.client.chat.completions.create(
-                model=self.api_model,
-                messages=messages,
-                temperature=0.5,
-                stream=False
-            )
-            response_text = response.choices[0].message.content.strip()
+            response_text = self.generate(system_instruction, prompt).strip()
 
             if not return_response and not hasattr(self.app, 'current_response_window'):
                 self.app.output_ready_signal.emit(response_text)
             return response_text
 
+        except RequestCancelled:
+            raise
         except Exception as e:
             error_str = str(e)
             logging.error(f"Error while generating content: {error_str}")
@@ -378,19 +586,69 @@ class OpenAICompatibleProvider(AIProvider):
                 self.app.show_message_signal.emit("Error", f"An error occurred: {error_str}")
             return ""
 
+    def generate(self, system_instruction: str, prompt: str | list) -> str:
+        """
+        Return the reply to prompt (a string, or a full messages list).
+        """
+        if isinstance(prompt, list):
+            messages = prompt
+        else:
+            messages = [
+                {"role": "system", "content": system_instruction},
+                {"role": "user", "content": prompt}
+            ]
+
+        def request(cancelled):
+            extra = {}
+            if "api.openai.com" in (self.api_base or ""):
+                # Only OpenAI is known to accept this; it adds a final chunk with token usage.
+                extra["stream_options"] = {"include_usage": True}
+            stream = self.client.chat.completions.create(
+                model=self.api_model,
+                messages=messages,
+                temperature=0.5,
+                stream=True,
+                **extra
+            )
+            self.live_response = stream.response
+            self.rate_limiter().update_from_headers(stream.response.headers)
+            parts = []
+            try:
+                with stream:
+                    for chunk in stream:
+                        if cancelled.is_set():
+                            break
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            first_token()
+                            parts.append(chunk.choices[0].delta.content)
+                        usage = getattr(chunk, 'usage', None)
+                        if usage:
+                            details = getattr(usage, 'prompt_tokens_details', None)
+                            self.record_usage(getattr(usage, 'prompt_tokens', 0) or 0,
+                                              getattr(details, 'cached_tokens', 0) or 0,
+                                              getattr(usage, 'completion_tokens', 0) or 0)
+            finally:
+                self.live_response = None
+            return "".join(parts)
+
+        return self.send_request(request, tokens=estimate_tokens(messages))
+
     def after_load(self):
         self.client = OpenAI(
             api_key=self.api_key,
             base_url=self.api_base,
             organization=self.api_organisation,
-            project=self.api_project
+            project=self.api_project,
+            max_retries=0  # retries are handled by call_with_retries()
         )
 
     def before_load(self):
         self.client = None
 
-    def cancel(self):
-        self.close_requested = True
+    def abort_connection(self):
+        response = self.live_response
+        if response is not None:
+            shutdown_http_response(response)
 
 
 class OllamaProvider(AIProvider):
@@ -398,10 +656,15 @@ class OllamaProvider(AIProvider):
     Provider for connecting to an Ollama server.
     
     Uses the /chat endpoint of the Ollama server to generate a response.
-    Streaming is not used.
+    The reply is read as a stream only so a cancelled request stops (and frees the model) at the next token.
+
+    Ollama unloads an idle model after keep_alive, and loading it again takes seconds. Every request
+    sends the keep_alive setting, and warm_up() loads the model in the background (an empty chat
+    request generates nothing) when the provider is loaded and whenever the hotkey is pressed,
+    unless the model should still be resident.
     """
+    STATUS_TEXT = {"cold": "not loaded", "loading": "loading…", "ready": "ready", "error": "unreachable"}
     def __init__(self, app):
-        self.close_requested = None
         self.client = None
         self.app = app
         settings = [
@@ -413,17 +676,34 @@ class OllamaProvider(AIProvider):
             "• Connect to an Ollama server (local LLM).",
             "ollama", "Ollama Set-up Instructions",
             lambda: webbrowser.open("https://github.com/theJayTea/WritingTools?tab=readme-ov-file#-optional-ollama-local-llm-instructions-for-windows-v7-onwards"))
+        self.status = "cold"
+        self.resident_until = 0.0  # time.monotonic() until which the model should stay loaded
+        self.warming = False
 
     def get_response(self, system_instruction: str, prompt: str | list, return_response: bool = False) -> str:
         """
         Send a chat request to the Ollama server.
         
-        Always performs a non-streaming request.
         Returns the response text if return_response is True,
         otherwise emits it via output_ready_signal.
+        Raises RequestCancelled if cancel() is called before the reply is complete.
         """
-        self.close_requested = False
+        try:
+            response_text = self.generate(system_instruction, prompt).strip()
+            if not return_response and not hasattr(self.app, 'current_response_window'):
+                self.app.output_ready_signal.emit(response_text)
+            return response_text
+        except RequestCancelled:
+            raise
+        except Exception as e:
+            logging.error(f"Error during Ollama chat: {e}")
+            self.app.output_ready_signal.emit("An error occurred during Ollama chat.")
+            return ""
 
+    def generate(self, system_instruction: str, prompt: str | list) -> str:
+        """
+        Return the reply to prompt (a string, or a full messages list).
+        """
         if isinstance(prompt, list):
             messages = prompt
         else:
@@ -432,22 +712,104 @@ class OllamaProvider(AIProvider):
                 {"role": "user", "content": prompt}
             ]
 
+        def request(cancelled):
+            parts = []
+            with closing(self.client.chat(model=self.api_model, messages=messages, stream=True,
+                                          keep_alive=self.keep_alive_value())) as stream:
+                for chunk in stream:
+                    if cancelled.is_set():
+                        break
+                    first_token()
+                    parts.append(chunk['message']['content'])
+                    if chunk.get('done'):
+                        # Ollama reuses the KV cache of a matching prefix and only counts
+                        # the prompt tokens it actually had to evaluate.
+                        self.record_usage(chunk.get('prompt_eval_count') or 0, 0, chunk.get('eval_count') or 0)
+            return "".join(parts)
+
+        response = self.send_request(request, tokens=estimate_tokens(messages))
+        self.mark_resident()
+        return response
+
+    def keep_alive_value(self):
+        """
+        keep_alive to send to Ollama. The setting is in minutes (negative keeps the model loaded
+        until Ollama stops); a duration such as "1h" is passed through; empty uses the server default.
+        """
+        value = str(getattr(self, 'keep_alive', '') or '').strip()
+        if not value:
+            return None
         try:
-            response = self.client.chat(model=self.api_model, messages=messages)
-            response_text = response['message']['content'].strip()
-            if not return_response and not hasattr(self.app, 'current_response_window'):
-                self.app.output_ready_signal.emit(response_text)
-            return response_text
-        except Exception as e:
-            logging.error(f"Error during Ollama chat: {e}")
-            self.app.output_ready_signal.emit("An error occurred during Ollama chat.")
-            return ""
+            minutes = float(value)
+        except ValueError:
+            return value
+        return -1 if minutes < 0 else f"{minutes:g}m"
+
+    def keep_alive_seconds(self):
+        """
+        How long Ollama keeps the model loaded after a request (inf if forever).
+        """
+        value = self.keep_alive_value()
+        if value is None:
+            return 300.0  # Ollama's default
+        if value == -1:
+            return float('inf')
+        match = re.fullmatch(r'(-?[\d.]+)\s*(ms|s|m|h)?', value)
+        if not match:
+            return 300.0
+        amount = float(match.group(1))
+        if amount < 0:
+            return float('inf')
+        return amount * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[match.group(2) or "s"]
+
+    def mark_resident(self):
+        owner = self.background_of or self  # the model status shown is the original provider's
+        owner.resident_until = time.monotonic() + self.keep_alive_seconds()
+        owner.set_status("ready")
+
+    def set_status(self, status):
+        if status != self.status:
+            self.status = status
+            self.app.provider_status_signal.emit(self.status_text())
+
+    def status_text(self):
+        if self.status == "ready" and time.monotonic() >= self.resident_until:
+            self.status = "cold"
+        return f"{self.api_model}: {self.STATUS_TEXT[self.status]}"
+
+    def warm_up(self):
+        """
+        Load the model in the background unless it should still be resident or is already loading.
+        """
+        client = self.client
+        if client is None or self.warming or self.keep_alive_seconds() <= 0:
+            return
+        if self.status == "ready" and time.monotonic() < self.resident_until:
+            return
+        self.warming = True
+        self.set_status("loading")
+
+        def load():
+            try:
+                start = time.monotonic()
+                client.chat(model=self.api_model, messages=[], keep_alive=self.keep_alive_value())
+                logging.debug(f'Ollama model {self.api_model} loaded in {time.monotonic() - start:.1f}s')
+                if client is self.client:
+                    self.mark_resident()
+            except Exception as e:
+                logging.warning(f'Could not pre-load Ollama model {self.api_model}: {e}')
+                if client is self.client:
+                    self.set_status("error")
+            finally:
+                self.warming = False
+
+        threading.Thread(target=load, daemon=True).start()
 
     def after_load(self):
         self.client = OllamaClient(host=self.api_base)
+        self.resident_until = 0.0
+        self.status = "cold"
+        self.warm_up()
 
     def before_load(self):
         self.client = None
-
-    def cancel(self):
-        self.close_requested = True
@@ -0,0 +1,104 @@
+"""
+Token-budgeted conversation window for follow-up questions.
+
+Re-sending a whole chat (including the original selected text) on every follow-up makes each
+question slower and costlier than the last. ConversationWindow keeps the most recent messages
+verbatim and folds everything older into a rolling summary, so the payload per follow-up stays
+roughly flat however long the conversation gets.
+
+The summary is updated incrementally: each fold only summarises the previous summary plus the
+messages that just dropped out of the verbatim tail, and folding happens only when that tail
+outgrows its token budget.
+"""
+
+import logging
+import threading
+
+from rate_limiter import RequestCancelled, estimate_tokens
+
+SUMMARY_INSTRUCTION = (
+    "You maintain a running summary of a conversation between a user and an AI writing assistant. "
+    "Merge the new messages into the existing summary. Keep every fact, name, number, decision and "
+    "requirement needed to continue the conversation, and keep any text the user is working on "
+    "close to verbatim if it is short. Reply with the updated summary only."
+)
+
+
+class ConversationWindow:
+    """
+    The part of a chat history that is actually sent with a follow-up question.
+
+    The last keep_messages messages are always sent verbatim; older messages stay verbatim until
+    the tail exceeds budget_tokens, then compact() folds them into the summary.
+    """
+    def __init__(self, budget_tokens: int = 3000, keep_messages: int = 4):
+        self.budget_tokens = budget_tokens
+        self.keep_messages = keep_messages
+        self.summary = ""
+        self.summarized = 0  # Leading history messages already folded into the summary
+        self.lock = threading.Lock()
+
+    def messages(self, history: list) -> list:
+        """
+        Messages to send for history: the verbatim tail, with the summary (if any) prepended to its
+        first message. Does not wait for a compaction that is still running; until it finishes the
+        tail is just longer.
+        """
+        with self.lock:
+            if self.summarized > len(history):
+                # The history was replaced (e.g. a new initial response); start over.
+                self.summary, self.summarized = "", 0
+            tail = [dict(msg) for msg in history[self.summarized:]]
+            if self.summary and tail:
+                tail[0]["content"] = (f"Summary of our conversation so far:\n{self.summary}\n\n"
+                                      f"---\n\n{tail[0]['content']}")
+            return tail
+
+    def compact(self, history: list, summarize) -> None:
+        """
+        Fold the oldest messages into the summary once the verbatim tail is over budget.
+
+        summarize(system_instruction, prompt) -> str is normally the provider's get_response.
+        It runs outside the lock; its result is only kept if nothing else was folded meanwhile.
+        On failure the messages simply stay verbatim and are folded on a later call.
+        """
+        with self.lock:
+            if self.summarized > len(history):
+                self.summary, self.summarized = "", 0
+            start = self.summarized
+            tail = history[start:]
+            if estimate_tokens(*(msg["content"] for msg in tail)) <= self.budget_tokens:
+                return
+
+            # Fold whole turns, so the verbatim tail still starts with a user message.
+            cut = len(history) - self.keep_messages
+            while cut > start and history[cut]["role"] != "user":
+                cut -= 1
+            if cut <= start:
+                return
+
+            folded = [dict(msg) for msg in history[start:cut]]
+            previous = self.summary
+
+        transcript = "\n\n".join(f"{msg['role'].capitalize()}: {msg['content']}" for msg in folded)
+        prompt = (f"Existing summary:\n{previous or '(none yet)'}\n\n"
+                  f"New messages:\n{transcript}")
+        try:
+            summary = summarize(SUMMARY_INSTRUCTION, prompt)
+        except RequestCancelled:
+            logging.debug('Conversation compaction was cancelled')
+            return
+        except Exception as e:
+            logging.warning(f'Could not summarise earlier conversation: {e}')
+            return
+        if not summary or not summary.strip():
+            return
+
+        with self.lock:
+            if (self.summarized, self.summary) != (start, previous) or history[start:cut] != folded:
+                # Another compaction won, or the history was replaced while we waited.
+                logging.debug('Dropped a conversation summary that was overtaken')
+                return
+            self.summary, self.summarized = summary.strip(), cut
+            logging.debug(f'Folded conversation up to message {cut} into a '
+                          f'{estimate_tokens(self.summary)}-token summary')
@@ -0,0 +1,195 @@
+"""
+Copy the selection from, and paste text into, the focused application.
+
+Key presses go through pynput and the clipboard through pyperclip by default. configure_backends()
+swaps either one out, e.g. for the in-process fake application used by the latency harness in
+benchmarks/hotkey_latency.py. A keyboard backend needs send("ctrl+c" / "ctrl+v"); a clipboard
+backend needs get_text() and set_text(), and may have sequence(), a number that changes with the
+clipboard, and has_text(), whether text is on it.
+
+Copying waits for the clipboard to change rather than a fixed time: on Windows by watching the
+clipboard sequence number, elsewhere by polling the clipboard text with a backoff. The sequence
+number already changes when the copying application empties the clipboard, while it still holds
+it open, so a copy only counts as landed once there is text again, and reading it retries while
+the clipboard cannot be opened.
+"""
+
+import logging
+import sys
+import threading
+import time
+
+import pyperclip
+
+
+class PynputKeyboard:
+    """Synthetic key presses through pynput (imported lazily, it needs a display on Linux)."""
+    def __init__(self):
+        from pynput import keyboard as pykeyboard
+        self.pykeyboard = pykeyboard
+        self.controller = pykeyboard.Controller()
+
+    def send(self, hotkey):
+        modifier, key = hotkey.split('+')
+        modifier = getattr(self.pykeyboard.Key, modifier).value
+        self.controller.press(modifier)
+        self.controller.press(key)
+        self.controller.release(key)
+        self.controller.release(modifier)
+
+
+CLIPBOARD_READ_ATTEMPTS = 6
+CLIPBOARD_READ_BACKOFF = 0.005
+
+
+class PyperclipClipboard:
+    def get_text(self):
+        # OpenClipboard fails while the copying application still has the clipboard open.
+        delay = CLIPBOARD_READ_BACKOFF
+        for attempt in range(CLIPBOARD_READ_ATTEMPTS):
+            try:
+                return pyperclip.paste()
+            except pyperclip.PyperclipException:
+                if attempt == CLIPBOARD_READ_ATTEMPTS - 1:
+                    raise
+            time.sleep(delay)
+            delay *= 2
+
+    def set_text(self, text):
+        pyperclip.copy(text)
+
+    def sequence(self):
+        if sys.platform != 'win32':
+            return None
+        import ctypes
+        return ctypes.windll.user32.GetClipboardSequenceNumber()
+
+    def has_text(self):
+        if sys.platform != 'win32':
+            return True
+        import ctypes
+        return bool(ctypes.windll.user32.IsClipboardFormatAvailable(13))  # CF_UNICODETEXT; needs no OpenClipboard
+
+
+_keyboard = None
+_clipboard = None
+_lock = threading.Lock()
+
+
+def configure_backends(keyboard=None, clipboard=None):
+    """Replace the keyboard and clipboard backends; None restores the pynput/pyperclip default."""
+    global _keyboard, _clipboard
+    with _lock:
+        _keyboard, _clipboard = keyboard, clipboard
+
+
+def get_keyboard():
+    global _keyboard
+    with _lock:
+        if _keyboard is None:
+            _keyboard = PynputKeyboard()
+        return _keyboard
+
+
+def get_clipboard():
+    global _clipboard
+    with _lock:
+        if _clipboard is None:
+            _clipboard = PyperclipClipboard()
+        return _clipboard
+
+
+def clear_clipboard():
+    try:
+        get_clipboard().set_text('')
+    except Exception as e:
+        logging.error(f'Error clearing clipboard: {e}')
+
+
+def _sequence(clipboard):
+    sequence = getattr(clipboard, 'sequence', None)
+    try:
+        return sequence() if sequence is not None else None
+    except Exception:
+        return None
+
+
+def _has_text(clipboard):
+    has_text = getattr(clipboard, 'has_text', None)
+    try:
+        return has_text() if has_text is not None else True
+    except Exception:
+        return True
+
+
+def wait_for_clipboard_change(clipboard, before_sequence, before_text, timeout):
+    """
+    Wait until the clipboard differs from before_sequence (if known, and text is on the clipboard
+    again) or before_text. Returns True as soon as it does, False after timeout seconds.
+    """
+    deadline = time.perf_counter() + timeout
+    interval = 0.001 if before_sequence is not None else 0.002
+    while True:
+        if before_sequence is not None:
+            if _sequence(clipboard) != before_sequence and _has_text(clipboard):
+                return True
+        elif clipboard.get_text() != before_text:
+            return True
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+        if before_sequence is None:
+            # Reading the clipboard text is not free (xclip / wl-paste on Linux), so back off.
+            interval = min(interval * 2, 0.05)
+
+
+def copy_selection(timeout=0.7, settle=0.0):
+    """
+    Copy the current selection with Ctrl+C and return it, leaving the clipboard as it was.
+    Args:
+        timeout (float): Longest time to wait for the application to update the clipboard
+        settle (float): How long to keep reading an empty clipboard after that, for applications
+            that publish the text late
+    """
+    clipboard = get_clipboard()
+    clipboard_backup = clipboard.get_text()
+    logging.debug(f'Clipboard backup: "{clipboard_backup}" (timeout: {timeout}s)')
+
+    clear_clipboard()
+    before_sequence = _sequence(clipboard)
+
+    logging.debug('Simulating Ctrl+C')
+    started = time.perf_counter()
+    get_keyboard().send('ctrl+c')
+
+    changed = wait_for_clipboard_change(clipboard, before_sequence, '', timeout)
+    logging.debug(f'Clipboard {"changed" if changed else "unchanged"} after '
+                  f'{(time.perf_counter() - started) * 1000:.0f} ms')
+
+    selected_text = clipboard.get_text()
+    deadline = time.perf_counter() + settle
+    while not selected_text and time.perf_counter() < deadline:
+        time.sleep(0.02)
+        selected_text = clipboard.get_text()
+    clipboard.set_text(clipboard_backup)
+    return selected_text
+
+
+def paste_text(text, settle=0.2):
+    """
+    Paste text over the selection with Ctrl+V, restoring the clipboard once the application has
+    had settle seconds to read it, unless something else was copied in the meantime.
+    """
+    clipboard = get_clipboard()
+    clipboard_backup = clipboard.get_text()
+    clipboard.set_text(text)
+    pasted_sequence = _sequence(clipboard)
+    get_keyboard().send('ctrl+v')
+    time.sleep(settle)
+    if pasted_sequence is not None:
+        unchanged = _sequence(clipboard) == pasted_sequence
+    else:
+        unchanged = clipboard.get_text() == text
+    if unchanged:
+        clipboard.set_text(clipboard_backup)
@@ -0,0 +1,248 @@
+"""
+Client-side rate limiting for Writing Tools providers
+------------------------------------------------------
+
+Every provider call goes through call_with_retries(), which:
+   • Queues the call behind a per provider/model token bucket (requests and tokens per minute)
+   • Retries 429 / 5xx errors with jittered exponential backoff
+   • Honours Retry-After / retry-after-ms when the SDK exposes the HTTP response
+   • Syncs the budget with the server's x-ratelimit-* headers when a provider passes them on
+   • Fails fast on a spent quota (insufficient_quota), which no amount of waiting fixes
+   • Stops waiting and raises RequestCancelled as soon as the request's cancel event is set
+
+Requests wait their turn instead of failing, so bursts of hotkey presses keep
+working at the provider's sustained rate.
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+RATE_LIMIT_MARKERS = ("rate limit", "resource has been exhausted", "too many requests")
+# Billing errors that come back as a 429 but will not clear up by retrying.
+QUOTA_MARKERS = ("insufficient_quota",)
+MAX_RETRIES = 5
+MAX_BACKOFF = 30.0
+
+
+class RequestCancelled(Exception):
+    """
+    Raised when a request is cancelled (e.g. the hotkey was pressed again) before it finished.
+    """
+
+
+def _sleep(seconds: float, cancelled: threading.Event = None):
+    if seconds <= 0:
+        return
+    if cancelled is None:
+        time.sleep(seconds)
+    elif cancelled.wait(seconds):
+        raise RequestCancelled()
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations: callers always get their tokens and
+    are told how long to wait for them. A rate of 0 disables the bucket.
+    """
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= min(amount, self.capacity)
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def drain(self):
+        """
+        Mark the bucket empty, e.g. when the server says the budget is spent.
+        """
+        with self.lock:
+            self.tokens = min(self.tokens, 0.0)
+            self.updated = time.monotonic()
+
+    def set_limit(self, per_minute: float):
+        """
+        Adopt the per-minute limit the server reports, keeping the tokens already spent.
+        """
+        if per_minute <= 0 or per_minute == self.capacity:
+            return
+        with self.lock:
+            self.tokens = min(float(per_minute), self.tokens)
+            self.rate = per_minute / 60.0
+            self.capacity = float(per_minute)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budget for one provider/model.
+    """
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0, cancelled: threading.Event = None):
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        with self.lock:
+            wait = max(wait, self.blocked_until - time.monotonic())
+        if wait > 0:
+            logging.debug(f'Rate limiter: waiting {wait:.2f}s before sending')
+        _sleep(wait, cancelled)
+
+    def pause(self, seconds: float):
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers):
+        """
+        Sync with the server's x-ratelimit-limit-* / x-ratelimit-remaining-* / x-ratelimit-reset-* headers.
+        """
+        if not headers:
+            return
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            limit = headers.get(f'x-ratelimit-limit-{kind}')
+            if limit and limit.strip().isdigit():
+                bucket.set_limit(int(limit))
+            remaining = headers.get(f'x-ratelimit-remaining-{kind}')
+            if remaining is None or not remaining.strip().isdigit() or int(remaining) > 0:
+                continue
+            bucket.drain()
+            reset = _parse_reset(headers.get(f'x-ratelimit-reset-{kind}'))
+            if reset:
+                self.pause(reset)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider_name: str, model: str, requests_per_minute: float = 0,
+                     tokens_per_minute: float = 0) -> RateLimiter:
+    """
+    Return the shared limiter for provider_name/model, creating it on first use.
+    """
+    key = (provider_name, model, requests_per_minute, tokens_per_minute)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(requests_per_minute, tokens_per_minute)
+        return _limiters[key]
+
+
+def _parse_reset(value) -> float | None:
+    """
+    Seconds until reset from "6m0s" / "1.5s" / "120ms" durations or RFC 3339 timestamps.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, (datetime.fromisoformat(value.replace('Z', '+00:00')) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        pass
+    total = 0.0
+    for number, unit in re.findall(r'([\d.]+)(ms|h|m|s)?', value):
+        try:
+            total += float(number) * {"ms": 0.001, "h": 3600, "m": 60, "s": 1, "": 1}[unit]
+        except ValueError:
+            return None
+    return total or None
+
+
+def _parse_retry_after(headers) -> float | None:
+    if not headers:
+        return None
+    retry_ms = headers.get('retry-after-ms')
+    if retry_ms:
+        try:
+            return float(retry_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get('retry-after')
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _error_details(exc: Exception):
+    """
+    Return (is_retryable, status, headers) for an SDK exception.
+    OpenAI and Ollama errors carry status_code, google.api_core errors carry code.
+    """
+    status = getattr(exc, 'status_code', None)
+    if not isinstance(status, int):
+        status = getattr(exc, 'code', None)
+    response = getattr(exc, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not isinstance(status, int) and response is not None:
+        status = getattr(response, 'status_code', None)
+    text = str(exc).lower()
+    if getattr(exc, 'code', None) in QUOTA_MARKERS or any(marker in text for marker in QUOTA_MARKERS):
+        return False, status, headers
+    retryable = status in RETRYABLE_STATUS or any(marker in text for marker in RATE_LIMIT_MARKERS)
+    return retryable, status, headers
+
+
+def call_with_retries(limiter: RateLimiter, func, tokens: int = 0, max_retries: int = MAX_RETRIES,
+                      cancelled: threading.Event = None, on_retry=None):
+    """
+    Call func() under limiter, retrying rate-limit and transient server errors.
+    The last exception is re-raised once max_retries is exhausted.
+    If cancelled is set while waiting or after a failure, RequestCancelled is raised instead.
+    on_retry() is called before each retry, e.g. to count retries in telemetry.
+    """
+    attempt = 0
+    while True:
+        # The prompt's tokens are reserved once; a retry only needs another request slot.
+        limiter.acquire(tokens if attempt == 0 else 0, cancelled)
+        if cancelled is not None and cancelled.is_set():
+            raise RequestCancelled()
+        try:
+            return func()
+        except Exception as e:
+            if cancelled is not None and cancelled.is_set():
+                raise RequestCancelled() from e
+            retryable, status, headers = _error_details(e)
+            limiter.update_from_headers(headers)
+            if not retryable or attempt >= max_retries:
+                raise
+            delay = _parse_retry_after(headers)
+            if delay is None:
+                delay = random.uniform(0, min(MAX_BACKOFF, 0.5 * (2 ** attempt)))
+            else:
+                delay = min(delay, MAX_BACKOFF) + random.uniform(0, 0.25)
+            logging.warning(f'Provider returned {status or "a rate limit error"}; retrying in {delay:.2f}s '
+                            f'(attempt {attempt + 1}/{max_retries})')
+            limiter.pause(delay)
+            attempt += 1
+            if on_retry is not None:
+                on_retry()
+
+
+def estimate_tokens(*texts) -> int:
+    """
+    Rough token estimate (about 4 characters per token) for the tokens-per-minute budget.
+    """
+    return sum(len(str(text)) for text in texts) // 4
@@ -0,0 +1,211 @@
+"""
+Per-request telemetry for Writing Tools providers
+-------------------------------------------------
+
+AIProvider.send_request() times every request with a RequestTrace:
+   • Time to the first streamed chunk (providers call first_token() from their chunk loops)
+   • Total latency, retries after 429 / 5xx errors, and the kind of error if it failed
+   • The token usage the server reported (AIProvider.last_usage), and output tokens per second
+
+Records are kept in an in-memory ring buffer (summary() gives rolling p50/p95 latency per option
+and provider) and appended to a size-rotated telemetry.jsonl next to config.json for offline
+analysis. The option a request belongs to is set with prompt_label() / labelled() by the code
+that runs it, so providers stay option-agnostic.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+_prompt = contextvars.ContextVar('writing_tools_prompt', default='')
+_trace = contextvars.ContextVar('writing_tools_trace', default=None)
+
+
+@contextmanager
+def prompt_label(name):
+    """
+    Attribute the requests made inside this block (on this thread) to the option name.
+    """
+    token = _prompt.set(name)
+    try:
+        yield
+    finally:
+        _prompt.reset(token)
+
+
+def labelled(name, func):
+    """
+    Wrap func so the requests it makes are attributed to name, e.g. as a thread target.
+    """
+    def run(*args, **kwargs):
+        with prompt_label(name):
+            return func(*args, **kwargs)
+    return run
+
+
+def error_kind(exc):
+    """
+    Short, groupable description of why a request failed.
+    """
+    for status in (getattr(exc, 'status_code', None), getattr(exc, 'code', None),
+                   getattr(getattr(exc, 'response', None), 'status_code', None)):
+        if isinstance(status, int):
+            return f'HTTP {status}'
+    return type(exc).__name__
+
+
+class RequestTrace:
+    """
+    Times one provider request; send_request() calls finish() exactly once.
+    """
+    def __init__(self, provider, model):
+        self.record = {
+            "provider": provider, "model": model, "prompt": _prompt.get(),
+            "prompt_tokens": 0, "cached_tokens": 0, "output_tokens": 0,
+            "ttft": None, "latency": 0.0, "retries": 0, "error": "", "timestamp": time.time(),
+        }
+        self._started = time.perf_counter()
+        self._finished = False
+
+    @contextmanager
+    def active(self):
+        """
+        Make this the trace first_token() reports to while the request runs.
+        """
+        token = _trace.set(self)
+        try:
+            yield self
+        finally:
+            _trace.reset(token)
+
+    def first_token(self):
+        if self.record["ttft"] is None:
+            self.record["ttft"] = time.perf_counter() - self._started
+
+    def retried(self):
+        self.record["retries"] += 1
+
+    def finish(self, error='', usage=None, output=None):
+        """
+        Record the request. Without usage from the server, output tokens are estimated from output.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        record = self.record
+        record["latency"] = time.perf_counter() - self._started
+        record["error"] = error
+        if usage:
+            record.update((key, usage.get(key, 0) or 0) for key in ("prompt_tokens", "cached_tokens", "output_tokens"))
+        elif output:
+            record["output_tokens"] = len(output) // 4
+        _telemetry.record(record)
+
+
+def first_token():
+    """
+    Mark the first chunk of the request running on this thread, if it is being traced.
+    """
+    trace = _trace.get()
+    if trace is not None:
+        trace.first_token()
+
+
+def tokens_per_sec(record):
+    generating = record["latency"] - (record["ttft"] or 0.0)
+    return record["output_tokens"] / generating if record["output_tokens"] and generating > 0 else 0.0
+
+
+def _percentile(samples, p):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+class Telemetry:
+    """
+    Ring buffer of recent request records, mirrored to a rotating JSONL file when path is set.
+    """
+    def __init__(self, path=None, max_bytes=1_000_000, backups=3, buffer_size=1000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.records = deque(maxlen=max(1, buffer_size))
+        self.lock = threading.Lock()
+
+    def record(self, record):
+        with self.lock:
+            self.records.append(record)
+            if self.path:
+                self._write(json.dumps(record, separators=(',', ':')) + '\n')
+        logging.debug(f'{record["provider"]} request for "{record["prompt"]}": {record["latency"] * 1000:.0f} ms, '
+                      f'{record["retries"]} retries{", " + record["error"] if record["error"] else ""}')
+
+    def recent(self):
+        with self.lock:
+            return list(self.records)
+
+    def summary(self):
+        """
+        Rolling latency per option and provider over the buffered records, slowest p95 first.
+        """
+        groups = {}
+        for record in self.recent():
+            groups.setdefault((record["prompt"], record["provider"]), []).append(record)
+        rows = []
+        for (prompt, provider), records in groups.items():
+            answered = [r for r in records if not r["error"]]
+            speeds = [tokens_per_sec(r) for r in answered if tokens_per_sec(r)]
+            rows.append({
+                "prompt": prompt,
+                "provider": provider,
+                "count": len(records),
+                "errors": len(records) - len(answered),
+                "latency_p50": _percentile([r["latency"] for r in answered], 0.50),
+                "latency_p95": _percentile([r["latency"] for r in answered], 0.95),
+                "ttft_p50": _percentile([r["ttft"] for r in answered if r["ttft"] is not None], 0.50),
+                "tokens_per_sec": sum(speeds) / len(speeds) if speeds else 0.0,
+            })
+        rows.sort(key=lambda row: row["latency_p95"], reverse=True)
+        return rows
+
+    def _write(self, line):
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) + len(line) > self.max_bytes:
+                self._rotate()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            logging.warning(f'Could not write telemetry: {e}')
+            self.path = None
+
+    def _rotate(self):
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            older = f'{self.path}.{index}'
+            if os.path.exists(older):
+                os.replace(older, f'{self.path}.{index + 1}')
+        os.replace(self.path, f'{self.path}.1')
+
+
+_telemetry = Telemetry()
+
+
+def configure_telemetry(path=None, max_bytes=1_000_000, backups=3, buffer_size=1000):
+    """
+    Replace the process-wide telemetry; without a path records are only kept in memory.
+    """
+    global _telemetry
+    _telemetry = Telemetry(path, max_bytes, backups, buffer_size)
+
+
+def get_telemetry():
+    return _telemetry
@@ -514,11 +514,22 @@ class CustomPopupWindow(QtWidgets.QWidget):
             update_label.setText('<a href="https://github.com/theJayTea/WritingTools/releases" style="color:rgb(255, 0, 0); text-decoration: underline; font-weight: bold;">There\'s an update! :D Download now.</a>')
             update_label.setStyleSheet("margin-top: 10px;")
             content_layout.addWidget(update_label, alignment=QtCore.Qt.AlignCenter)
+
+        # Model status (e.g. whether a local Ollama model is loaded yet)
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet(f"color: {'#aaa' if colorMode=='dark' else '#666'}; font-size: 12px;")
+        content_layout.addWidget(self.status_label, alignment=QtCore.Qt.AlignCenter)
+        self.set_provider_status(self.app.current_provider.status_text() if self.app.current_provider else None)
         
         logging.debug('CustomPopupWindow UI setup complete')
         self.installEventFilter(self)
         QtCore.QTimer.singleShot(250, lambda: self.custom_input.setFocus())
 
+    def set_provider_status(self, status):
+        """Show the provider's model status, or hide the label when there is none."""
+        self.status_label.setText(status or "")
+        self.status_label.setVisible(bool(status))
+
     @staticmethod
     def load_options():
         options_path = os.path.join(os.path.dirname(sys.argv[0]), 'options.json')
@@ -7,6 +7,7 @@ from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtCore import Qt, Slot
 from PySide6.QtWidgets import QScrollArea
 
+from conversation import ConversationWindow
 from ui.UIUtils import UIUtils, colorMode
 
 _ = lambda x: x
@@ -312,6 +313,7 @@ class ResponseWindow(QtWidgets.QWidget):
         self.loading_container = None
         self.chat_area = None
         self.chat_history = []
+        self.conversation = ConversationWindow()
 
         # Setup thinking animation with full range of dots
         self.thinking_timer = QtCore.QTimer(self)
@@ -373,6 +373,7 @@ class SettingsWindow(QtWidgets.QWidget):
         self.app.current_provider.load_config(
             self.app.config.get("providers", {}).get(provider_name, {})
         )
+        self.app.show_provider_status(self.app.current_provider.status_text())
 
         self.app.register_hotkey()
         self.providers_only = False
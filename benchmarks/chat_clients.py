@@ -0,0 +1,201 @@
+"""
+Chat client benchmarks against the local stand-in server (standin_server.py).
+
+Three sections, all offline and without API keys:
+
+  overhead    per-call cost each client adds on top of a bare pooled POST
+              (instant server, so only client-side work is measured)
+  throughput  requests/s and latency at increasing concurrency, with a
+              realistic time to first token and generation speed
+  tail        p50/p95/p99 and failures with injected 429s and 500s, which
+              the clients must queue and retry
+
+If the ``openai`` or ``ollama`` SDKs are installed, the overhead section also
+measures them; they are what the Windows_and_Linux providers use.
+
+Usage:
+    python benchmarks/chat_clients.py [--section all] [--requests 100]
+        [--ttft-ms 100] [--tokens-per-sec 200] [--concurrency 1,4,16]
+        [--rate-limit-rate 0.05] [--error-rate 0.02]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+from typing import Callable, Optional
+
+from ai_hub.config import HTTPSettings, OpenAISettings, RateLimitSettings
+from ai_hub.services.cancellation import CancelToken
+from ai_hub.services.http_transport import configure_transport, get_transport
+from ai_hub.services.multi_api_client import MultiAPIClient
+from ai_hub.services.openai_client import ErrorReply, OpenAIClient
+from ai_hub.services.rate_limiter import configure_rate_limits
+from standin_server import StandInServer
+
+try:
+    import openai
+    HAVE_OPENAI = True
+except Exception:  # pragma: no cover - optional dependency
+    HAVE_OPENAI = False
+
+try:
+    import ollama
+    HAVE_OLLAMA = True
+except Exception:  # pragma: no cover - optional dependency
+    HAVE_OLLAMA = False
+
+
+Send = Callable[[], str]
+
+
+def _pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def _clients(server: StandInServer) -> dict[str, Send]:
+    """One zero-argument call per client path, all answered by ``server``."""
+    openai_client = OpenAIClient(OpenAISettings(api_key="benchmark", endpoint=server.openai_url, model="gpt-4o-mini", timeout=30))
+    multi_openai = MultiAPIClient("openai", api_key="benchmark", model="gpt-4o-mini", endpoint=server.openai_url)
+    multi_claude = MultiAPIClient("claude", api_key="benchmark", model="claude-3-5-sonnet", endpoint=server.anthropic_url)
+    return {
+        "OpenAIClient": lambda: openai_client.chat("Be brief.", "Hello"),
+        "OpenAIClient stream": lambda: openai_client.chat("Be brief.", "Hello", cancel=CancelToken()),
+        "Multi openai": lambda: multi_openai.chat("Be brief.", "Hello"),
+        "Multi openai stream": lambda: multi_openai.chat("Be brief.", "Hello", cancel=CancelToken()),
+        "Multi claude": lambda: multi_claude.chat("Be brief.", "Hello"),
+        "Multi claude stream": lambda: multi_claude.chat("Be brief.", "Hello", cancel=CancelToken()),
+    }
+
+
+def _sdk_clients(server: StandInServer) -> dict[str, Send]:
+    sends: dict[str, Send] = {}
+    messages = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Hello"}]
+    if HAVE_OPENAI:
+        sdk = openai.OpenAI(api_key="benchmark", base_url=f"{server.base_url}/v1", max_retries=0)
+
+        def openai_stream() -> str:
+            with sdk.chat.completions.create(model="gpt-4o-mini", messages=messages, stream=True) as stream:
+                return "".join(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+
+        sends["openai SDK stream"] = openai_stream
+    if HAVE_OLLAMA:
+        client = ollama.Client(host=server.base_url)
+        sends["ollama SDK stream"] = lambda: "".join(
+            chunk["message"]["content"] for chunk in client.chat(model="llama3", messages=messages, stream=True))
+    return sends
+
+
+def _time(send: Send, count: int) -> tuple[list[float], int]:
+    samples, failures = [], 0
+    for _ in range(count):
+        start = time.perf_counter()
+        reply = send()
+        samples.append((time.perf_counter() - start) * 1000)
+        failures += isinstance(reply, ErrorReply) or not reply
+    return samples, failures
+
+
+def overhead(args: argparse.Namespace) -> None:
+    print("\n== overhead: instant server, sequential calls ==")
+    with StandInServer() as server:
+        payload = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Hello"}]}
+        headers = {"Authorization": "Bearer benchmark", "Content-Type": "application/json"}
+        sends: dict[str, Send] = {
+            "bare POST": lambda: get_transport().post(server.openai_url, headers=headers, json=payload, timeout=30).text,
+        }
+        sends.update(_clients(server))
+        sends.update(_sdk_clients(server))
+
+        baseline: Optional[float] = None
+        for label, send in sends.items():
+            send()  # warm-up: open the pooled connection
+            samples, failures = _time(send, args.requests)
+            p50 = statistics.median(samples)
+            baseline = p50 if baseline is None else baseline
+            extra = "" if label == "bare POST" else f"   +{p50 - baseline:6.3f} ms over bare POST"
+            print(f"{label:<22} p50 {p50:7.3f} ms   p95 {_pct(samples, 0.95):7.3f} ms{extra}"
+                  + (f"   ({failures} failed)" if failures else ""))
+
+
+def throughput(args: argparse.Namespace) -> None:
+    print(f"\n== throughput: TTFT {args.ttft_ms:.0f} ms, {args.tokens_per_sec:.0f} tokens/s ==")
+    with StandInServer(ttft=args.ttft_ms / 1000, tokens_per_sec=args.tokens_per_sec) as server:
+        send = _clients(server)["OpenAIClient stream"]
+        send()
+        for concurrency in args.concurrency:
+            samples: list[float] = []
+            failures = [0]
+            lock = threading.Lock()
+            remaining = [args.requests]
+
+            def worker() -> None:
+                while True:
+                    with lock:
+                        if remaining[0] <= 0:
+                            return
+                        remaining[0] -= 1
+                    worker_samples, worker_failures = _time(send, 1)
+                    with lock:
+                        samples.extend(worker_samples)
+                        failures[0] += worker_failures
+
+            start = time.perf_counter()
+            threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            print(f"concurrency {concurrency:<3} {len(samples) / elapsed:7.1f} req/s   p50 {statistics.median(samples):7.1f} ms"
+                  f"   p95 {_pct(samples, 0.95):7.1f} ms" + (f"   ({failures[0]} failed)" if failures[0] else ""))
+    print(f"(above [http] pool_size = {args.pool_size}, extra connections are not kept alive; "
+          "the async httpx path caps concurrency at pool_size instead)")
+
+
+def tail(args: argparse.Namespace) -> None:
+    print(f"\n== tail: {args.rate_limit_rate:.0%} 429s, {args.error_rate:.0%} 500s, retried by the clients ==")
+    with StandInServer(
+        ttft=args.ttft_ms / 1000,
+        tokens_per_sec=args.tokens_per_sec,
+        rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate,
+        retry_after=0.05,
+    ) as server:
+        for label, send in _clients(server).items():
+            if not label.endswith("stream"):
+                continue
+            samples, failures = _time(send, args.requests)
+            print(f"{label:<22} p50 {_pct(samples, 0.50):7.1f} ms   p95 {_pct(samples, 0.95):7.1f} ms"
+                  f"   p99 {_pct(samples, 0.99):7.1f} ms   failed {failures}")
+        injected = sum(count for (_, status), count in server.stats.items() if status != 200)
+        print(f"server answered {sum(server.stats.values())} requests, {injected} of them with an injected error")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--section", choices=("all", "overhead", "throughput", "tail"), default="all")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--ttft-ms", type=float, default=100)
+    parser.add_argument("--tokens-per-sec", type=float, default=200)
+    parser.add_argument("--concurrency", type=lambda value: [int(n) for n in value.split(",")], default=[1, 4, 16])
+    parser.add_argument("--pool-size", type=int, default=HTTPSettings().pool_size)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    args = parser.parse_args()
+
+    # Measure the clients, not the client-side budget: no RPM/TPM queueing, default retries.
+    configure_rate_limits(RateLimitSettings(requests_per_minute=0, tokens_per_minute=0))
+    configure_transport(HTTPSettings(pool_size=args.pool_size))
+
+    for name, section in (("overhead", overhead), ("throughput", throughput), ("tail", tail)):
+        if args.section in ("all", name):
+            section(args)
+    get_transport().close()
+
+
+if __name__ == "__main__":
+    main()
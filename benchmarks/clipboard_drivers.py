@@ -0,0 +1,154 @@
+"""
+Clipboard driver latency: the raw operations, and selection capture / paste-back through each.
+
+For every clipboard driver that can run here (ai_hub.services.backends:
+win32, pyperclip, xclip, wl-clipboard, memory) it measures set_text and
+get_text, then the full ai_hub.services.selection algorithm on top of the
+driver, driven by the in-process fake application and keyboard
+(ai_hub.services.fake_desktop):
+
+  snapshot  save the clipboard, with every format the driver keeps
+  restore   put a snapshot back
+  capture   get_selection(): snapshot, clear, Ctrl+C, wait for the clipboard to change
+  paste     replace_selection(): snapshot, copy, Ctrl+V
+  settled   capture / paste plus the background restore finishing
+
+The memory driver holds HTML and a 1 MB image next to the text, so its
+snapshots show what keeping rich formats costs (--rich-kb changes the size).
+
+Drivers other than memory use the real system clipboard, which is
+overwritten while the benchmark runs.
+
+Usage:
+    PYTHONPATH=src python benchmarks/clipboard_drivers.py [--trials 50] [--app-delay-ms 5]
+        [--driver all] [--rich-kb 1024]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from ai_hub.config import ClipboardSettings
+from ai_hub.services.backends import CLIPBOARD_DRIVERS, MemoryClipboard, available_clipboard_drivers, configure_backends
+from ai_hub.services.clipboard_snapshot import configure_snapshots, get_snapshots
+from ai_hub.services.clipboard_watch import configure_clipboard
+from ai_hub.services.fake_desktop import FakeApp, FakeKeyboard
+from ai_hub.services.selection import get_selection, replace_selection
+
+
+DOCUMENT = "The quick brown fox jumps over the lazy dog."
+USER_CLIPBOARD = "something the user copied earlier"
+
+
+def _measure(label: str, run: Callable[[], bool], trials: int, prepare: Callable[[], None] = lambda: None) -> None:
+    samples, failures = [], 0
+    for _ in range(trials):
+        prepare()
+        start = time.perf_counter()
+        ok = run()
+        samples.append((time.perf_counter() - start) * 1000)
+        failures += not ok
+    samples.sort()
+    pct = lambda p: samples[min(len(samples) - 1, int(len(samples) * p))]
+    failed = f"   {failures} failed" if failures else ""
+    print(f"  {label:<10} p50 {pct(0.50):8.2f} ms   p95 {pct(0.95):8.2f} ms{failed}")
+
+
+def bench_driver(name: str, args: argparse.Namespace) -> None:
+    clipboard = CLIPBOARD_DRIVERS[name]()
+    print(f"\n== {name} ==")
+    try:
+        clipboard.set_text(USER_CLIPBOARD)
+    except Exception as e:
+        print(f"  unavailable: {str(e).splitlines()[0]}")
+        return
+    app = FakeApp()
+    keyboard = FakeKeyboard(app, clipboard, args.app_delay_ms / 1000)
+    configure_backends(keyboard, clipboard)
+    configure_clipboard(ClipboardSettings())  # forget delays learned with the previous driver
+    configure_snapshots(ClipboardSettings())
+    snapshots = get_snapshots()
+
+    rich = {"text/html": f"<b>{USER_CLIPBOARD}</b>".encode(), "image/png": bytes(args.rich_kb * 1024)}
+
+    def user_copies() -> None:
+        if isinstance(clipboard, MemoryClipboard):
+            clipboard.set_formats(USER_CLIPBOARD, rich)
+        else:
+            clipboard.set_text(USER_CLIPBOARD)
+
+    def kept() -> bool:
+        snapshots.wait_restored()
+        if clipboard.get_text() != USER_CLIPBOARD:
+            return False
+        return not isinstance(clipboard, MemoryClipboard) or clipboard.formats() == rich
+
+    def set_text() -> bool:
+        clipboard.set_text(DOCUMENT)
+        return True
+
+    def get_text() -> bool:
+        return clipboard.get_text() == DOCUMENT
+
+    user_copies()
+    saved = snapshots.take()
+
+    def prepare() -> None:
+        # Untimed: finish the previous restore and put the user's clipboard in place.
+        snapshots.wait_restored()
+        app.reset(DOCUMENT)
+        user_copies()
+
+    def snapshot() -> bool:
+        return snapshots.take().text == USER_CLIPBOARD
+
+    def restore() -> bool:
+        snapshots.restore(saved)
+        return True
+
+    def capture(settle: bool) -> Callable[[], bool]:
+        def run() -> bool:
+            text = get_selection(select_all_fallback=False).text
+            return text == DOCUMENT and (not settle or kept())
+        return run
+
+    def paste(settle: bool) -> Callable[[], bool]:
+        def run() -> bool:
+            replace_selection("Replaced.")
+            if not settle:
+                return True
+            pasted = app.wait_for_paste(timeout=2.0)
+            return pasted is not None and pasted.text == "Replaced." and kept()
+        return run
+
+    _measure("set_text", set_text, args.trials)
+    _measure("get_text", get_text, args.trials)
+    _measure("snapshot", snapshot, args.trials, prepare)
+    _measure("restore", restore, args.trials, prepare)
+    _measure("capture", capture(False), args.trials, prepare)
+    _measure("+settled", capture(True), args.trials, prepare)
+    _measure("paste", paste(False), args.trials, prepare)
+    _measure("+settled", paste(True), args.trials, prepare)
+    snapshots.wait_restored()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=50)
+    parser.add_argument("--app-delay-ms", type=float, default=5, help="time for the fake application to handle a key")
+    parser.add_argument("--driver", choices=("all", *CLIPBOARD_DRIVERS), default="all")
+    parser.add_argument("--rich-kb", type=int, default=1024, help="size of the image on the memory clipboard")
+    args = parser.parse_args()
+
+    available = available_clipboard_drivers()
+    print(f"available drivers: {', '.join(available)}; application reacts in {args.app_delay_ms:.0f} ms")
+    for name in available:
+        if args.driver in ("all", name):
+            bench_driver(name, args)
+    configure_backends()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Tail latency: one provider vs. ProviderRouter hedging across two providers.
+
+Starts two local stand-in servers (standin_server.py) for a streaming Chat
+Completions endpoint. The primary is usually fast but sometimes stalls (and
+can be made to fail); the secondary is steady but slower. No API key or
+network access is needed.
+
+Usage:
+    python benchmarks/hedged_requests.py [--requests 200] [--slow-rate 0.03] [--fail-rate 0.0] [--percentile 0.95]
+
+Hedging only helps when stalls are rarer than 1 - percentile: with a 10%
+stall rate the primary's p95 *is* a stall, so no hedge fires at p95.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from ai_hub.services.cancellation import CancelToken
+from ai_hub.services.multi_api_client import MultiAPIClient, ProviderRouter
+from standin_server import StandInServer
+
+
+def _report(label: str, samples: list[float], winners: Counter) -> None:
+    samples = sorted(samples)
+
+    def pct(p: float) -> float:
+        return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+    answered = ", ".join(f"{name}: {count}" for name, count in sorted(winners.items()))
+    print(f"{label:<12} p50 {pct(0.50):7.1f} ms   p95 {pct(0.95):7.1f} ms   p99 {pct(0.99):7.1f} ms   ({answered})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--fast-ms", type=float, default=40)
+    parser.add_argument("--slow-ms", type=float, default=1500)
+    parser.add_argument("--slow-rate", type=float, default=0.03, help="share of primary requests that stall")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of primary requests that return 500")
+    parser.add_argument("--secondary-ms", type=float, default=150)
+    parser.add_argument("--percentile", type=float, default=0.95, help="hedge after this latency percentile")
+    args = parser.parse_args()
+
+    def primary_delay() -> float:
+        return (args.slow_ms if random.random() < args.slow_rate else args.fast_ms) / 1000
+
+    primary_url = StandInServer(reply="primary", ttft=primary_delay, error_rate=args.fail_rate).start().openai_url
+    secondary_url = StandInServer(reply="secondary", ttft=args.secondary_ms / 1000).start().openai_url
+
+    primary = MultiAPIClient("openai", api_key="benchmark", model="stand-in", endpoint=primary_url, max_retries=0)
+    secondary = MultiAPIClient("openai", api_key="benchmark", model="stand-in", endpoint=secondary_url, max_retries=0)
+    router = ProviderRouter([primary, secondary], hedge_percentile=args.percentile)
+
+    for label, send in (
+        ("primary", lambda: primary.chat(None, "Hello", cancel=CancelToken())),
+        ("routed", lambda: router.chat(None, "Hello")),
+    ):
+        send()  # warm-up
+        samples: list[float] = []
+        winners: Counter = Counter()
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            reply = send()
+            samples.append((time.perf_counter() - start) * 1000)
+            winners[reply if reply in ("primary", "secondary") else "error"] += 1
+        _report(label, samples, winners)
+    print(f"hedge delay after warm-up: {router.hedge_delay(0) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
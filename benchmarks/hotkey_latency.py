@@ -0,0 +1,254 @@
+"""
+End-to-end hotkey-to-paste latency, offline and without touching the real desktop.
+
+The keyboard and clipboard backends are replaced by in-process fakes
+(ai_hub.services.fake_desktop): a text field that reacts to Ctrl+A / Ctrl+C /
+Ctrl+V / Backspace after a configurable, jittered delay, like a real
+application draining its input queue. The model is the local stand-in server
+(standin_server.py). Each scenario drives the real code path:
+
+  GlobalHotkeys       the spelling hotkey handler (selection -> chat -> paste)
+  HotstringEngine     an AI hotstring typed at the end of a line, through the key hook
+  SmartActionHandler  select all -> rewrite -> paste back
+  WritingToolApp      its copy/paste module (Windows_and_Linux/desktop_io.py) around
+                      a streamed request (openai SDK if installed, else OpenAIClient)
+
+Per stage it prints p50/p95/p99 in ms:
+
+  hook       time the key hook was blocked by the hotstring handler
+  selection  hotkey to request start (copying the selection)
+  request    request start to reply
+  paste      reply to the text appearing in the application
+  total      hotkey to the text appearing in the application
+
+and counts trials where nothing was pasted, the wrong text was pasted (e.g.
+the clipboard was restored before the application read it) or the user's
+clipboard was not restored.
+
+Usage:
+    PYTHONPATH=src python benchmarks/hotkey_latency.py [--trials 30]
+        [--app-delay-ms 15] [--app-jitter-ms 10] [--ttft-ms 150] [--tokens-per-sec 300]
+        [--scenario all]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # GlobalHotkeys builds its prompt navigator dialog
+
+from PySide6.QtWidgets import QApplication
+
+from ai_hub.config import OpenAISettings, RateLimitSettings
+from ai_hub.hotkeys.global_hotkeys import GlobalHotkeys, HotkeyCallbacks
+from ai_hub.hotkeys.hotstrings import AIHotstrings, HotstringEngine
+from ai_hub.services.backends import configure_backends
+from ai_hub.services.cancellation import CancelToken
+from ai_hub.services.fake_desktop import FakeApp, FakeClipboard, FakeKeyboard
+from ai_hub.services.key_dispatcher import dispatch_stats
+from ai_hub.services.openai_client import OpenAIClient
+from ai_hub.services.prompt_manager import default_prompts
+from ai_hub.services.rate_limiter import configure_rate_limits
+from ai_hub.services.smart_action_handler import SmartActionHandler
+from standin_server import StandInServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Windows_and_Linux"))
+import desktop_io  # noqa: E402
+
+try:
+    import openai
+    HAVE_OPENAI = True
+except Exception:  # pragma: no cover - optional dependency
+    HAVE_OPENAI = False
+
+
+USER_CLIPBOARD = "something the user copied earlier"
+DOCUMENT = "Their going to the libary tomorow, weather or not it rains."
+STAGES = ("hook", "selection", "request", "paste", "total")
+PASTE_TIMEOUT = 5.0
+CLIPBOARD_SETTLE = 0.3  # time allowed after the paste for the clipboard to be restored
+
+
+class TimedClient:
+    """Wraps a client and records when each chat request started and finished."""
+
+    def __init__(self, client: Any):
+        self._client = client
+        self.calls: list[tuple[float, float, str]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def chat(self, *args, **kwargs) -> str:
+        start = time.perf_counter()
+        reply = self._client.chat(*args, **kwargs)
+        self.calls.append((start, time.perf_counter(), reply))
+        return reply
+
+
+class Desk:
+    """The fake application, keyboard and clipboard, plus per-stage samples for one scenario."""
+
+    def __init__(self, args: argparse.Namespace):
+        low = max(0.0, args.app_delay_ms - args.app_jitter_ms) / 1000
+        high = (args.app_delay_ms + args.app_jitter_ms) / 1000
+        self.app = FakeApp()
+        self.clipboard = FakeClipboard()
+        self.keyboard = FakeKeyboard(self.app, self.clipboard, lambda: random.uniform(low, high))
+        configure_backends(self.keyboard, self.clipboard)
+        desktop_io.configure_backends(self.keyboard, self.clipboard)
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.missed = self.wrong = self.clobbered = 0
+
+    def reset(self, text: str = DOCUMENT, select_all: bool = True) -> None:
+        self.keyboard.idle()
+        self.app.reset(text, select_all)
+        self.clipboard.set_text(USER_CLIPBOARD)
+
+    def finish(self, start: float, calls: list[tuple[float, float, str]], hook: Optional[float] = None) -> None:
+        """Wait for the paste of the last request in ``calls`` and record the trial."""
+        paste = self.app.wait_for_paste(timeout=PASTE_TIMEOUT)
+        if paste is None or not calls:
+            self.missed += 1
+            return
+        request_start, request_end, reply = calls[-1]
+        if hook is not None:
+            self.samples["hook"].append(hook * 1000)
+        self.samples["selection"].append((request_start - start) * 1000)
+        self.samples["request"].append((request_end - request_start) * 1000)
+        self.samples["paste"].append((paste.at - request_end) * 1000)
+        self.samples["total"].append((paste.at - start) * 1000)
+        self.wrong += paste.text != reply
+        time.sleep(CLIPBOARD_SETTLE)
+        self.clobbered += self.clipboard.get_text() != USER_CLIPBOARD
+
+    def report(self, label: str, trials: int) -> None:
+        print(f"\n== {label} ==")
+        for stage in STAGES:
+            samples = sorted(self.samples.get(stage, ()))
+            if not samples:
+                continue
+            pct = lambda p: samples[min(len(samples) - 1, int(len(samples) * p))]
+            print(f"{stage:<10} p50 {pct(0.50):7.1f} ms   p95 {pct(0.95):7.1f} ms   p99 {pct(0.99):7.1f} ms")
+        print(f"{trials} trials: {self.missed} nothing pasted, {self.wrong} wrong text pasted, "
+              f"{self.clobbered} clipboard not restored")
+
+
+def global_hotkeys(args: argparse.Namespace, client: TimedClient) -> None:
+    prompts = list(default_prompts())
+    hotkeys = GlobalHotkeys(client, prompts, prompts[0], HotkeyCallbacks(lambda: None), "ctrl+alt+space", "ctrl+alt+s", None)
+    desk = Desk(args)
+    for _ in range(args.trials):
+        desk.reset()
+        client.calls.clear()
+        start = time.perf_counter()
+        hotkeys._run_spelling()  # what the key dispatcher's worker runs for the hotkey
+        desk.finish(start, client.calls)
+    desk.report("GlobalHotkeys: spelling hotkey", args.trials)
+
+
+def hotstrings(args: argparse.Namespace, client: TimedClient) -> None:
+    prompts = list(default_prompts())
+    trigger = ";fix"
+    engine = HotstringEngine(buffer_size=32)
+    engine.register_ai(trigger, AIHotstrings(client, prompts).make_handler(0))
+    desk = Desk(args)
+    engine.start()
+    for _ in range(args.trials):
+        desk.reset(select_all=False)
+        client.calls.clear()
+        desk.keyboard.type_text(trigger[:-1])
+        start = time.perf_counter()
+        desk.keyboard.type_text(trigger[-1])
+        desk.finish(start, client.calls, hook=time.perf_counter() - start)
+    desk.report(f"HotstringEngine: AI hotstring {trigger!r}", args.trials)
+    keys = dispatch_stats()
+    print(f"key hook callbacks: p50 {keys.hook_p50 * 1e6:.1f} µs, p95 {keys.hook_p95 * 1e6:.1f} µs, "
+          f"max {keys.hook_max * 1e6:.1f} µs over {keys.events} key events")
+
+
+def smart_actions(args: argparse.Namespace, client: TimedClient) -> None:
+    handler = SmartActionHandler(client)
+    desk = Desk(args)
+    for _ in range(args.trials):
+        desk.reset(select_all=False)
+        client.calls.clear()
+        start = time.perf_counter()
+        handler.rewrite_all_in_window()
+        desk.finish(start, client.calls)
+    desk.report("SmartActionHandler: select all, rewrite, paste back", args.trials)
+
+
+def _writing_tools_request(server: StandInServer) -> tuple[str, Callable[[str], str]]:
+    messages = lambda text: [{"role": "system", "content": "Fix the text."}, {"role": "user", "content": text}]
+    if HAVE_OPENAI:
+        sdk = openai.OpenAI(api_key="benchmark", base_url=f"{server.base_url}/v1", max_retries=0)
+
+        def send(text: str) -> str:
+            with sdk.chat.completions.create(model="gpt-4o-mini", messages=messages(text), stream=True) as stream:
+                return "".join(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+
+        return "openai SDK", send
+    client = OpenAIClient(OpenAISettings(api_key="benchmark", endpoint=server.openai_url, model="gpt-4o-mini", timeout=30))
+    return "OpenAIClient stand-in", lambda text: client.chat("Fix the text.", text, cancel=CancelToken())
+
+
+def writing_tools(args: argparse.Namespace, server: StandInServer) -> None:
+    label, send = _writing_tools_request(server)
+    desk = Desk(args)
+    calls: list[tuple[float, float, str]] = []
+    for _ in range(args.trials):
+        desk.reset()
+        calls.clear()
+        start = time.perf_counter()
+        selected = desktop_io.copy_selection()  # WritingToolApp.get_selected_text
+        # (the option popup is skipped: the user's click is not part of the measured latency)
+        request_start = time.perf_counter()
+        reply = send(selected) if selected.strip() else ""
+        calls.append((request_start, time.perf_counter(), reply))
+        if reply:
+            desktop_io.paste_text(reply)  # WritingToolApp.replace_text
+        desk.finish(start, calls)
+    desk.report(f"WritingToolApp: copy, request ({label}), paste", args.trials)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=30)
+    parser.add_argument("--app-delay-ms", type=float, default=15, help="mean time for the application to handle a key")
+    parser.add_argument("--app-jitter-ms", type=float, default=10)
+    parser.add_argument("--ttft-ms", type=float, default=150)
+    parser.add_argument("--tokens-per-sec", type=float, default=300)
+    parser.add_argument("--scenario", choices=("all", "hotkeys", "hotstrings", "smart", "writingtools"), default="all")
+    args = parser.parse_args()
+
+    configure_rate_limits(RateLimitSettings(requests_per_minute=0, tokens_per_minute=0))
+    qt_app = QApplication.instance() or QApplication([])  # noqa: F841 - kept alive for the dialogs
+    print(f"application reacts in {args.app_delay_ms:.0f} ± {args.app_jitter_ms:.0f} ms; "
+          f"model TTFT {args.ttft_ms:.0f} ms at {args.tokens_per_sec:.0f} tokens/s")
+
+    with StandInServer(ttft=args.ttft_ms / 1000, tokens_per_sec=args.tokens_per_sec) as server:
+        client = TimedClient(OpenAIClient(OpenAISettings(
+            api_key="benchmark", endpoint=server.openai_url, model="gpt-4o-mini", timeout=30)))
+        scenarios = (
+            ("hotkeys", lambda: global_hotkeys(args, client)),
+            ("hotstrings", lambda: hotstrings(args, client)),
+            ("smart", lambda: smart_actions(args, client)),
+            ("writingtools", lambda: writing_tools(args, server)),
+        )
+        for name, run in scenarios:
+            if args.scenario in ("all", name):
+                run()
+    configure_backends()
+    desktop_io.configure_backends()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Hotstring matching cost per key event, against the number of registered triggers.
+
+Feeds the same stream of typed keys through:
+
+  endswith   the previous HotstringEngine loop: merge the trigger dicts, join
+             the key buffer and call endswith() for every trigger
+  matcher    HotstringMatcher (ai_hub.hotkeys.hotstrings): a reversed-trigger
+             trie walked from a ring buffer of recent keys
+
+Triggers look like real text-expander abbreviations (";" plus a few letters),
+and the typed text hits one every so often. The matcher's cost should stay flat
+as the trigger count grows.
+
+Then it times reloading a shortcuts.json of --library hotstrings
+(ai_hub.hotkeys.shortcut_hotstrings) after a few entries were edited, added
+and removed, against compiling the whole file into a fresh engine.
+
+Usage:
+    PYTHONPATH=src python benchmarks/hotstring_matcher.py [--keys 20000] [--counts 10,100,1000,10000]
+        [--library 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import string
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from ai_hub.hotkeys.hotstrings import HotstringEngine, HotstringMatcher
+from ai_hub.hotkeys.shortcut_hotstrings import ShortcutHotstrings
+from ai_hub.services.key_dispatcher import get_dispatcher
+
+
+BUFFER_SIZE = 64
+
+
+def make_triggers(count: int, rng: random.Random) -> list[str]:
+    triggers: set[str] = set()
+    while len(triggers) < count:
+        triggers.add(";" + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6))))
+    return sorted(triggers)
+
+
+def make_keys(triggers: list[str], count: int, rng: random.Random) -> list[str]:
+    keys: list[str] = []
+    while len(keys) < count:
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+        keys.extend(rng.choice(triggers) if rng.random() < 0.05 else word)
+        keys.append(" ")
+    return keys[:count]
+
+
+def endswith_matcher(triggers: list[str]) -> Callable[[str], Optional[str]]:
+    """The matching part of the previous HotstringEngine._on_key_event."""
+    ai_hotstrings = {trigger: None for trigger in triggers[::2]}
+    text_hotstrings = {trigger: None for trigger in triggers[1::2]}
+    buffer: list[str] = []
+
+    def feed(key: str) -> Optional[str]:
+        nonlocal buffer
+        buffer.append(key)
+        if len(buffer) > BUFFER_SIZE:
+            buffer = buffer[-BUFFER_SIZE:]
+        buffer_text = "".join(buffer)
+        for trigger in {**ai_hotstrings, **text_hotstrings}:
+            if buffer_text.endswith(trigger):
+                buffer.clear()
+                return trigger
+        return None
+
+    return feed
+
+
+def trie_matcher(triggers: list[str]) -> Callable[[str], Optional[str]]:
+    matcher: HotstringMatcher[None] = HotstringMatcher(BUFFER_SIZE)
+    for trigger in triggers:
+        matcher.add(trigger, None)
+
+    def feed(key: str) -> Optional[str]:
+        match = matcher.feed(key)
+        if match is None:
+            return None
+        matcher.reset()
+        return match[0]
+
+    return feed
+
+
+def _measure(feed: Callable[[str], Optional[str]], keys: list[str]) -> tuple[float, int]:
+    start = time.perf_counter()
+    matches = sum(feed(key) is not None for key in keys)
+    return (time.perf_counter() - start) / len(keys) * 1e6, matches
+
+
+def bench_reload(count: int, rng: random.Random) -> None:
+    shortcuts = [
+        {"type": "Hotstring", "action": "Send Text", "trigger": trigger, "desc": "", "output": f"expansion {i}", "modifiers": []}
+        for i, trigger in enumerate(make_triggers(count, rng))
+    ]
+    make_action = lambda shortcut: (lambda: None)
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "shortcuts.json"
+        path.write_text(json.dumps(shortcuts), encoding="utf-8")
+
+        def full() -> HotstringEngine:
+            engine = HotstringEngine(buffer_size=BUFFER_SIZE)
+            ShortcutHotstrings(engine, make_action, path).load()
+            get_dispatcher().idle()
+            return engine
+
+        start = time.perf_counter()
+        full()
+        full_ms = (time.perf_counter() - start) * 1000
+
+        engine = HotstringEngine(buffer_size=BUFFER_SIZE)
+        library = ShortcutHotstrings(engine, make_action, path)
+        library.load()
+        get_dispatcher().idle()
+        for shortcut in rng.sample(shortcuts, 5):
+            shortcut["output"] += " (edited)"
+        removed = {shortcut["trigger"] for shortcut in shortcuts[:2]}
+        shortcuts = shortcuts[2:] + [
+            {"type": "Hotstring", "action": "Send Text", "trigger": f";new{i}", "desc": "", "output": "new", "modifiers": []}
+            for i in range(3)
+        ]
+        path.write_text(json.dumps(shortcuts), encoding="utf-8")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1))  # a new stamp even on coarse clocks
+
+        start = time.perf_counter()
+        result = library.reload_if_changed()
+        get_dispatcher().idle()
+        reload_ms = (time.perf_counter() - start) * 1000
+
+    matcher = engine._matcher
+    assert result is not None and (result.added, result.removed, result.changed) == (3, 2, 5)
+    assert len(matcher) == count + 1 and all(matcher.get(trigger) is None for trigger in removed)
+    print(f"\nshortcuts.json with {count} hotstrings: compile all {full_ms:.1f} ms, "
+          f"reload after 10 edits {reload_ms:.1f} ms (JSON parsing included)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=20000)
+    parser.add_argument("--counts", default="10,100,1000,10000", help="comma-separated trigger counts")
+    parser.add_argument("--library", type=int, default=5000, help="hotstrings in the reloaded shortcuts.json")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{args.keys} keys per run; microseconds per key event")
+    print(f"{'triggers':>9}  {'endswith':>10}  {'matcher':>10}  {'speed-up':>9}")
+    for count in (int(c) for c in args.counts.split(",")):
+        rng = random.Random(args.seed)
+        triggers = make_triggers(count, rng)
+        keys = make_keys(triggers, args.keys, rng)
+        # The old loop is slow with many triggers; time it on fewer keys.
+        old_keys = keys[: max(1000, args.keys * 100 // max(count, 100))]
+        old, old_matches = _measure(endswith_matcher(triggers), old_keys)
+        new, new_matches = _measure(trie_matcher(triggers), old_keys)
+        assert old_matches == new_matches, "matchers disagree"
+        new, _ = _measure(trie_matcher(triggers), keys)
+        print(f"{count:>9}  {old:>10.2f}  {new:>10.2f}  {old / new:>8.0f}x")
+
+    if args.library:
+        bench_reload(args.library, random.Random(args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""
+Local stand-in for the OpenAI, Anthropic, Ollama and Gemini chat APIs.
+
+Speaks just enough of each wire format for the clients in this repo, in
+streaming and non-streaming mode, with configurable time to first token,
+tokens per second, server errors and 429s:
+
+    POST /v1/chat/completions                       OpenAI Chat Completions (SSE when "stream")
+    POST /v1/messages                               Anthropic Messages (SSE when "stream")
+    POST /api/chat                                  Ollama (NDJSON unless "stream": false)
+    POST /v1beta/models/<model>:generateContent     Gemini REST
+    POST /v1beta/models/<model>:streamGenerateContent?alt=sse
+
+The benchmarks import ``StandInServer`` as a fixture. It can also run on
+its own, to point the apps at it:
+
+    python benchmarks/standin_server.py [--port 8080] [--ttft-ms 200] [--tokens-per-sec 50]
+        [--error-rate 0.0] [--rate-limit-rate 0.0]
+
+    settings.ini [openai] endpoint = http://127.0.0.1:8080/v1/chat/completions
+    Windows_and_Linux OpenAI-compatible API base = http://127.0.0.1:8080/v1
+    Windows_and_Linux Ollama API base = http://127.0.0.1:8080
+    (google-generativeai needs transport="rest" and client_options={"api_endpoint": ...})
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterator, Optional, Union
+from urllib.parse import urlsplit
+
+
+Delay = Union[float, Callable[[], float]]
+
+
+@dataclass
+class StandInConfig:
+    reply: str = "This is a test reply from the local stand-in server, streamed one word at a time."
+    ttft: Delay = 0.0               # seconds before the first token (a callable is drawn per request)
+    tokens_per_sec: float = 0.0     # 0 sends the whole reply at once
+    error_rate: float = 0.0         # share of requests answered with a 500
+    rate_limit_rate: float = 0.0    # share of requests answered with a 429
+    retry_after: float = 0.1        # seconds advertised on 429s
+    stats: Counter = field(default_factory=Counter)
+
+    def draw_ttft(self) -> float:
+        return self.ttft() if callable(self.ttft) else self.ttft
+
+
+_WORDS = re.compile(r"\S+\s*")
+
+
+def _rough_tokens(value: Any) -> int:
+    return max(1, len(json.dumps(value, ensure_ascii=False)) // 4)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    config: StandInConfig
+    stats_lock: threading.Lock
+
+    # -- dispatch ---------------------------------------------------------
+
+    def do_POST(self) -> None:
+        path = urlsplit(self.path).path
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            request = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "invalid JSON"}})
+            return
+
+        if path.endswith("/chat/completions"):
+            api = "openai"
+        elif path.endswith("/messages"):
+            api = "anthropic"
+        elif path.endswith("/api/chat"):
+            api = "ollama"
+        elif ":generateContent" in path or ":streamGenerateContent" in path:
+            api = "gemini"
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {path}"}})
+            return
+
+        roll = random.random()
+        if roll < self.config.rate_limit_rate:
+            self._count(api, 429)
+            self._send_error(api, 429)
+            return
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            self._count(api, 500)
+            self._send_error(api, 500)
+            return
+
+        self._count(api, 200)
+        handler = getattr(self, f"_{api}")
+        try:
+            handler(path, request)
+        except OSError:
+            pass  # the client hung up (e.g. a cancelled request)
+
+    # -- vendor formats ---------------------------------------------------
+
+    def _openai(self, path: str, request: dict) -> None:
+        model = request.get("model", "stand-in")
+        prompt = _rough_tokens(request.get("messages"))
+        pieces = self._pieces()
+        usage = {"prompt_tokens": prompt, "completion_tokens": len(pieces), "total_tokens": prompt + len(pieces),
+                 "prompt_tokens_details": {"cached_tokens": 0}}
+        if not request.get("stream"):
+            self._wait_for_reply(pieces)
+            self._send_json(200, {
+                "id": "chatcmpl-standin", "object": "chat.completion", "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(pieces)},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        def events() -> Iterator[str]:
+            for piece in self._timed(pieces):
+                chunk = {"id": "chatcmpl-standin", "object": "chat.completion.chunk", "model": model,
+                         "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            if (request.get("stream_options") or {}).get("include_usage"):
+                yield f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        self._stream("text/event-stream", events())
+
+    def _anthropic(self, path: str, request: dict) -> None:
+        prompt = _rough_tokens([request.get("system"), request.get("messages")])
+        pieces = self._pieces()
+        if not request.get("stream"):
+            self._wait_for_reply(pieces)
+            self._send_json(200, {
+                "id": "msg_standin", "type": "message", "role": "assistant", "model": request.get("model"),
+                "content": [{"type": "text", "text": "".join(pieces)}], "stop_reason": "end_turn",
+                "usage": {"input_tokens": prompt, "output_tokens": len(pieces)},
+            })
+            return
+
+        def events() -> Iterator[str]:
+            def event(kind: str, data: dict) -> str:
+                return f"event: {kind}\ndata: {json.dumps(dict(type=kind, **data))}\n\n"
+
+            yield event("message_start", {"message": {"id": "msg_standin", "role": "assistant", "content": [],
+                                                      "usage": {"input_tokens": prompt, "output_tokens": 1}}})
+            yield event("content_block_start", {"index": 0, "content_block": {"type": "text", "text": ""}})
+            for piece in self._timed(pieces):
+                yield event("content_block_delta", {"index": 0, "delta": {"type": "text_delta", "text": piece}})
+            yield event("content_block_stop", {"index": 0})
+            yield event("message_delta", {"delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": len(pieces)}})
+            yield event("message_stop", {})
+
+        self._stream("text/event-stream", events())
+
+    def _ollama(self, path: str, request: dict) -> None:
+        model = request.get("model", "stand-in")
+        prompt = _rough_tokens(request.get("messages"))
+        pieces = self._pieces()
+        final = {"model": model, "done": True, "done_reason": "stop",
+                 "prompt_eval_count": prompt, "eval_count": len(pieces)}
+        if request.get("stream", True) is False:
+            self._wait_for_reply(pieces)
+            self._send_json(200, dict(final, message={"role": "assistant", "content": "".join(pieces)}))
+            return
+
+        def lines() -> Iterator[str]:
+            for piece in self._timed(pieces):
+                yield json.dumps({"model": model, "message": {"role": "assistant", "content": piece}, "done": False}) + "\n"
+            yield json.dumps(dict(final, message={"role": "assistant", "content": ""})) + "\n"
+
+        self._stream("application/x-ndjson", lines())
+
+    def _gemini(self, path: str, request: dict) -> None:
+        prompt = _rough_tokens(request.get("contents"))
+        pieces = self._pieces()
+
+        def response(text: str, done: bool) -> dict:
+            candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+            if done:
+                candidate["finishReason"] = "STOP"
+            return {"candidates": [candidate],
+                    "usageMetadata": {"promptTokenCount": prompt, "candidatesTokenCount": len(pieces),
+                                      "totalTokenCount": prompt + len(pieces)}}
+
+        if ":streamGenerateContent" not in path:
+            self._wait_for_reply(pieces)
+            self._send_json(200, response("".join(pieces), True))
+            return
+
+        def events() -> Iterator[str]:
+            for index, piece in enumerate(self._timed(pieces)):
+                yield f"data: {json.dumps(response(piece, index == len(pieces) - 1))}\n\n"
+
+        self._stream("text/event-stream", events())
+
+    # -- helpers ----------------------------------------------------------
+
+    def _pieces(self) -> list[str]:
+        return _WORDS.findall(self.config.reply) or [self.config.reply]
+
+    def _wait_for_reply(self, pieces: list[str]) -> None:
+        delay = self.config.draw_ttft()
+        if self.config.tokens_per_sec > 0:
+            delay += (len(pieces) - 1) / self.config.tokens_per_sec
+        if delay > 0:
+            time.sleep(delay)
+
+    def _timed(self, pieces: list[str]) -> Iterator[str]:
+        delay = self.config.draw_ttft()
+        if delay > 0:
+            time.sleep(delay)
+        for index, piece in enumerate(pieces):
+            if index and self.config.tokens_per_sec > 0:
+                time.sleep(1 / self.config.tokens_per_sec)
+            yield piece
+
+    def _stream(self, content_type: str, chunks: Iterator[str]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, api: str, status: int) -> None:
+        limited = status == 429
+        message = "Rate limit reached (injected)" if limited else "Internal server error (injected)"
+        headers = {}
+        if limited:
+            headers = {"retry-after-ms": str(int(self.config.retry_after * 1000)),
+                       "Retry-After": str(math.ceil(self.config.retry_after))}
+        if api == "anthropic":
+            kind = "rate_limit_error" if limited else "api_error"
+            body = {"type": "error", "error": {"type": kind, "message": message}}
+        elif api == "ollama":
+            body = {"error": message}
+        elif api == "gemini":
+            state = "RESOURCE_EXHAUSTED" if limited else "INTERNAL"
+            body = {"error": {"code": status, "message": "Resource has been exhausted" if limited else message,
+                              "status": state}}
+        else:
+            body = {"error": {"message": message, "type": "rate_limit_error" if limited else "server_error"}}
+        self._send_json(status, body, headers)
+
+    def _count(self, api: str, status: int) -> None:
+        with self.stats_lock:
+            self.config.stats[(api, status)] += 1
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default of 5 drops connects under concurrency and adds 1 s SYN retries
+
+    def handle_error(self, request, client_address) -> None:
+        pass  # cancelled requests reset their connections; that is expected here
+
+
+class StandInServer:
+    """Runs the stand-in on a background thread; use as a context manager or call start()/stop()."""
+
+    def __init__(self, config: Optional[StandInConfig] = None, host: str = "127.0.0.1", port: int = 0, **options):
+        self.config = config or StandInConfig(**options)
+        handler = type("StandInHandler", (_StandInHandler,), {"config": self.config, "stats_lock": threading.Lock()})
+        self._server = _QuietServer((host, port), handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_url(self) -> str:
+        return f"{self.base_url}/v1/chat/completions"
+
+    @property
+    def anthropic_url(self) -> str:
+        return f"{self.base_url}/v1/messages"
+
+    @property
+    def ollama_url(self) -> str:
+        return f"{self.base_url}/api/chat"
+
+    def gemini_url(self, model: str = "gemini-2.0-flash", stream: bool = False) -> str:
+        if stream:
+            return f"{self.base_url}/v1beta/models/{model}:streamGenerateContent?alt=sse"
+        return f"{self.base_url}/v1beta/models/{model}:generateContent"
+
+    @property
+    def stats(self) -> Counter:
+        """Requests served so far, keyed by ``(api, status)``."""
+        return Counter(self.config.stats)
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--ttft-ms", type=float, default=200)
+    parser.add_argument("--tokens-per-sec", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0, help="seconds advertised on 429s")
+    args = parser.parse_args()
+
+    server = StandInServer(
+        host=args.host,
+        port=args.port,
+        ttft=args.ttft_ms / 1000,
+        tokens_per_sec=args.tokens_per_sec,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+    )
+    print(f"Stand-in server on {server.base_url} (Ctrl+C to stop)")
+    print(f"  OpenAI     {server.openai_url}")
+    print(f"  Anthropic  {server.anthropic_url}")
+    print(f"  Ollama     {server.base_url}")
+    print(f"  Gemini     {server.gemini_url()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for (api, status), count in sorted(server.stats.items()):
+            print(f"{api:<10} {status}  {count}")
+
+
+if __name__ == "__main__":
+    main()
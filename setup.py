@@ -31,6 +31,15 @@ setup(
             "numpy>=1.24",
             "pygame>=2.5",
         ],
+        "http2": [
+            "httpx[http2]>=0.27",
+        ],
+        "async": [
+            "httpx>=0.27",
+        ],
+        "tokens": [
+            "tiktoken>=0.7",
+        ],
     },
     entry_points={
         "console_scripts": [
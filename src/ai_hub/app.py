@@ -3,11 +3,28 @@ from __future__ import annotations
 from pathlib import Path
 
 from .config import load_settings
+from .services.backends import clipboard_driver, configure_backends
+from .services.clipboard_snapshot import configure_snapshots
+from .services.clipboard_watch import configure_clipboard
+from .services.edit_list import configure_edit_lists
+from .services.http_transport import configure_transport
+from .services.rate_limiter import configure_rate_limits
+from .services.telemetry import configure_telemetry
+from .services.tokens import preload_encoding
 from .ui.main_window import run_app
 
 
 def main() -> None:
     settings = load_settings()
+    configure_transport(settings.http)
+    configure_rate_limits(settings.rate_limit)
+    configure_edit_lists(settings.edit_list)
+    configure_telemetry(settings.telemetry)
+    preload_encoding(settings.openai.model)
+    configure_clipboard(settings.clipboard)
+    configure_snapshots(settings.clipboard)
+    if settings.clipboard.driver != "auto":
+        configure_backends(clipboard_backend=clipboard_driver(settings.clipboard.driver))
     run_app(settings)
 
 
@@ -32,11 +32,82 @@ class HotstringSettings:
     buffer_size: int = 64
 
 
+@dataclass(slots=True)
+class HTTPSettings:
+    pool_size: int = 10
+    keep_alive: float = 90.0
+    http2: bool = False
+
+
+@dataclass(slots=True)
+class CacheSettings:
+    enabled: bool = True
+    path: str = "config/response_cache.sqlite3"
+    memory_entries: int = 256
+    max_entries: int = 5000
+    ttl: float = 7 * 24 * 3600
+
+
+@dataclass(slots=True)
+class RateLimitSettings:
+    requests_per_minute: float = 500
+    tokens_per_minute: float = 200_000
+    max_retries: int = 5
+    max_backoff: float = 30.0
+
+
+@dataclass(slots=True)
+class ChunkingSettings:
+    max_chunk_tokens: int = 1500
+    concurrency: int = 4
+
+
+@dataclass(slots=True)
+class EditListSettings:
+    enabled: bool = True
+    min_chars: int = 400
+
+
+@dataclass(slots=True)
+class SpeculationSettings:
+    enabled: bool = False
+    min_picks: int = 3
+    history_path: str = "config/prompt_history.json"
+
+
+@dataclass(slots=True)
+class TelemetrySettings:
+    enabled: bool = True
+    path: str = "config/telemetry.jsonl"
+    max_bytes: int = 1_000_000
+    backups: int = 3
+    buffer_size: int = 1000
+
+
+@dataclass(slots=True)
+class ClipboardSettings:
+    driver: str = "auto"
+    copy_timeout: float = 0.5
+    min_copy_timeout: float = 0.03
+    paste_settle: float = 0.15
+    learn_delays: bool = True
+    rich_formats: bool = True
+    snapshot_max_bytes: int = 16_000_000
+
+
 @dataclass(slots=True)
 class AppSettings:
     openai: OpenAISettings
     hotkeys: HotkeySettings
     hotstrings: HotstringSettings
+    http: HTTPSettings
+    cache: CacheSettings
+    rate_limit: RateLimitSettings
+    chunking: ChunkingSettings
+    edit_list: EditListSettings
+    speculation: SpeculationSettings
+    telemetry: TelemetrySettings
+    clipboard: ClipboardSettings
 
 
 _DEFAULT_ENDPOINT = "https://api.openai.com/v1/chat/completions"
@@ -57,6 +128,16 @@ def _read_ini_value(parser: configparser.ConfigParser, section: str, option: str
     return fallback
 
 
+def _resolve_path(settings_path: Path, value: str) -> str:
+    """``value`` relative to the directory of the settings file rather than the working directory."""
+    if not value:
+        return value
+    path = Path(value).expanduser()
+    if path.is_absolute():
+        return str(path)
+    return str(settings_path.resolve().parent / path)
+
+
 def load_settings(settings_path: Path | None = None) -> AppSettings:
     path = settings_path or DEFAULT_SETTINGS_PATH
     parser = _load_settings_file(path)
@@ -74,6 +155,45 @@ def load_settings(settings_path: Path | None = None) -> AppSettings:
     hotstrings_enabled = _read_ini_value(parser, "hotstrings", "enabled", None)
     hotstrings_buffer = _read_ini_value(parser, "hotstrings", "buffer_size", str(HotstringSettings().buffer_size)) or str(HotstringSettings().buffer_size)
 
+    http_pool_size = _read_ini_value(parser, "http", "pool_size", str(HTTPSettings().pool_size)) or str(HTTPSettings().pool_size)
+    http_keep_alive = _read_ini_value(parser, "http", "keep_alive", str(HTTPSettings().keep_alive)) or str(HTTPSettings().keep_alive)
+    http_http2 = _read_ini_value(parser, "http", "http2", None)
+
+    cache_enabled = _read_ini_value(parser, "cache", "enabled", None)
+    cache_path = _read_ini_value(parser, "cache", "path", CacheSettings().path) or CacheSettings().path
+    cache_memory = _read_ini_value(parser, "cache", "memory_entries", str(CacheSettings().memory_entries)) or str(CacheSettings().memory_entries)
+    cache_max = _read_ini_value(parser, "cache", "max_entries", str(CacheSettings().max_entries)) or str(CacheSettings().max_entries)
+    cache_ttl = _read_ini_value(parser, "cache", "ttl", str(CacheSettings().ttl)) or str(CacheSettings().ttl)
+
+    rate_rpm = _read_ini_value(parser, "rate_limit", "requests_per_minute", str(RateLimitSettings().requests_per_minute)) or str(RateLimitSettings().requests_per_minute)
+    rate_tpm = _read_ini_value(parser, "rate_limit", "tokens_per_minute", str(RateLimitSettings().tokens_per_minute)) or str(RateLimitSettings().tokens_per_minute)
+    rate_retries = _read_ini_value(parser, "rate_limit", "max_retries", str(RateLimitSettings().max_retries)) or str(RateLimitSettings().max_retries)
+    rate_backoff = _read_ini_value(parser, "rate_limit", "max_backoff", str(RateLimitSettings().max_backoff)) or str(RateLimitSettings().max_backoff)
+
+    chunk_tokens = _read_ini_value(parser, "chunking", "max_chunk_tokens", str(ChunkingSettings().max_chunk_tokens)) or str(ChunkingSettings().max_chunk_tokens)
+    chunk_concurrency = _read_ini_value(parser, "chunking", "concurrency", str(ChunkingSettings().concurrency)) or str(ChunkingSettings().concurrency)
+
+    edit_list_enabled = _read_ini_value(parser, "edit_list", "enabled", None)
+    edit_list_min_chars = _read_ini_value(parser, "edit_list", "min_chars", str(EditListSettings().min_chars)) or str(EditListSettings().min_chars)
+
+    telemetry_enabled = _read_ini_value(parser, "telemetry", "enabled", None)
+    telemetry_path = _read_ini_value(parser, "telemetry", "path", TelemetrySettings().path)
+    telemetry_max_bytes = _read_ini_value(parser, "telemetry", "max_bytes", str(TelemetrySettings().max_bytes)) or str(TelemetrySettings().max_bytes)
+    telemetry_backups = _read_ini_value(parser, "telemetry", "backups", str(TelemetrySettings().backups)) or str(TelemetrySettings().backups)
+    telemetry_buffer = _read_ini_value(parser, "telemetry", "buffer_size", str(TelemetrySettings().buffer_size)) or str(TelemetrySettings().buffer_size)
+
+    clipboard_driver = _read_ini_value(parser, "clipboard", "driver", ClipboardSettings().driver) or ClipboardSettings().driver
+    clipboard_timeout = _read_ini_value(parser, "clipboard", "copy_timeout", str(ClipboardSettings().copy_timeout)) or str(ClipboardSettings().copy_timeout)
+    clipboard_min_timeout = _read_ini_value(parser, "clipboard", "min_copy_timeout", str(ClipboardSettings().min_copy_timeout)) or str(ClipboardSettings().min_copy_timeout)
+    clipboard_settle = _read_ini_value(parser, "clipboard", "paste_settle", str(ClipboardSettings().paste_settle)) or str(ClipboardSettings().paste_settle)
+    clipboard_learn = _read_ini_value(parser, "clipboard", "learn_delays", None)
+    clipboard_rich = _read_ini_value(parser, "clipboard", "rich_formats", None)
+    clipboard_max_bytes = _read_ini_value(parser, "clipboard", "snapshot_max_bytes", str(ClipboardSettings().snapshot_max_bytes)) or str(ClipboardSettings().snapshot_max_bytes)
+
+    speculation_enabled = _read_ini_value(parser, "speculation", "enabled", None)
+    speculation_picks = _read_ini_value(parser, "speculation", "min_picks", str(SpeculationSettings().min_picks)) or str(SpeculationSettings().min_picks)
+    speculation_path = _read_ini_value(parser, "speculation", "history_path", SpeculationSettings().history_path) or SpeculationSettings().history_path
+
     openai_settings = OpenAISettings(
         api_key=api_key,
         endpoint=endpoint,
@@ -90,8 +210,63 @@ def load_settings(settings_path: Path | None = None) -> AppSettings:
         enabled_by_default=(hotstrings_enabled.lower() == "true") if isinstance(hotstrings_enabled, str) else HotstringSettings().enabled_by_default,
         buffer_size=int(hotstrings_buffer),
     )
+    http_settings = HTTPSettings(
+        pool_size=int(http_pool_size),
+        keep_alive=float(http_keep_alive),
+        http2=(http_http2.lower() == "true") if isinstance(http_http2, str) else HTTPSettings().http2,
+    )
+    cache_settings = CacheSettings(
+        enabled=(cache_enabled.lower() == "true") if isinstance(cache_enabled, str) else CacheSettings().enabled,
+        path=_resolve_path(path, cache_path),
+        memory_entries=int(cache_memory),
+        max_entries=int(cache_max),
+        ttl=float(cache_ttl),
+    )
+    rate_limit_settings = RateLimitSettings(
+        requests_per_minute=float(rate_rpm),
+        tokens_per_minute=float(rate_tpm),
+        max_retries=int(rate_retries),
+        max_backoff=float(rate_backoff),
+    )
+    chunking_settings = ChunkingSettings(
+        max_chunk_tokens=int(chunk_tokens),
+        concurrency=int(chunk_concurrency),
+    )
+    edit_list_settings = EditListSettings(
+        enabled=(edit_list_enabled.lower() == "true") if isinstance(edit_list_enabled, str) else EditListSettings().enabled,
+        min_chars=int(edit_list_min_chars),
+    )
+    speculation_settings = SpeculationSettings(
+        enabled=(speculation_enabled.lower() == "true") if isinstance(speculation_enabled, str) else SpeculationSettings().enabled,
+        min_picks=int(speculation_picks),
+        history_path=_resolve_path(path, speculation_path),
+    )
+    telemetry_settings = TelemetrySettings(
+        enabled=(telemetry_enabled.lower() == "true") if isinstance(telemetry_enabled, str) else TelemetrySettings().enabled,
+        path=_resolve_path(path, telemetry_path if telemetry_path is not None else TelemetrySettings().path),
+        max_bytes=int(telemetry_max_bytes),
+        backups=int(telemetry_backups),
+        buffer_size=int(telemetry_buffer),
+    )
+    clipboard_settings = ClipboardSettings(
+        driver=clipboard_driver.strip().lower(),
+        copy_timeout=float(clipboard_timeout),
+        min_copy_timeout=float(clipboard_min_timeout),
+        paste_settle=float(clipboard_settle),
+        learn_delays=(clipboard_learn.lower() == "true") if isinstance(clipboard_learn, str) else ClipboardSettings().learn_delays,
+        rich_formats=(clipboard_rich.lower() == "true") if isinstance(clipboard_rich, str) else ClipboardSettings().rich_formats,
+        snapshot_max_bytes=int(clipboard_max_bytes),
+    )
     return AppSettings(
         openai=openai_settings,
         hotkeys=hotkey_settings,
         hotstrings=hotstring_settings,
+        http=http_settings,
+        cache=cache_settings,
+        rate_limit=rate_limit_settings,
+        chunking=chunking_settings,
+        edit_list=edit_list_settings,
+        speculation=speculation_settings,
+        telemetry=telemetry_settings,
+        clipboard=clipboard_settings,
     )
@@ -7,15 +7,27 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable
 
-import keyboard
-
-from ..services.openai_client import OpenAIClient
+from ..services.backends import get_keyboard
+from ..services.hotkey_registry import get_hotkey_registry
+from ..services.openai_client import ErrorReply, OpenAIClient
 from ..services.prompt_manager import Prompt
 from ..services.selection import get_selection, replace_selection
+from ..services.cancellation import CancelToken
+from ..services.edit_list import run_prompt
+from ..services.single_flight import flight_key, get_single_flight, run_paste_request
+from ..services.speculation import Speculator
+from ..services.telemetry import prompt_label
+from .hotstrings import HotstringEngine
+from .shortcut_hotstrings import ShortcutHotstrings
 from ..ui.dialogs.prompt_navigator import PromptNavigator
 from ..ui.dialogs.result_popup import ResultPopup
 
 
+SHORTCUTS_FILE = Path("config/shortcuts.json")
+OWNER = "global hotkeys"
+SHORTCUTS_OWNER = "shortcuts.json"
+
+
 @dataclass(slots=True)
 class HotkeyCallbacks:
     focus_hub_tab: Callable[[], None]
@@ -31,6 +43,8 @@ class GlobalHotkeys:
         prompt_hotkey: str,
         spelling_hotkey: str,
         goto_hotkey: str | None,
+        speculator: Speculator | None = None,
+        hotstrings: HotstringEngine | None = None,
     ) -> None:
         self._client = client
         self._prompts = prompts
@@ -39,17 +53,24 @@ class GlobalHotkeys:
         self._prompt_hotkey = prompt_hotkey
         self._spelling_hotkey = spelling_hotkey
         self._goto_hotkey = goto_hotkey
-        self._navigator = PromptNavigator(client, prompts)
+        self._navigator = PromptNavigator(client, prompts, speculator)
+        self._shortcut_hotstrings = (
+            ShortcutHotstrings(hotstrings, self._make_hotstring_action, SHORTCUTS_FILE, on_reload=self._sync_custom_hotkeys)
+            if hotstrings is not None else None
+        )
 
     def start(self) -> None:
         # Register default hotkeys
-        keyboard.add_hotkey(self._spelling_hotkey, self._run_spelling, suppress=False, trigger_on_release=True)
-        keyboard.add_hotkey(self._prompt_hotkey, self._show_prompt_navigator, suppress=False, trigger_on_release=True)
+        registry = get_hotkey_registry()
+        registry.bind(OWNER, self._spelling_hotkey, self._run_spelling, "Spelling")
+        registry.bind(OWNER, self._prompt_hotkey, self._show_prompt_navigator, "Prompt navigator")
         if self._goto_hotkey:
-            keyboard.add_hotkey(self._goto_hotkey, self._callbacks.focus_hub_tab, suppress=False, trigger_on_release=True)
+            registry.bind(OWNER, self._goto_hotkey, self._callbacks.focus_hub_tab, "Go to hub")
         
         # Load and register custom shortcuts from JSON
         self._load_custom_shortcuts()
+        if self._shortcut_hotstrings is not None:
+            self._shortcut_hotstrings.watch()
 
     def _show_prompt_navigator(self) -> None:
         self._navigator.show_near_cursor()
@@ -60,8 +81,16 @@ class GlobalHotkeys:
             return
 
         def run() -> None:
-            output = self._client.chat(self._spelling_prompt.system or None, self._spelling_prompt.build_message(selection), self._spelling_prompt.temperature)
-            if output.strip():
+            prompt = self._spelling_prompt
+            output = run_paste_request(
+                flight_key(prompt.name, selection),
+                lambda cancel: run_prompt(self._client, prompt, selection, cancel),
+            )
+            if output is None:
+                return
+            if isinstance(output, ErrorReply):
+                print(f"⚠️ {output.strip()}")
+            elif output.strip():
                 replace_selection(output)
 
         threading.Thread(target=run, daemon=True).start()
@@ -75,19 +104,30 @@ class GlobalHotkeys:
             return
 
         def run() -> None:
-            output = self._client.chat(prompt.system or None, prompt.build_message(selection), prompt.temperature)
-            if not output.strip():
+            if not prompt.replace:
+                cancel = CancelToken()
+                with prompt_label(prompt.name):
+                    get_single_flight().do(
+                        flight_key(prompt.name, selection),
+                        lambda: ResultPopup.show_stream(prompt.name, self._client.chat_stream(prompt.system or None, prompt.build_message(selection), prompt.temperature, cancel), cancel),
+                    )
                 return
-            if prompt.replace:
+            output = run_paste_request(
+                flight_key(prompt.name, selection),
+                lambda cancel: run_prompt(self._client, prompt, selection, cancel),
+            )
+            if output is None:
+                return
+            if isinstance(output, ErrorReply):
+                print(f"⚠️ {output.strip()}")
+            elif output.strip():
                 replace_selection(output)
-            else:
-                ResultPopup.show_text(prompt.name, output)
 
         threading.Thread(target=run, daemon=True).start()
 
     def _load_custom_shortcuts(self) -> None:
         """Load custom shortcuts from JSON and register them."""
-        shortcuts_file = Path("config/shortcuts.json")
+        shortcuts_file = SHORTCUTS_FILE
         if not shortcuts_file.exists():
             return
 
@@ -95,52 +135,55 @@ class GlobalHotkeys:
             with open(shortcuts_file, "r", encoding="utf-8") as f:
                 shortcuts = json.load(f)
 
-            for shortcut in shortcuts:
-                if shortcut["type"] == "Hotkey":
-                    self._register_hotkey(shortcut)
-                elif shortcut["type"] == "Hotstring":
-                    self._register_hotstring(shortcut)
+            self._sync_custom_hotkeys(shortcuts)
+            if self._shortcut_hotstrings is not None:
+                result = self._shortcut_hotstrings.load(shortcuts)
+                print(f"✅ Compiled {result.added} hotstrings in {result.seconds * 1000:.1f} ms")
 
             print(f"✅ Loaded {len(shortcuts)} custom shortcuts")
         except Exception as e:
             print(f"⚠️ Error loading custom shortcuts: {e}")
 
-    def _register_hotkey(self, shortcut: dict[str, Any]) -> None:
-        """Register a custom hotkey."""
-        try:
+    def _sync_custom_hotkeys(self, shortcuts: list[dict[str, Any]]) -> None:
+        """Make the registered custom hotkeys match the "Hotkey" entries; only changed combos are touched."""
+        wanted: dict[str, tuple[Callable[[], None], str]] = {}
+        for shortcut in shortcuts:
+            if shortcut.get("type") != "Hotkey" or not shortcut.get("trigger"):
+                continue
             # Build the hotkey string (e.g., "ctrl+alt+k")
             modifiers = shortcut.get("modifiers", [])
-            trigger = shortcut["trigger"]
-            hotkey_str = "+".join(modifiers + [trigger]) if modifiers else trigger
-
-            # Create the handler based on action type
-            action = shortcut["action"]
-            if action == "Send Text":
-                handler = self._make_send_text_handler(shortcut["output"])
-            elif action == "Run Program":
-                handler = self._make_run_program_handler(shortcut["output"])
-            elif action == "AI Rewrite":
-                handler = self._make_ai_rewrite_handler(shortcut["output"])
-            elif action == "Mouse Click":
-                handler = self._make_mouse_click_handler(shortcut["output"])
-            else:
-                return
+            hotkey_str = "+".join(modifiers + [shortcut["trigger"]])
+            handler = self._make_handler(shortcut)
+            if handler is not None:
+                wanted[hotkey_str] = (handler, shortcut.get("desc") or shortcut["action"])
+        bound, removed = get_hotkey_registry().sync(SHORTCUTS_OWNER, wanted)
+        print(f"✅ Custom hotkeys: {bound} of {len(wanted)} bound, {removed} removed")
 
-            keyboard.add_hotkey(hotkey_str, handler, suppress=False, trigger_on_release=True)
-            print(f"✅ Registered hotkey: {hotkey_str} -> {action}")
-        except Exception as e:
-            print(f"⚠️ Error registering hotkey {shortcut.get('trigger')}: {e}")
+    def _make_handler(self, shortcut: dict[str, Any]) -> Callable[[], None] | None:
+        """The handler for a shortcut's action, or ``None`` for an unknown action."""
+        action = shortcut.get("action")
+        if action == "Send Text":
+            return self._make_send_text_handler(shortcut["output"])
+        if action == "Run Program":
+            return self._make_run_program_handler(shortcut["output"])
+        if action == "AI Rewrite":
+            return self._make_ai_rewrite_handler(shortcut["output"])
+        if action == "Mouse Click":
+            return self._make_mouse_click_handler(shortcut["output"])
+        return None
 
-    def _register_hotstring(self, shortcut: dict[str, Any]) -> None:
-        """Register a custom hotstring (text replacement)."""
-        # Note: Hotstrings are handled by the HotstringEngine in main_window.py
-        # This is a placeholder for future integration
-        pass
+    def _make_hotstring_action(self, shortcut: dict[str, Any]) -> Callable[[], None] | None:
+        """What a shortcuts.json hotstring does once its abbreviation has been erased."""
+        if shortcut.get("action") == "Send Text":
+            text = shortcut["output"]
+            # Pasted rather than typed, like the built-in text hotstrings: one step for any length.
+            return lambda: replace_selection(text)
+        return self._make_handler(shortcut)
 
     def _make_send_text_handler(self, text: str) -> Callable[[], None]:
         """Create a handler that sends text."""
         def handler() -> None:
-            keyboard.write(text)
+            get_keyboard().write(text)
         return handler
 
     def _make_run_program_handler(self, program_path: str) -> Callable[[], None]:
@@ -164,8 +207,16 @@ class GlobalHotkeys:
                     # Use the instruction as the user message
                     system_msg = "You are a helpful writing assistant. Follow the user's instructions precisely."
                     user_msg = f"{instruction}\n\nText to process:\n{selection}"
-                    output = self._client.chat(system_msg, user_msg, temperature=0.7)
-                    if output.strip():
+                    with prompt_label("AI Rewrite"):
+                        output = run_paste_request(
+                            flight_key(instruction, selection),
+                            lambda cancel: self._client.chat(system_msg, user_msg, temperature=0.7, cancel=cancel),
+                        )
+                    if output is None:
+                        return
+                    if isinstance(output, ErrorReply):
+                        print(f"⚠️ AI rewrite error: {output.strip()}")
+                    elif output.strip():
                         replace_selection(output)
                 except Exception as e:
                     print(f"⚠️ AI rewrite error: {e}")
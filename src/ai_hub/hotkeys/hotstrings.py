@@ -3,16 +3,19 @@ from __future__ import annotations
 import threading
 import time
 from dataclasses import dataclass
-from typing import Callable
+from typing import Callable, Generic, Optional, TypeVar
 
-import keyboard
-
-from ..services.openai_client import OpenAIClient
+from ..services.backends import get_keyboard
+from ..services.edit_list import run_prompt
+from ..services.key_dispatcher import get_dispatcher
+from ..services.openai_client import ErrorReply, OpenAIClient
 from ..services.prompt_manager import Prompt
 from ..services.selection import get_selection, replace_selection
+from ..services.single_flight import flight_key, run_paste_request
 
 
 HotstringCallback = Callable[[], None]
+T = TypeVar("T")
 
 
 @dataclass(slots=True)
@@ -21,15 +24,114 @@ class HotstringDefinition:
     action: Callable[[], None]
 
 
+class _Node:
+    __slots__ = ("children", "value", "trigger")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.value = None
+        self.trigger: Optional[str] = None
+
+
+class HotstringMatcher(Generic[T]):
+    """Finds the trigger the typed text ends with, in time independent of the number of triggers.
+
+    Triggers are kept in a trie of their reversed characters, and the last
+    ``buffer_size`` keys in a ring buffer. Each key walks the trie from the
+    newest key backwards, so it costs at most one step per character of the
+    longest trigger (usually one or two steps), however many triggers there
+    are. Adding or removing a trigger only touches its own path.
+    """
+
+    def __init__(self, buffer_size: int) -> None:
+        self._root = _Node()
+        self._ring = [""] * max(1, buffer_size)
+        self._head = 0   # where the next key goes
+        self._length = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, trigger: str, value: T) -> None:
+        if not trigger:
+            return
+        node = self._root
+        for char in reversed(trigger):
+            node = node.children.setdefault(char, _Node())
+        if node.trigger is None:
+            self._count += 1
+        node.value, node.trigger = value, trigger
+
+    def remove(self, trigger: str) -> bool:
+        path = [self._root]
+        for char in reversed(trigger):
+            child = path[-1].children.get(char)
+            if child is None:
+                return False
+            path.append(child)
+        node = path[-1]
+        if node.trigger is None:
+            return False
+        node.value, node.trigger = None, None
+        self._count -= 1
+        # Prune the branch back to the last node still in use.
+        for depth in range(len(trigger), 0, -1):
+            child, parent = path[depth], path[depth - 1]
+            if child.children or child.trigger is not None:
+                break
+            del parent.children[trigger[len(trigger) - depth]]
+        return True
+
+    def get(self, trigger: str) -> Optional[T]:
+        node = self._root
+        for char in reversed(trigger):
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node.value if node.trigger is not None else None
+
+    def feed(self, char: str) -> Optional[tuple[str, T]]:
+        """Add a typed character; the longest trigger the text now ends with, if any."""
+        ring = self._ring
+        size = len(ring)
+        ring[self._head] = char
+        self._head = (self._head + 1) % size
+        if self._length < size:
+            self._length += 1
+
+        match = None
+        node = self._root
+        index = self._head
+        for _ in range(self._length):
+            index = (index - 1) % size
+            node = node.children.get(ring[index])
+            if node is None:
+                break
+            if node.trigger is not None:
+                match = node
+        return (match.trigger, match.value) if match is not None else None
+
+    def backspace(self) -> None:
+        if self._length:
+            self._length -= 1
+            self._head = (self._head - 1) % len(self._ring)
+
+    def reset(self) -> None:
+        self._length = 0
+
+
 class HotstringEngine:
-    """Simple keystroke buffer for text expanders and AI actions."""
+    """Keystroke buffer for text expanders and AI actions, matched with a ``HotstringMatcher``."""
 
     def __init__(self, *, buffer_size: int, enabled: bool = True) -> None:
-        self._buffer_size = buffer_size
         self._enabled = enabled
-        self._buffer: list[str] = []
         self._text_hotstrings: dict[str, Callable[[], None]] = {}
         self._ai_hotstrings: dict[str, Callable[[], None]] = {}
+        self._shortcut_hotstrings: dict[str, Callable[[], None]] = {}
+        # Union of all kinds; for the same trigger a shortcuts.json entry wins over a
+        # built-in text hotstring, which wins over an AI one.
+        self._matcher: HotstringMatcher[Callable[[], None]] = HotstringMatcher(buffer_size)
 
     @property
     def enabled(self) -> bool:
@@ -44,12 +146,33 @@ class HotstringEngine:
             replace_selection(text)
 
         self._text_hotstrings[trigger] = action
+        self._update(trigger)
 
     def register_ai(self, trigger: str, callback: HotstringCallback) -> None:
         self._ai_hotstrings[trigger] = callback
+        self._update(trigger)
+
+    def register_shortcut(self, trigger: str, callback: HotstringCallback) -> None:
+        """Add or replace a hotstring from shortcuts.json; only ``trigger``'s trie path is touched."""
+        self._shortcut_hotstrings[trigger] = callback
+        self._update(trigger)
+
+    def unregister_shortcut(self, trigger: str) -> None:
+        """Remove a shortcuts.json hotstring; a built-in one with the same trigger comes back."""
+        if self._shortcut_hotstrings.pop(trigger, None) is not None:
+            self._update(trigger)
+
+    def _update(self, trigger: str) -> None:
+        for hotstrings in (self._shortcut_hotstrings, self._text_hotstrings, self._ai_hotstrings):
+            action = hotstrings.get(trigger)
+            if action is not None:
+                self._matcher.add(trigger, action)
+                return
+        self._matcher.remove(trigger)
 
     def start(self) -> None:
-        keyboard.hook(self._on_key_event)
+        # The hook only queues the event; matching and expansion run on the dispatcher's worker.
+        get_keyboard().hook(get_dispatcher().hook(self._on_key_event))
 
     def _on_key_event(self, event) -> None:  # pragma: no cover - relies on OS events
         if not self._enabled or event.event_type != "down":
@@ -57,29 +180,23 @@ class HotstringEngine:
 
         key = event.name
         if len(key) == 1:
-            self._buffer.append(key)
+            match = self._matcher.feed(key)
         elif key == "space":
-            self._buffer.append(" ")
+            match = self._matcher.feed(" ")
         elif key == "backspace":
-            if self._buffer:
-                self._buffer.pop()
+            self._matcher.backspace()
             return
         else:
             return
 
-        if len(self._buffer) > self._buffer_size:
-            self._buffer = self._buffer[-self._buffer_size:]
-
-        buffer_text = "".join(self._buffer)
-
-        for trigger, action in {**self._ai_hotstrings, **self._text_hotstrings}.items():
-            if buffer_text.endswith(trigger):
-                for _ in range(len(trigger)):
-                    keyboard.send("backspace")
-                    time.sleep(0.005)
-                action()
-                self._buffer.clear()
-                break
+        if match is not None:
+            trigger, action = match
+            keys = get_keyboard()
+            for _ in range(len(trigger)):
+                keys.send("backspace")
+                time.sleep(0.005)
+            action()
+            self._matcher.reset()
 
 
 class AIHotstrings:
@@ -97,8 +214,15 @@ class AIHotstrings:
                 return
 
             def run() -> None:
-                output = self._client.chat(prompt.system or None, prompt.build_message(selection), prompt.temperature)
-                if output.strip():
+                output = run_paste_request(
+                    flight_key(prompt.name, selection),
+                    lambda cancel: run_prompt(self._client, prompt, selection, cancel),
+                )
+                if output is None:
+                    return
+                if isinstance(output, ErrorReply):
+                    print(f"⚠️ {output.strip()}")
+                elif output.strip():
                     replace_selection(output)
 
             threading.Thread(target=run, daemon=True).start()
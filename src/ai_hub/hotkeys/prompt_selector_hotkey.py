@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import keyboard
 from typing import Optional, Callable
 
+from ..services.hotkey_registry import get_hotkey_registry
+
 
 class PromptSelectorHotkey:
     """Manages Ctrl+Alt+T hotkey for opening prompt selector."""
@@ -16,19 +17,14 @@ class PromptSelectorHotkey:
 
     def start(self) -> None:
         """Start listening for Ctrl+Alt+T."""
-        try:
-            keyboard.add_hotkey("ctrl+alt+t", self._on_hotkey)
-            self._is_registered = True
-        except Exception as e:
-            print(f"Error registering prompt selector hotkey: {e}")
+        self._is_registered = get_hotkey_registry().bind(
+            "prompt selector", "ctrl+alt+t", self._on_hotkey, "Prompt selector", trigger_on_release=False
+        )
 
     def stop(self) -> None:
         """Stop listening for hotkey."""
-        try:
-            keyboard.remove_hotkey("ctrl+alt+t")
-            self._is_registered = False
-        except Exception:
-            pass
+        get_hotkey_registry().unbind("prompt selector", "ctrl+alt+t")
+        self._is_registered = False
 
     def _on_hotkey(self) -> None:
         """Handle hotkey press."""
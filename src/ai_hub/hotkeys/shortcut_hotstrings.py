@@ -0,0 +1,154 @@
+"""Hotstrings from config/shortcuts.json, kept in sync with the file while the app runs.
+
+``ShortcutHotstrings`` compiles the ``"type": "Hotstring"`` entries saved by
+the Shortcuts tab into the ``HotstringEngine`` matcher. When the file
+changes it diffs the entries against what is registered and only adds,
+removes or replaces the triggers that differ, so reloading a library of
+thousands of abbreviations costs about as much as parsing the JSON. The
+changes are applied on the key dispatcher's worker, between key events.
+The other entries of a reloaded file are handed to ``on_reload`` (GlobalHotkeys
+syncs its hotkeys from them).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from ..services.key_dispatcher import get_dispatcher
+from .hotstrings import HotstringCallback, HotstringEngine
+
+
+WATCH_INTERVAL = 1.0
+
+ActionFactory = Callable[[dict[str, Any]], Optional[HotstringCallback]]
+
+
+@dataclass(slots=True)
+class ReloadResult:
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    seconds: float = 0.0
+
+
+def _signature(shortcut: dict[str, Any]) -> tuple[str, str]:
+    return shortcut.get("action", ""), shortcut.get("output", "")
+
+
+class ShortcutHotstrings:
+    """Registers the hotstrings in shortcuts.json with the engine and applies edits as diffs."""
+
+    def __init__(
+        self,
+        engine: HotstringEngine,
+        make_action: ActionFactory,
+        path: Path = Path("config/shortcuts.json"),
+        on_reload: Optional[Callable[[list[dict[str, Any]]], None]] = None,
+    ):
+        self._engine = engine
+        self._make_action = make_action
+        self._path = path
+        self._on_reload = on_reload
+        self._registered: dict[str, tuple[str, str]] = {}  # trigger -> (action, output)
+        self._stamp: Optional[tuple[int, int]] = None
+        self._stop = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._registered)
+
+    def load(self, shortcuts: Optional[list[dict[str, Any]]] = None) -> ReloadResult:
+        """Bring the engine in line with ``shortcuts`` (read from the file when not given)."""
+        started = time.perf_counter()
+        self._stamp = self._file_stamp()
+        if shortcuts is None:
+            shortcuts = self._read()
+            if shortcuts is None:
+                return ReloadResult()
+            if self._on_reload is not None:
+                self._on_reload(shortcuts)
+
+        wanted: dict[str, dict[str, Any]] = {}
+        for shortcut in shortcuts:
+            if shortcut.get("type") == "Hotstring" and shortcut.get("trigger"):
+                wanted[shortcut["trigger"]] = shortcut
+
+        result = ReloadResult()
+        removed = [trigger for trigger in self._registered if trigger not in wanted]
+        updates: dict[str, HotstringCallback] = {}
+        for trigger, shortcut in wanted.items():
+            signature = _signature(shortcut)
+            previous = self._registered.get(trigger)
+            if previous == signature:
+                continue
+            action = self._make_action(shortcut)
+            if action is None:
+                if previous is not None:
+                    removed.append(trigger)
+                continue
+            updates[trigger] = action
+            self._registered[trigger] = signature
+            if previous is None:
+                result.added += 1
+            else:
+                result.changed += 1
+        for trigger in removed:
+            del self._registered[trigger]
+        result.removed = len(removed)
+
+        if updates or removed:
+            get_dispatcher().post(self._apply, updates, removed, label="hotstring reload")
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def reload_if_changed(self) -> Optional[ReloadResult]:
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return None
+        result = self.load()
+        print(f"🔄 Hotstrings reloaded from {self._path}: +{result.added} -{result.removed} "
+              f"~{result.changed} in {result.seconds * 1000:.1f} ms ({len(self)} total)")
+        return result
+
+    def watch(self, interval: float = WATCH_INTERVAL) -> None:
+        """Check the file for changes every ``interval`` seconds on a daemon thread."""
+        def run() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    print(f"⚠️ Error reloading hotstrings: {e}")
+
+        threading.Thread(target=run, name="shortcuts-watch", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _apply(self, updates: dict[str, HotstringCallback], removed: list[str]) -> None:
+        for trigger in removed:
+            self._engine.unregister_shortcut(trigger)
+        for trigger, action in updates.items():
+            self._engine.register_shortcut(trigger, action)
+
+    def _file_stamp(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self) -> Optional[list[dict[str, Any]]]:
+        if not self._path.exists():
+            return []
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            # Often a save still in progress; the next change of the file retries.
+            print(f"⚠️ Error reading {self._path}: {e}")
+            return None
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-import keyboard
+import threading
 from typing import Callable
 
+from ..config import ChunkingSettings
+from ..services.hotkey_registry import get_hotkey_registry
 from ..services.openai_client import OpenAIClient
 from ..services.smart_action_handler import SmartActionHandler
 from ..ui.popups.floating_popup import FloatingPopup
@@ -19,9 +21,10 @@ class SmartHotkeys:
         client: OpenAIClient,
         prompts: list[dict] = None,
         on_show_progress: Callable[[str], None] = None,
+        chunking: ChunkingSettings = None,
     ):
         self._client = client
-        self._handler = SmartActionHandler(client)
+        self._handler = SmartActionHandler(client, chunking)
         self._prompts = prompts or self._get_default_prompts()
         self._on_show_progress = on_show_progress or self._default_progress
 
@@ -29,16 +32,17 @@ class SmartHotkeys:
 
     def start(self) -> None:
         """Start listening for hotkeys."""
+        # (both fire on the key dispatcher's worker; the rewrite itself runs on its own thread)
+        registry = get_hotkey_registry()
         # Alt+Spacebar: Rewrite all text in window
-        keyboard.add_hotkey("alt+space", self._on_alt_spacebar)
+        registry.bind("smart hotkeys", "alt+space", self._on_alt_spacebar, "Rewrite all", trigger_on_release=False)
 
         # Ctrl+Alt+Spacebar: Show prompt selector
-        keyboard.add_hotkey("ctrl+alt+space", self._on_ctrl_alt_spacebar)
+        registry.bind("smart hotkeys", "ctrl+alt+space", self._on_ctrl_alt_spacebar, "Prompt selector", trigger_on_release=False)
 
     def stop(self) -> None:
         """Stop listening for hotkeys."""
-        keyboard.remove_hotkey("alt+space")
-        keyboard.remove_hotkey("ctrl+alt+space")
+        get_hotkey_registry().unbind_owner("smart hotkeys")
 
     def _on_alt_spacebar(self) -> None:
         """
@@ -58,21 +62,30 @@ class SmartHotkeys:
                 result_text="Please wait while I rewrite your text for clarity.",
             )
             popup.show()
-
-            # Do the work
-            success = self._handler.rewrite_all_in_window(
-                on_progress=lambda msg: self._update_popup(popup, msg)
-            )
-
-            if success:
-                popup.setWindowTitle("AI Hub - Done!")
-            else:
-                popup.setWindowTitle("AI Hub - Done (check notepad)")
-
         except Exception as e:
             print(f"Error in Alt+Spacebar: {e}")
-        finally:
             self._is_processing = False
+            return
+
+        def run() -> None:
+            # Off the key worker: the rewrite waits on the network, and hotstrings
+            # typed meanwhile must still be matched as they are typed.
+            try:
+                success = self._handler.rewrite_all_in_window(
+                    on_progress=lambda msg: self._update_popup(popup, msg)
+                )
+
+                if success:
+                    popup.setWindowTitle("AI Hub - Done!")
+                else:
+                    popup.setWindowTitle("AI Hub - Done (check notepad)")
+
+            except Exception as e:
+                print(f"Error in Alt+Spacebar: {e}")
+            finally:
+                self._is_processing = False
+
+        threading.Thread(target=run, daemon=True).start()
 
     def _on_ctrl_alt_spacebar(self) -> None:
         """
@@ -87,7 +100,7 @@ class SmartHotkeys:
         try:
             # Show prompt selector
             def on_prompt_selected(prompt):
-                self._execute_selected_prompt(prompt)
+                threading.Thread(target=self._execute_selected_prompt, args=(prompt,), daemon=True).start()
 
             selector = PromptSelector(self._prompts, on_select=on_prompt_selected)
             selector.show()
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import Callable, Optional
 
-from .openai_client import OpenAIClient
+from .openai_client import ErrorReply, OpenAIClient
 
 
 @dataclass
@@ -92,19 +93,23 @@ class ActionManager:
         """Execute an action on the given text."""
         action = self.get_action(action_id)
         if not action:
-            return f"Action '{action_id}' not found"
+            return ErrorReply(f"Action '{action_id}' not found")
 
         try:
-            result = self._client.chat(system=action.prompt, user=text, temperature=0.2)
+            result = await self._client.achat(system=action.prompt, user=text, temperature=0.2)
             return result
         except Exception as e:
-            return f"Error executing action: {str(e)}"
+            return ErrorReply(f"Error executing action: {str(e)}")
+
+    async def execute_many(self, action_ids: list[str], text: str) -> list[str]:
+        """Run several actions on the same text concurrently; results keep the order of ``action_ids``."""
+        return list(await asyncio.gather(*(self.execute_action(action_id, text) for action_id in action_ids)))
 
     def execute_action_sync(self, action_id: str, text: str) -> str:
         """Execute an action synchronously."""
         action = self.get_action(action_id)
         if not action:
-            return f"Action '{action_id}' not found"
+            return ErrorReply(f"Action '{action_id}' not found")
 
         result = self._client.chat(system=action.prompt, user=text, temperature=0.2)
         return result
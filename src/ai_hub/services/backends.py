@@ -0,0 +1,470 @@
+"""Pluggable keyboard and clipboard backends used by selection and paste-back.
+
+The defaults drive the real desktop (``keyboard`` for key presses,
+``win32clipboard`` or ``pyperclip`` for the clipboard). A clipboard driver
+can also be picked by name with ``clipboard_driver``: ``win32``,
+``pyperclip``, ``xclip``, ``wl-clipboard`` or ``memory`` (in-process). Tests
+and the latency harness swap in the in-process fakes from ``fake_desktop``
+with ``configure_backends``.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional, Protocol
+
+try:
+    import win32clipboard as wcb
+    import win32con
+    HAVE_WIN32 = True
+except Exception:  # pragma: no cover - fallback on non-Windows
+    HAVE_WIN32 = False
+
+try:
+    import pyperclip
+    HAVE_PYPERCLIP = True
+except Exception:  # pragma: no cover - optional dependency
+    HAVE_PYPERCLIP = False
+
+try:
+    import keyboard
+    HAVE_KEYBOARD = True
+except Exception:  # pragma: no cover - optional dependency
+    HAVE_KEYBOARD = False
+
+
+KeyCallback = Callable[[Any], None]
+
+
+class KeyboardBackend(Protocol):
+    def send(self, hotkey: str) -> None:
+        """Press and release ``hotkey``, e.g. ``"ctrl+c"`` or ``"backspace"``."""
+
+    def write(self, text: str) -> None:
+        """Type ``text`` into the focused window."""
+
+    def hook(self, callback: KeyCallback) -> None:
+        """Call ``callback`` for every key event (with ``event_type`` and ``name``)."""
+
+
+@dataclass(slots=True)
+class ClipboardSnapshot:
+    """Saved clipboard contents: the text, plus other formats the driver could keep."""
+
+    text: str
+    formats: dict[Hashable, Any] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)  # formats seen but not kept (too large, unsupported)
+
+    @property
+    def size(self) -> int:
+        return len(self.text) * 2 + sum(len(data) for data in self.formats.values() if isinstance(data, (bytes, str)))
+
+
+class ClipboardBackend(Protocol):
+    """Backends may also have ``sequence() -> Optional[int]``, a number that
+    changes whenever the clipboard does, and ``has_text() -> bool``, whether
+    text is on the clipboard yet; ``clipboard_watch`` uses them when present.
+    Backends that can keep more than text have ``snapshot(max_bytes)`` and
+    ``restore(snapshot)``; ``clipboard_snapshot`` uses them when present."""
+
+    def get_text(self) -> str: ...
+
+    def set_text(self, text: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+def _win32_sequence() -> Optional[int]:
+    """The Windows clipboard sequence number, without needing pywin32."""
+    if sys.platform != "win32":
+        return None
+    import ctypes
+    return ctypes.windll.user32.GetClipboardSequenceNumber()
+
+
+def _win32_has_text() -> bool:
+    """Whether the Windows clipboard holds text (``True`` elsewhere); needs no OpenClipboard."""
+    if sys.platform != "win32":
+        return True
+    import ctypes
+    return bool(ctypes.windll.user32.IsClipboardFormatAvailable(13))  # CF_UNICODETEXT
+
+
+class SystemKeyboard:
+    """The ``keyboard`` package: global hooks and synthetic key presses."""
+
+    def __init__(self) -> None:
+        if not HAVE_KEYBOARD:
+            raise RuntimeError("The 'keyboard' package is required for selection helpers.")
+
+    def send(self, hotkey: str) -> None:
+        keyboard.send(hotkey)
+
+    def write(self, text: str) -> None:
+        keyboard.write(text)
+
+    def hook(self, callback: KeyCallback) -> None:
+        keyboard.hook(callback)
+
+
+# Formats Windows synthesizes from another one on the clipboard; saving them is wasted work.
+_WIN32_SYNTHESIZED = {
+    "CF_TEXT": "CF_UNICODETEXT", "CF_OEMTEXT": "CF_UNICODETEXT", "CF_LOCALE": "CF_UNICODETEXT",
+    "CF_BITMAP": "CF_DIB", "CF_DIBV5": "CF_DIB", "CF_PALETTE": "CF_DIB",
+    "CF_METAFILEPICT": "CF_ENHMETAFILE",
+}
+# Handle-based formats that cannot be saved as bytes and put back.
+_WIN32_HANDLES = {"CF_BITMAP", "CF_PALETTE", "CF_ENHMETAFILE", "CF_METAFILEPICT", "CF_HDROP", "CF_OWNERDISPLAY"}
+
+
+WIN32_OPEN_ATTEMPTS = 8
+WIN32_OPEN_BACKOFF = 0.002
+
+
+def _win32_open() -> None:
+    """``OpenClipboard``, retried with a short backoff while another window still has it open.
+
+    The sequence number changes at the copying application's ``EmptyClipboard``,
+    before it has put its data and closed the clipboard; opening it then fails
+    with "access denied".
+    """
+    delay = WIN32_OPEN_BACKOFF
+    for attempt in range(WIN32_OPEN_ATTEMPTS):
+        try:
+            wcb.OpenClipboard()
+            return
+        except Exception:
+            if attempt == WIN32_OPEN_ATTEMPTS - 1:
+                raise
+        time.sleep(delay)
+        delay *= 2
+
+
+class Win32Clipboard:
+    """Native Windows clipboard; snapshots keep every format that is plain data (HTML, RTF, images)."""
+
+    def get_text(self) -> str:
+        _win32_open()
+        try:
+            if wcb.IsClipboardFormatAvailable(win32con.CF_UNICODETEXT):
+                return wcb.GetClipboardData(win32con.CF_UNICODETEXT)
+            return ""
+        finally:
+            wcb.CloseClipboard()
+
+    def set_text(self, text: str) -> None:
+        _win32_open()
+        try:
+            wcb.EmptyClipboard()
+            wcb.SetClipboardText(text)
+        finally:
+            wcb.CloseClipboard()
+
+    def clear(self) -> None:
+        _win32_open()
+        try:
+            wcb.EmptyClipboard()
+        finally:
+            wcb.CloseClipboard()
+
+    def sequence(self) -> int:
+        return wcb.GetClipboardSequenceNumber()
+
+    def has_text(self) -> bool:
+        return bool(wcb.IsClipboardFormatAvailable(win32con.CF_UNICODETEXT))
+
+    @staticmethod
+    def _format_name(fmt: int) -> str:
+        for name in ("CF_TEXT", "CF_OEMTEXT", "CF_UNICODETEXT", "CF_LOCALE", "CF_BITMAP", "CF_DIB", "CF_DIBV5",
+                     "CF_PALETTE", "CF_METAFILEPICT", "CF_ENHMETAFILE", "CF_HDROP", "CF_OWNERDISPLAY"):
+            if getattr(win32con, name, None) == fmt:
+                return name
+        try:
+            return wcb.GetClipboardFormatName(fmt)
+        except Exception:
+            return str(fmt)
+
+    def snapshot(self, max_bytes: int) -> ClipboardSnapshot:
+        """Every data format on the clipboard, skipping synthesized ones and any over ``max_bytes``."""
+        _win32_open()
+        try:
+            available = []
+            fmt = wcb.EnumClipboardFormats(0)
+            while fmt:
+                available.append(fmt)
+                fmt = wcb.EnumClipboardFormats(fmt)
+            names = {fmt: self._format_name(fmt) for fmt in available}
+            present = set(names.values())
+            snapshot = ClipboardSnapshot("")
+            budget = max_bytes
+            for fmt, name in names.items():
+                if _WIN32_SYNTHESIZED.get(name) in present:
+                    continue
+                if name in _WIN32_HANDLES:
+                    snapshot.skipped.append(name)
+                    continue
+                try:
+                    data = wcb.GetClipboardData(fmt)
+                except Exception:
+                    snapshot.skipped.append(name)
+                    continue
+                if name == "CF_UNICODETEXT":
+                    snapshot.text = data
+                elif isinstance(data, bytes) and len(data) <= budget:
+                    snapshot.formats[fmt] = data
+                    budget -= len(data)
+                else:
+                    snapshot.skipped.append(name)
+            return snapshot
+        finally:
+            wcb.CloseClipboard()
+
+    def restore(self, snapshot: ClipboardSnapshot) -> None:
+        _win32_open()
+        try:
+            wcb.EmptyClipboard()
+            if snapshot.text or not snapshot.formats:
+                wcb.SetClipboardText(snapshot.text, win32con.CF_UNICODETEXT)
+            for fmt, data in snapshot.formats.items():
+                wcb.SetClipboardData(fmt, data)
+        finally:
+            wcb.CloseClipboard()
+
+
+class PyperclipClipboard:
+    """Cross-platform clipboard through ``pyperclip``."""
+
+    def get_text(self) -> str:
+        return pyperclip.paste()
+
+    def set_text(self, text: str) -> None:
+        pyperclip.copy(text)
+
+    def clear(self) -> None:
+        pyperclip.copy("")
+
+    def sequence(self) -> Optional[int]:
+        return _win32_sequence()
+
+    def has_text(self) -> bool:
+        return _win32_has_text()
+
+
+class CommandClipboard:
+    """Clipboard through command-line tools, skipping pyperclip's detection and wrappers.
+
+    The tools serve one type per process, so a snapshot keeps an image only
+    when the clipboard holds no text; otherwise it keeps the text.
+    """
+
+    IMAGE_TYPES = ("image/png", "image/jpeg", "image/bmp")
+
+    def __init__(self, read: list[str], write: list[str], clear: list[str],
+                 list_types: list[str], read_type: Callable[[str], list[str]], write_type: Callable[[str], list[str]]) -> None:
+        self._read, self._write, self._clear = read, write, clear
+        self._list_types, self._read_type, self._write_type = list_types, read_type, write_type
+
+    def get_text(self) -> str:
+        result = subprocess.run(self._read, capture_output=True, timeout=2)
+        return result.stdout.decode("utf-8", errors="replace") if result.returncode == 0 else ""
+
+    def set_text(self, text: str) -> None:
+        subprocess.run(self._write, input=text.encode("utf-8"), timeout=2, check=True)
+
+    def clear(self) -> None:
+        subprocess.run(self._clear, input=b"", timeout=2, check=True)
+
+    def snapshot(self, max_bytes: int) -> ClipboardSnapshot:
+        result = subprocess.run(self._list_types, capture_output=True, timeout=2)
+        types = result.stdout.decode("utf-8", errors="replace").split() if result.returncode == 0 else []
+        has_text = any(t.startswith("text/") or t in ("UTF8_STRING", "STRING", "TEXT") for t in types)
+        image = next((t for t in self.IMAGE_TYPES if t in types), None)
+        if image is None or has_text:
+            snapshot = ClipboardSnapshot(self.get_text())
+            snapshot.skipped.extend(t for t in types if "/" in t and not t.startswith("text/plain"))
+            return snapshot
+        data = subprocess.run(self._read_type(image), capture_output=True, timeout=5).stdout
+        if len(data) > max_bytes:
+            return ClipboardSnapshot("", skipped=[image])
+        return ClipboardSnapshot("", {image: data})
+
+    def restore(self, snapshot: ClipboardSnapshot) -> None:
+        if not snapshot.formats:
+            self.set_text(snapshot.text)
+            return
+        mime, data = next(iter(snapshot.formats.items()))
+        subprocess.run(self._write_type(mime), input=data, timeout=5, check=True)
+
+
+class XclipClipboard(CommandClipboard):
+    """X11 CLIPBOARD selection through ``xclip``."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            ["xclip", "-selection", "clipboard", "-o"],
+            ["xclip", "-selection", "clipboard", "-i"],
+            ["xclip", "-selection", "clipboard", "-i"],
+            ["xclip", "-selection", "clipboard", "-t", "TARGETS", "-o"],
+            lambda mime: ["xclip", "-selection", "clipboard", "-t", mime, "-o"],
+            lambda mime: ["xclip", "-selection", "clipboard", "-t", mime, "-i"],
+        )
+
+
+class WlClipboard(CommandClipboard):
+    """Wayland clipboard through ``wl-paste`` / ``wl-copy``."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            ["wl-paste", "--no-newline"],
+            ["wl-copy"],
+            ["wl-copy", "--clear"],
+            ["wl-paste", "--list-types"],
+            lambda mime: ["wl-paste", "--no-newline", "--type", mime],
+            lambda mime: ["wl-copy", "--type", mime],
+        )
+
+
+class MemoryClipboard:
+    """In-process clipboard; nothing outside this process sees it."""
+
+    def __init__(self, text: str = "") -> None:
+        self._text = text
+        self._formats: dict[Hashable, Any] = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def get_text(self) -> str:
+        with self._lock:
+            return self._text
+
+    def set_text(self, text: str) -> None:
+        with self._lock:
+            self._text = text
+            self._formats = {}
+            self._sequence += 1
+
+    def set_formats(self, text: str, formats: dict[Hashable, Any]) -> None:
+        """Put ``text`` and other formats (e.g. ``{"text/html": b"..."}``) on the clipboard together."""
+        with self._lock:
+            self._text = text
+            self._formats = dict(formats)
+            self._sequence += 1
+
+    def formats(self) -> dict[Hashable, Any]:
+        with self._lock:
+            return dict(self._formats)
+
+    def snapshot(self, max_bytes: int) -> ClipboardSnapshot:
+        with self._lock:
+            snapshot = ClipboardSnapshot(self._text)
+            for fmt, data in self._formats.items():
+                if len(data) <= max_bytes:
+                    snapshot.formats[fmt] = data
+                else:
+                    snapshot.skipped.append(str(fmt))
+            return snapshot
+
+    def restore(self, snapshot: ClipboardSnapshot) -> None:
+        self.set_formats(snapshot.text, snapshot.formats)
+
+    def clear(self) -> None:
+        self.set_text("")
+
+    def sequence(self) -> int:
+        with self._lock:
+            return self._sequence
+
+
+class NullClipboard:
+    """Used when no clipboard library is available: reads are empty, writes are dropped."""
+
+    def get_text(self) -> str:
+        return ""
+
+    def set_text(self, text: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+CLIPBOARD_DRIVERS: dict[str, Callable[[], ClipboardBackend]] = {
+    "win32": Win32Clipboard,
+    "pyperclip": PyperclipClipboard,
+    "xclip": XclipClipboard,
+    "wl-clipboard": WlClipboard,
+    "memory": MemoryClipboard,
+}
+
+
+def available_clipboard_drivers() -> list[str]:
+    """Names of the drivers that can run here, in order of preference."""
+    names = []
+    if HAVE_WIN32:
+        names.append("win32")
+    if HAVE_PYPERCLIP:
+        names.append("pyperclip")
+    if os.environ.get("WAYLAND_DISPLAY") and shutil.which("wl-copy") and shutil.which("wl-paste"):
+        names.append("wl-clipboard")
+    if os.environ.get("DISPLAY") and shutil.which("xclip"):
+        names.append("xclip")
+    names.append("memory")
+    return names
+
+
+def clipboard_driver(name: str) -> ClipboardBackend:
+    """The clipboard driver called ``name``; ``"auto"`` picks the best one available."""
+    if name == "auto":
+        return default_clipboard()
+    if name not in CLIPBOARD_DRIVERS:
+        print(f"⚠️ Unknown clipboard driver '{name}'; expected auto or one of {', '.join(CLIPBOARD_DRIVERS)}")
+        return default_clipboard()
+    if name not in available_clipboard_drivers():
+        print(f"⚠️ Clipboard driver '{name}' is not available here")
+        return default_clipboard()
+    return CLIPBOARD_DRIVERS[name]()
+
+
+def default_clipboard() -> ClipboardBackend:
+    drivers = [name for name in available_clipboard_drivers() if name != "memory"]
+    if not drivers:
+        return NullClipboard()
+    return CLIPBOARD_DRIVERS[drivers[0]]()
+
+
+_keyboard: Optional[KeyboardBackend] = None
+_clipboard: Optional[ClipboardBackend] = None
+_lock = threading.Lock()
+
+
+def configure_backends(
+    keyboard_backend: Optional[KeyboardBackend] = None,
+    clipboard_backend: Optional[ClipboardBackend] = None,
+) -> None:
+    """Replace the process-wide backends; ``None`` restores the system default."""
+    global _keyboard, _clipboard
+    with _lock:
+        _keyboard = keyboard_backend
+        _clipboard = clipboard_backend
+
+
+def get_keyboard() -> KeyboardBackend:
+    global _keyboard
+    with _lock:
+        if _keyboard is None:
+            _keyboard = SystemKeyboard()
+        return _keyboard
+
+
+def get_clipboard() -> ClipboardBackend:
+    global _clipboard
+    with _lock:
+        if _clipboard is None:
+            _clipboard = default_clipboard()
+        return _clipboard
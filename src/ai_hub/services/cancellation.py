@@ -0,0 +1,100 @@
+"""Cooperative cancellation for in-flight AI requests."""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, Hashable, Optional
+
+
+class RequestCancelled(Exception):
+    """Raised inside a request once its ``CancelToken`` has been cancelled."""
+
+
+class CancelToken:
+    """Cancellation flag that can also tear down whatever the request is blocked on.
+
+    Requests register cleanup callbacks with ``on_cancel`` (typically closing
+    the HTTP response), so cancelling from another thread unblocks a pending
+    socket read immediately instead of waiting for the server to finish.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as exc:  # pragma: no cover - best effort cleanup
+                print(f"⚠️ Error while cancelling request: {exc}")
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` on cancellation (immediately if already cancelled)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; return True if cancelled meanwhile."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise RequestCancelled()
+
+
+class CancelScope:
+    """Keeps at most one live request: starting a new one cancels the previous.
+
+    Starting a request with the same key as the live one returns the live
+    token instead, so duplicate triggers (see ``SingleFlight``) attach to the
+    pending request rather than aborting it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._key: Optional[Hashable] = None
+        self._token: Optional[CancelToken] = None
+
+    def begin(self, key: Hashable) -> CancelToken:
+        with self._lock:
+            if self._token is not None and self._key == key and not self._token.cancelled:
+                return self._token
+            previous = self._token
+            self._key, self._token = key, CancelToken()
+            token = self._token
+        if previous is not None:
+            previous.cancel()
+        return token
+
+    def finish(self, token: CancelToken) -> None:
+        with self._lock:
+            if self._token is token:
+                self._key, self._token = None, None
+
+    def cancel(self) -> None:
+        with self._lock:
+            token, self._key, self._token = self._token, None, None
+        if token is not None:
+            token.cancel()
+
+
+_paste_scope = CancelScope()
+
+
+def get_paste_scope() -> CancelScope:
+    """Scope shared by every handler that pastes over the current selection."""
+    return _paste_scope
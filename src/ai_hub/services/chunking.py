@@ -0,0 +1,113 @@
+"""Splits large texts into model-sized chunks that reassemble without losing formatting."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable
+
+from .tokens import count_tokens
+
+
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])[\"'”’)\]]*\s+")
+
+
+@dataclass(slots=True)
+class TextChunk:
+    leading: str
+    body: str
+    trailing: str
+
+    def wrap(self, replacement: str) -> str:
+        """Put ``replacement`` where ``body`` was, keeping the original whitespace at the seams."""
+        return self.leading + replacement.strip() + self.trailing
+
+
+def split_text(text: str, max_tokens: int) -> list[TextChunk]:
+    """Split ``text`` into chunks of at most ``max_tokens``.
+
+    Paragraphs are kept together where possible; an oversized paragraph is
+    split between sentences, and an oversized sentence between words.
+    Joining every chunk's ``leading + body + trailing`` gives back ``text``.
+    Sizes are measured in characters at ``text``'s own characters-per-token
+    ratio, so dense text such as code gets proportionally smaller chunks.
+    """
+    max_chars = max(1, max(1, max_tokens) * len(text) // max(1, count_tokens(text)))
+    units: list[str] = []
+    for paragraph in _split_after(text, _PARAGRAPH_BREAK):
+        if len(paragraph) <= max_chars:
+            units.append(paragraph)
+            continue
+        for sentence in _split_after(paragraph, _SENTENCE_END):
+            if len(sentence) <= max_chars:
+                units.append(sentence)
+            else:
+                units.extend(_split_words(sentence, max_chars))
+
+    groups: list[str] = []
+    current = ""
+    for unit in units:
+        if current and len(current) + len(unit) > max_chars:
+            groups.append(current)
+            current = ""
+        current += unit
+    if current or not groups:
+        groups.append(current)
+    return [_to_chunk(group) for group in groups]
+
+
+async def map_chunks(
+    chunks: Iterable[TextChunk],
+    transform: Callable[[str], Awaitable[str]],
+    concurrency: int,
+) -> list[str]:
+    """Run ``transform`` on every non-blank chunk body, ``concurrency`` at a time.
+
+    Results keep the order of ``chunks``; blank chunks map to ``""``.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(chunk: TextChunk) -> str:
+        if not chunk.body:
+            return ""
+        async with semaphore:
+            return await transform(chunk.body)
+
+    return list(await asyncio.gather(*(run(chunk) for chunk in chunks)))
+
+
+def _split_after(text: str, separator: re.Pattern[str]) -> list[str]:
+    """Split ``text`` after each ``separator`` match, keeping the separator with the piece before it."""
+    pieces: list[str] = []
+    start = 0
+    for match in separator.finditer(text):
+        if match.end() > start:
+            pieces.append(text[start:match.end()])
+            start = match.end()
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
+
+
+def _split_words(text: str, max_chars: int) -> list[str]:
+    pieces: list[str] = []
+    while len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars) + 1
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(text[:cut])
+        text = text[cut:]
+    if text:
+        pieces.append(text)
+    return pieces
+
+
+def _to_chunk(text: str) -> TextChunk:
+    body = text.strip()
+    if not body:
+        return TextChunk(text, "", "")
+    leading = text[:len(text) - len(text.lstrip())]
+    trailing = text[len(text.rstrip()):]
+    return TextChunk(leading, body, trailing)
@@ -1,15 +1,20 @@
 """
 Clipboard Hotkey Service
 
-Registers hotkeys for clipboard items dynamically.
+Registers hotkeys for clipboard items dynamically, through the hotkey
+registry: when an item's hotkey is set or the item is deleted, only the
+hotkeys that changed are (un)registered.
 """
 
 from __future__ import annotations
 
-import keyboard
-from typing import Dict, Callable, Optional
+from typing import Callable, Dict
 
 from .clipboard_manager import ClipboardManager
+from .hotkey_registry import get_hotkey_registry
+
+
+OWNER = "clipboard items"
 
 
 class ClipboardHotkeyService:
@@ -18,47 +23,44 @@ class ClipboardHotkeyService:
     def __init__(self, manager: ClipboardManager):
         self.manager = manager
         self.registered_hotkeys: Dict[str, str] = {}  # hotkey -> item_id
+        manager.on_hotkeys_changed = self.refresh
     
     def register_all(self) -> None:
-        """Register hotkeys for all items that have them."""
-        self.unregister_all()
-        
-        for item in self.manager.items:
-            if item.hotkey:
-                self.register_hotkey(item.id, item.hotkey)
+        """Register hotkeys for all items that have them (and drop the rest)."""
+        registry = get_hotkey_registry()
+        wanted = {item.hotkey: item.id for item in self.manager.items if item.hotkey}
+        bound, removed = registry.sync(
+            OWNER, {hotkey: (self._make_handler(item_id, hotkey), f"item {item_id}") for hotkey, item_id in wanted.items()}
+        )
+        self.registered_hotkeys = {hotkey: item_id for hotkey, item_id in wanted.items() if registry.owner_of(hotkey) == OWNER}
+        if wanted or removed:
+            print(f"✅ Clipboard hotkeys: {bound} bound, {removed} removed")
     
     def register_hotkey(self, item_id: str, hotkey: str) -> bool:
         """Register a hotkey for an item."""
-        try:
-            # Create handler that copies item to clipboard
-            def handler():
-                self.manager.copy_to_clipboard(item_id)
-                print(f"📋 Clipboard hotkey triggered: {hotkey}")
-            
-            keyboard.add_hotkey(hotkey, handler, suppress=False, trigger_on_release=True)
+        if get_hotkey_registry().bind(OWNER, hotkey, self._make_handler(item_id, hotkey), f"item {item_id}"):
             self.registered_hotkeys[hotkey] = item_id
             print(f"✅ Registered clipboard hotkey: {hotkey}")
             return True
-            
-        except Exception as e:
-            print(f"⚠️ Error registering clipboard hotkey {hotkey}: {e}")
-            return False
+        return False
     
     def unregister_hotkey(self, hotkey: str) -> bool:
         """Unregister a hotkey."""
-        try:
-            keyboard.remove_hotkey(hotkey)
-            if hotkey in self.registered_hotkeys:
-                del self.registered_hotkeys[hotkey]
-            return True
-        except Exception:
-            return False
+        self.registered_hotkeys.pop(hotkey, None)
+        return get_hotkey_registry().unbind(OWNER, hotkey)
     
     def unregister_all(self) -> None:
         """Unregister all clipboard hotkeys."""
-        for hotkey in list(self.registered_hotkeys.keys()):
-            self.unregister_hotkey(hotkey)
+        get_hotkey_registry().unbind_owner(OWNER)
+        self.registered_hotkeys.clear()
     
     def refresh(self) -> None:
-        """Refresh all hotkeys (re-register based on current items)."""
+        """Apply hotkey changes of the items (only the hotkeys that differ are touched)."""
         self.register_all()
+
+    def _make_handler(self, item_id: str, hotkey: str) -> Callable[[], None]:
+        # Create handler that copies item to clipboard
+        def handler():
+            self.manager.copy_to_clipboard(item_id)
+            print(f"📋 Clipboard hotkey triggered: {hotkey}")
+        return handler
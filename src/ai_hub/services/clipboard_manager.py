@@ -13,7 +13,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, Callable, List
 
-import pyperclip
+from .backends import get_clipboard
 
 
 @dataclass
@@ -62,6 +62,7 @@ class ClipboardManager:
         self.max_history = max_history
         self.items: List[ClipboardItem] = []
         self.on_new_item: Optional[Callable[[ClipboardItem], None]] = None
+        self.on_hotkeys_changed: Optional[Callable[[], None]] = None
         self._last_content: Optional[str] = None
         
         # Load existing history
@@ -131,7 +132,7 @@ class ClipboardManager:
     def check_clipboard(self) -> Optional[ClipboardItem]:
         """Check clipboard for new content."""
         try:
-            content = pyperclip.paste()
+            content = get_clipboard().get_text()
             
             # Skip if same as last check
             if content == self._last_content:
@@ -168,6 +169,7 @@ class ClipboardManager:
         if item:
             item.hotkey = hotkey
             self.save()
+            self._hotkeys_changed()
             return True
         return False
     
@@ -186,15 +188,21 @@ class ClipboardManager:
         if item and not item.pinned:
             self.items.remove(item)
             self.save()
+            if item.hotkey:
+                self._hotkeys_changed()
             return True
         return False
+
+    def _hotkeys_changed(self) -> None:
+        if self.on_hotkeys_changed:
+            self.on_hotkeys_changed()
     
     def copy_to_clipboard(self, item_id: str) -> bool:
         """Copy an item to clipboard."""
         item = self.get_item_by_id(item_id)
         if item:
             try:
-                pyperclip.copy(item.content)
+                get_clipboard().set_text(item.content)
                 return True
             except Exception as e:
                 print(f"⚠️ Error copying to clipboard: {e}")
@@ -203,8 +211,11 @@ class ClipboardManager:
     def clear_unpinned(self) -> int:
         """Clear all unpinned items."""
         count = len([i for i in self.items if not i.pinned])
+        had_hotkeys = any(i.hotkey for i in self.items if not i.pinned)
         self.items = [i for i in self.items if i.pinned]
         self.save()
+        if had_hotkeys:
+            self._hotkeys_changed()
         return count
     
     def get_pinned_items(self) -> List[ClipboardItem]:
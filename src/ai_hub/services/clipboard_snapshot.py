@@ -0,0 +1,161 @@
+"""Save the user's clipboard (every format, not just text) and give it back off the hot path.
+
+Capturing the selection overwrites the clipboard, so ``selection`` takes a
+``ClipboardSnapshot`` first. Clipboard drivers that can (``backends``: the
+Win32 and memory clipboards, and xclip / wl-clipboard for images) keep the
+HTML, RTF and image formats too, within ``snapshot_max_bytes``; the rest keep
+the text. Saving is cheap: formats the system synthesizes from another one
+(e.g. CF_TEXT from CF_UNICODETEXT) are left out.
+
+Putting a rich snapshot back is the slow part, so it happens on a background
+thread once the hotkey has its text, or once a paste has settled. Anything
+that touches the clipboard next calls ``wait_restored`` first, and a restore
+is dropped if something else was copied in the meantime.
+
+Each snapshot and restore is timed; ``snapshot_stats()`` gives the recent
+percentiles, shown in the Settings tab and benchmarks/clipboard_drivers.py.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config import ClipboardSettings
+from .backends import ClipboardBackend, ClipboardSnapshot, get_clipboard
+from .clipboard_watch import ClipboardMark, get_clipboard_watcher
+
+
+SLOW_SNAPSHOT = 0.05
+
+
+@dataclass(slots=True)
+class SnapshotStats:
+    snapshots: int
+    snapshot_p50: float
+    snapshot_p95: float
+    restores: int
+    restore_p50: float
+    restore_p95: float
+    skipped_restores: int
+    largest_bytes: int
+
+
+def _percentile(samples: list[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+class ClipboardSnapshots:
+    """Takes snapshots, restores them in the background and times both."""
+
+    def __init__(self, settings: Optional[ClipboardSettings] = None, window: int = 200):
+        self._settings = settings or ClipboardSettings()
+        self._snapshot_times: deque[float] = deque(maxlen=window)
+        self._restore_times: deque[float] = deque(maxlen=window)
+        self._sizes: deque[int] = deque(maxlen=window)
+        self._skipped_restores = 0
+        self._lock = threading.Lock()
+        self._pending: Optional[threading.Thread] = None
+
+    def take(self, clipboard: Optional[ClipboardBackend] = None) -> ClipboardSnapshot:
+        clipboard = clipboard or get_clipboard()
+        started = time.perf_counter()
+        snapshot = None
+        rich = getattr(clipboard, "snapshot", None) if self._settings.rich_formats else None
+        if rich is not None:
+            try:
+                snapshot = rich(self._settings.snapshot_max_bytes)
+            except Exception as e:
+                print(f"⚠️ Could not save clipboard formats, keeping text only: {e}")
+        if snapshot is None:
+            snapshot = ClipboardSnapshot(clipboard.get_text())
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._snapshot_times.append(elapsed)
+            self._sizes.append(snapshot.size)
+        if elapsed > SLOW_SNAPSHOT:
+            print(f"⚠️ Saving the clipboard took {elapsed * 1000:.0f} ms ({snapshot.size} bytes)")
+        return snapshot
+
+    def restore(self, snapshot: ClipboardSnapshot, clipboard: Optional[ClipboardBackend] = None) -> None:
+        clipboard = clipboard or get_clipboard()
+        started = time.perf_counter()
+        restore = getattr(clipboard, "restore", None)
+        if snapshot.formats and restore is not None:
+            restore(snapshot)
+        else:
+            clipboard.set_text(snapshot.text)
+        with self._lock:
+            self._restore_times.append(time.perf_counter() - started)
+
+    def restore_later(self, snapshot: ClipboardSnapshot, unless_changed: Optional[ClipboardMark] = None,
+                      delay: float = 0.0) -> None:
+        """Put ``snapshot`` back on a background thread after ``delay`` seconds.
+
+        Skipped if the clipboard changed since ``unless_changed`` (the user,
+        or another program, copied something newer).
+        """
+        self.wait_restored()
+        clipboard = get_clipboard()
+
+        def run() -> None:
+            if delay:
+                time.sleep(delay)
+            if unless_changed is not None and get_clipboard_watcher().changed(unless_changed):
+                with self._lock:
+                    self._skipped_restores += 1
+                return
+            try:
+                self.restore(snapshot, clipboard)
+            except Exception as e:
+                print(f"⚠️ Could not restore the clipboard: {e}")
+
+        thread = threading.Thread(target=run, name="clipboard-restore", daemon=True)
+        self._pending = thread
+        thread.start()
+
+    def wait_restored(self, timeout: Optional[float] = 2.0) -> None:
+        """Block until the last ``restore_later`` has finished, so the next copy does not race it."""
+        thread = self._pending
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+            if not thread.is_alive():
+                self._pending = None
+
+    def stats(self) -> SnapshotStats:
+        with self._lock:
+            snapshots, restores, sizes = list(self._snapshot_times), list(self._restore_times), list(self._sizes)
+            skipped = self._skipped_restores
+        return SnapshotStats(
+            snapshots=len(snapshots),
+            snapshot_p50=_percentile(snapshots, 0.50),
+            snapshot_p95=_percentile(snapshots, 0.95),
+            restores=len(restores),
+            restore_p50=_percentile(restores, 0.50),
+            restore_p95=_percentile(restores, 0.95),
+            skipped_restores=skipped,
+            largest_bytes=max(sizes, default=0),
+        )
+
+
+_snapshots = ClipboardSnapshots()
+
+
+def configure_snapshots(settings: ClipboardSettings) -> None:
+    global _snapshots
+    _snapshots.wait_restored()
+    _snapshots = ClipboardSnapshots(settings)
+
+
+def get_snapshots() -> ClipboardSnapshots:
+    return _snapshots
+
+
+def snapshot_stats() -> SnapshotStats:
+    return _snapshots.stats()
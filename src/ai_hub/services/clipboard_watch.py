@@ -0,0 +1,242 @@
+"""Wait for the clipboard to change instead of sleeping a fixed time.
+
+After Ctrl+C the selection reaches the clipboard whenever the focused
+application gets round to it: a few milliseconds for most, much longer for
+some. ``ClipboardWatcher.wait_for_change`` returns as soon as it lands, using
+the cheapest change signal available:
+
+* clipboard backends with a ``sequence()`` method (the Win32 clipboard
+  sequence number, the fake clipboard) are checked every millisecond, which
+  costs next to nothing, together with ``has_text()`` where the number
+  moves before the copy is complete;
+* otherwise Qt's ``QClipboard.dataChanged`` (XFixes on X11, focused windows
+  on Wayland), hooked up with ``watch_qt_clipboard``, wakes waiters at once;
+* failing both, the clipboard text is polled with a backoff.
+
+How long each application takes to copy is learned, so when nothing is
+selected (the clipboard never changes) the wait gives up after a few times
+that application's usual delay instead of the full timeout. A caller that
+keeps waiting after that (``since``) records a copy that lands late with
+its real delay, so one slow copy makes the next waits longer instead of the
+learned delay only ever shrinking. The same delay tells how long to leave
+pasted text on the clipboard (``paste_settle``).
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config import ClipboardSettings
+from .backends import ClipboardBackend, get_clipboard
+
+
+SEQUENCE_POLL = 0.001
+TEXT_POLL_START = 0.002
+TEXT_POLL_MAX = 0.05
+LEARNED_FACTOR = 3.0    # wait this many times an app's slowest recent copy...
+LEARNED_MARGIN = 0.02   # ...plus this much, before deciding nothing was copied
+LEARNED_MIN_SAMPLES = 5
+PASTE_SETTLE_MIN = 0.04
+
+
+@dataclass(slots=True, frozen=True)
+class ClipboardMark:
+    """The clipboard state to compare against: sequence number, change notifications seen and text."""
+
+    sequence: Optional[int]
+    events: int
+    text: Optional[str]
+
+
+def _has_text(clipboard: ClipboardBackend) -> bool:
+    has_text = getattr(clipboard, "has_text", None)
+    if has_text is None:
+        return True
+    try:
+        return has_text()
+    except Exception:
+        return True
+
+
+def _sequence(clipboard: ClipboardBackend) -> Optional[int]:
+    sequence = getattr(clipboard, "sequence", None)
+    if sequence is None:
+        return None
+    try:
+        return sequence()
+    except Exception:
+        return None
+
+
+def foreground_app() -> str:
+    """Executable name of the focused window's process, or ``""`` where it is not known."""
+    if sys.platform != "win32":
+        return ""
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        user32, kernel32 = ctypes.windll.user32, ctypes.windll.kernel32
+        pid = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(user32.GetForegroundWindow(), ctypes.byref(pid))
+        handle = kernel32.OpenProcess(0x1000, False, pid.value)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return ""
+        try:
+            size = wintypes.DWORD(260)
+            buffer = ctypes.create_unicode_buffer(size.value)
+            if not kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+                return ""
+            return os.path.basename(buffer.value).lower()
+        finally:
+            kernel32.CloseHandle(handle)
+    except Exception:
+        return ""
+
+
+class AppDelays:
+    """Recent copy delays per application, used to cap how long to wait for the next one."""
+
+    def __init__(self, window: int = 50):
+        self._window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, app: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(app, deque(maxlen=self._window)).append(seconds)
+
+    def learned(self, app: str) -> Optional[float]:
+        """A few times ``app``'s slowest recent copy, or ``None`` until enough copies were seen."""
+        with self._lock:
+            samples = list(self._samples.get(app, ()))
+        if len(samples) < LEARNED_MIN_SAMPLES:
+            return None
+        return max(samples) * LEARNED_FACTOR + LEARNED_MARGIN
+
+    def timeout(self, app: str, default: float, floor: float) -> float:
+        """How long to wait for ``app``: ``default`` until enough copies were seen."""
+        learned = self.learned(app)
+        return default if learned is None else min(default, max(floor, learned))
+
+
+class ClipboardWatcher:
+    """Tells when the clipboard has changed since a ``mark``."""
+
+    def __init__(self, settings: Optional[ClipboardSettings] = None):
+        self._settings = settings or ClipboardSettings()
+        self._cond = threading.Condition()
+        self._events = 0
+        self._watching = False
+        self._delays = AppDelays()
+
+    @property
+    def delays(self) -> AppDelays:
+        return self._delays
+
+    @property
+    def copy_timeout(self) -> float:
+        """The configured longest wait for a copy, before any learning."""
+        return self._settings.copy_timeout
+
+    def notify(self) -> None:
+        """The clipboard changed (called by a platform change notification)."""
+        with self._cond:
+            self._events += 1
+            self._watching = True
+            self._cond.notify_all()
+
+    def paste_settle(self, app: Optional[str] = None) -> float:
+        """How long after Ctrl+V the application may still read the clipboard."""
+        learned = self._delays.learned(app) if self._settings.learn_delays and app is not None else None
+        if learned is None:
+            return self._settings.paste_settle
+        return min(self._settings.copy_timeout, max(PASTE_SETTLE_MIN, learned))
+
+    def mark(self) -> ClipboardMark:
+        clipboard = get_clipboard()
+        sequence = _sequence(clipboard)
+        with self._cond:
+            events = self._events
+        text = clipboard.get_text() if sequence is None else None
+        return ClipboardMark(sequence, events, text)
+
+    def changed(self, mark: ClipboardMark) -> bool:
+        clipboard = get_clipboard()
+        if mark.sequence is not None:
+            # The number already moves at the copying application's EmptyClipboard;
+            # the copy has landed once there is text again.
+            return _sequence(clipboard) != mark.sequence and _has_text(clipboard)
+        # A notification may be for our own earlier write, so compare the text.
+        return clipboard.get_text() != mark.text
+
+    def wait_for_change(
+        self,
+        mark: ClipboardMark,
+        timeout: Optional[float] = None,
+        app: Optional[str] = None,
+        since: Optional[float] = None,
+    ) -> bool:
+        """Block until the clipboard differs from ``mark``; ``False`` on timeout.
+
+        Without an explicit ``timeout`` the wait is capped by what was learned
+        about ``app`` (see ``foreground_app``), or by the configured timeout.
+        The delay recorded for ``app`` counts from ``since`` (a
+        ``time.perf_counter()`` value) when the copy was already waited on.
+        """
+        started = time.perf_counter() if since is None else since
+        if timeout is None:
+            timeout = self._settings.copy_timeout
+            if self._settings.learn_delays and app is not None:
+                timeout = self._delays.timeout(app, timeout, self._settings.min_copy_timeout)
+        deadline = started + timeout
+        interval = SEQUENCE_POLL if mark.sequence is not None else TEXT_POLL_START
+        seen = mark.events
+        while True:
+            if self.changed(mark):
+                if app is not None:
+                    self._delays.record(app, time.perf_counter() - started)
+                return True
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            with self._cond:
+                if mark.sequence is None and self._watching:
+                    # Change notifications wake us; the slow poll only backs them up
+                    # where they are unreliable (e.g. Wayland, unfocused).
+                    self._cond.wait_for(lambda: self._events != seen, min(TEXT_POLL_MAX, remaining))
+                    seen = self._events
+                    continue
+                self._cond.wait(min(interval, remaining))
+            if mark.sequence is None:
+                interval = min(interval * 2, TEXT_POLL_MAX)
+
+_watcher = ClipboardWatcher()
+
+
+def configure_clipboard(settings: ClipboardSettings) -> None:
+    global _watcher
+    _watcher = ClipboardWatcher(settings)
+
+
+def get_clipboard_watcher() -> ClipboardWatcher:
+    return _watcher
+
+
+def watch_qt_clipboard() -> bool:
+    """Wake clipboard waiters from ``QClipboard.dataChanged``; needs a running ``QApplication``."""
+    try:
+        from PySide6.QtGui import QGuiApplication
+    except Exception:
+        return False
+    app = QGuiApplication.instance()
+    if app is None:
+        return False
+    app.clipboard().dataChanged.connect(lambda: _watcher.notify())
+    return True
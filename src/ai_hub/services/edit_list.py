@@ -0,0 +1,133 @@
+"""Edit-list replies for correction prompts on long text.
+
+A spelling fix on a long document changes a handful of words, but a plain
+prompt makes the model re-type the whole text, and output tokens dominate
+latency. Prompts with ``edit_list`` set instead ask for a JSON list of edits
+(offset, original, replacement), which is validated and applied locally.
+If the reply is not a valid edit list, or an edit does not match the text,
+the prompt is re-run in the usual full-text mode.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config import EditListSettings
+from .cancellation import CancelToken
+from .openai_client import ErrorReply, OpenAIClient
+from .prompt_manager import Prompt
+from .telemetry import prompt_label
+
+
+EDIT_LIST_SYSTEM = """Task: {task}.
+Do not rewrite the text. Reply ONLY with a JSON array of the corrections, nothing else:
+[{{"offset": <character index where original starts>, "original": "<exact text to replace>", "replacement": "<corrected text>"}}]
+Copy "original" exactly from the text, including punctuation and spacing. Keep each edit small, but include a
+neighbouring word when the same text appears more than once or to insert or delete words.
+Reply [] if nothing needs correcting."""
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+@dataclass(slots=True, frozen=True)
+class Edit:
+    offset: int
+    original: str
+    replacement: str
+
+
+_settings = EditListSettings()
+
+
+def configure_edit_lists(settings: EditListSettings) -> None:
+    global _settings
+    _settings = settings
+
+
+def parse_edits(reply: str) -> Optional[list[Edit]]:
+    """The edits in ``reply``, or ``None`` if it is not a well-formed edit list."""
+    try:
+        data = json.loads(_FENCE.sub("", reply))
+    except ValueError:
+        return None
+    if not isinstance(data, list):
+        return None
+    edits = []
+    for item in data:
+        if not isinstance(item, dict):
+            return None
+        offset, original, replacement = item.get("offset", 0), item.get("original"), item.get("replacement")
+        if not isinstance(original, str) or not original or not isinstance(replacement, str):
+            return None
+        if not isinstance(offset, int) or isinstance(offset, bool):
+            offset = 0
+        if original != replacement:
+            edits.append(Edit(offset, original, replacement))
+    return edits
+
+
+def _locate(text: str, edit: Edit) -> int:
+    """Where ``edit.original`` starts: its only occurrence, or the one exactly at its offset; else -1."""
+    first = text.find(edit.original)
+    if first == -1 or text.find(edit.original, first + 1) == -1:
+        return first
+    # Several occurrences and a wrong offset: guessing could rewrite the wrong one.
+    return edit.offset if text.startswith(edit.original, edit.offset) else -1
+
+
+def apply_edits(text: str, edits: list[Edit]) -> Optional[str]:
+    """``text`` with every edit applied, or ``None`` if one is missing, ambiguous or two overlap.
+
+    Models are poor at counting characters, so an edit's offset is only used
+    to pick between several occurrences of its original text, and must then
+    be exact.
+    """
+    spans = []
+    for edit in edits:
+        start = _locate(text, edit)
+        if start == -1:
+            return None
+        spans.append((start, start + len(edit.original), edit.replacement))
+    spans.sort()
+    for (_, end, _), (next_start, _, _) in zip(spans, spans[1:]):
+        if next_start < end:
+            return None
+    for start, end, replacement in reversed(spans):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+
+def _task(prompt: Prompt) -> str:
+    return prompt.prefix.strip().rstrip(":") or prompt.system or prompt.name
+
+
+def request_edits(client: OpenAIClient, prompt: Prompt, text: str, cancel: Optional[CancelToken] = None) -> Optional[str]:
+    """Run ``prompt`` in edit-list mode; ``None`` means the edits did not apply cleanly."""
+    reply = client.chat(EDIT_LIST_SYSTEM.format(task=_task(prompt)), text, 0.0, cancel)
+    if isinstance(reply, ErrorReply):
+        return reply
+    edits = parse_edits(reply)
+    if edits is None:
+        print("⚠️ Reply was not a valid edit list; retrying with the full text")
+        return None
+    result = apply_edits(text, edits)
+    if result is None:
+        print("⚠️ Edit list did not match the text; retrying with the full text")
+        return None
+    print(f"✅ Applied {len(edits)} edits from a {len(reply)}-character reply")
+    return result
+
+
+def run_prompt(client: OpenAIClient, prompt: Prompt, text: str, cancel: Optional[CancelToken] = None) -> str:
+    """Complete ``prompt`` on ``text``, as an edit list when the prompt and text length allow."""
+    with prompt_label(prompt.name):
+        if prompt.edit_list and _settings.enabled and len(text) >= _settings.min_chars:
+            result = request_edits(client, prompt, text, cancel)
+            if result is not None:
+                return result
+            if cancel is not None and cancel.cancelled:
+                return ErrorReply("Request cancelled.")
+        return client.chat(prompt.system or None, prompt.build_message(text), prompt.temperature, cancel)
@@ -0,0 +1,154 @@
+"""In-process stand-ins for the focused application, the keyboard and the clipboard.
+
+``FakeApp`` is a text field with a selection. ``FakeKeyboard`` delivers key
+presses to it the way a real application receives them: asynchronously,
+after ``reaction_delay`` seconds, reading the clipboard only when it gets
+round to handling Ctrl+C / Ctrl+V. A clipboard that is restored too early
+therefore pastes the wrong text, just as it would on a real desktop.
+
+Plug them in with ``backends.configure_backends(keyboard, clipboard)``.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+from .backends import KeyCallback, MemoryClipboard
+
+Delay = Union[float, Callable[[], float]]
+
+
+@dataclass(slots=True)
+class KeyEvent:
+    """The subset of ``keyboard.KeyboardEvent`` the hotkey code reads."""
+    event_type: str
+    name: str
+
+
+@dataclass(slots=True)
+class PasteRecord:
+    text: str
+    at: float  # time.perf_counter() when the application inserted the text
+
+
+class FakeClipboard(MemoryClipboard):
+    """The clipboard the fake keyboard copies into and pastes from."""
+
+
+class FakeApp:
+    """A focused text field: its text, the selected range and every paste it received."""
+
+    def __init__(self, text: str = "", select_all: bool = True) -> None:
+        self._cond = threading.Condition()
+        self.reset(text, select_all)
+
+    def reset(self, text: str = "", select_all: bool = True) -> None:
+        with self._cond:
+            self.text = text
+            self.selection = (0, len(text)) if select_all else (len(text), len(text))
+            self.pastes: list[PasteRecord] = []
+
+    @property
+    def selected_text(self) -> str:
+        with self._cond:
+            start, end = self.selection
+            return self.text[start:end]
+
+    def select_all(self) -> None:
+        with self._cond:
+            self.selection = (0, len(self.text))
+
+    def insert(self, text: str, paste: bool = False) -> None:
+        """Replace the selection with ``text`` and put the caret after it."""
+        with self._cond:
+            start, end = self.selection
+            self.text = self.text[:start] + text + self.text[end:]
+            caret = start + len(text)
+            self.selection = (caret, caret)
+            if paste:
+                self.pastes.append(PasteRecord(text, time.perf_counter()))
+            self._cond.notify_all()
+
+    def backspace(self) -> None:
+        with self._cond:
+            start, end = self.selection
+            if start == end and start > 0:
+                start -= 1
+            self.text = self.text[:start] + self.text[end:]
+            self.selection = (start, start)
+            self._cond.notify_all()
+
+    def wait_for_paste(self, count: int = 1, timeout: Optional[float] = None) -> Optional[PasteRecord]:
+        """Block until the application has received ``count`` pastes; returns the last one."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self.pastes) >= count, timeout):
+                return None
+            return self.pastes[count - 1]
+
+
+class FakeKeyboard:
+    """Synthetic key presses delivered to a ``FakeApp`` after ``reaction_delay`` seconds.
+
+    Like a real input queue, keys are handled one at a time in the order they
+    were sent, so a randomised delay never reorders them.
+    """
+
+    def __init__(self, app: FakeApp, clipboard: FakeClipboard, reaction_delay: Delay = 0.0) -> None:
+        self._app = app
+        self._clipboard = clipboard
+        self._delay = reaction_delay
+        self._hooks: list[KeyCallback] = []
+        self._queue: queue.Queue[tuple[float, Callable[[], None]]] = queue.Queue()
+        threading.Thread(target=self._deliver, daemon=True).start()
+
+    def _deliver(self) -> None:
+        while True:
+            due, action = self._queue.get()
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            action()
+
+    def _later(self, action: Callable[[], None]) -> None:
+        delay = self._delay() if callable(self._delay) else self._delay
+        self._queue.put((time.perf_counter() + delay, action))
+
+    def idle(self, timeout: float = 5.0) -> bool:
+        """Wait until every key sent so far has been handled."""
+        done = threading.Event()
+        self._queue.put((0.0, done.set))
+        return done.wait(timeout)
+
+    def send(self, hotkey: str) -> None:
+        app, clipboard = self._app, self._clipboard
+        if hotkey == "ctrl+a":
+            self._later(app.select_all)
+        elif hotkey == "ctrl+c":
+            def copy() -> None:
+                # Like most editors, copying an empty selection leaves the clipboard alone.
+                if app.selected_text:
+                    clipboard.set_text(app.selected_text)
+            self._later(copy)
+        elif hotkey == "ctrl+v":
+            self._later(lambda: app.insert(clipboard.get_text(), paste=True))
+        elif hotkey == "backspace":
+            self._later(app.backspace)
+
+    def write(self, text: str) -> None:
+        self._later(lambda: self._app.insert(text))
+
+    def hook(self, callback: KeyCallback) -> None:
+        self._hooks.append(callback)
+
+    def type_text(self, text: str) -> None:
+        """Type ``text`` as the user: each key reaches the app and every hook, in order."""
+        for char in text:
+            self._app.insert(char)
+            name = "space" if char == " " else char
+            for callback in list(self._hooks):
+                callback(KeyEvent("down", name))
+                callback(KeyEvent("up", name))
@@ -0,0 +1,228 @@
+"""One owner for every global hotkey.
+
+Each part of the app (the main window, GlobalHotkeys, SmartHotkeys, the
+clipboard item hotkeys, shortcuts.json) binds its hotkeys here under its own
+owner name instead of calling ``keyboard.add_hotkey`` itself. Bindings are
+indexed by normalized combo (``"Shift+Ctrl+K"`` and ``"ctrl+shift+k"`` are
+the same key), so a hotkey already taken by another owner is caught at once
+and reported instead of silently firing both actions.
+
+``sync(owner, wanted)`` applies an owner's new set of hotkeys as a diff:
+only combos that appear or disappear touch the OS hook. A combo whose
+action changed keeps its registration; the callback registered with
+``keyboard`` looks the action up when it fires, on the key dispatcher's
+worker. How long registration took and which combos conflicted is printed
+by ``report()`` at startup.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from .key_dispatcher import get_dispatcher
+
+try:
+    import keyboard
+    HAVE_KEYBOARD = True
+except Exception:  # pragma: no cover - optional dependency
+    HAVE_KEYBOARD = False
+
+
+MODIFIER_ORDER = ("ctrl", "alt", "shift", "windows")
+KEY_ALIASES = {
+    "control": "ctrl", "ctl": "ctrl",
+    "option": "alt", "menu": "alt",
+    "win": "windows", "super": "windows", "cmd": "windows", "command": "windows", "meta": "windows",
+    "escape": "esc", "return": "enter", "spacebar": "space", "del": "delete",
+}
+
+
+def normalize_combo(combo: str) -> str:
+    """Canonical spelling of a hotkey: lower case, aliases resolved, modifiers in a fixed order."""
+    keys = [KEY_ALIASES.get(key.strip().lower(), key.strip().lower()) for key in combo.split("+")]
+    keys = [key for key in keys if key] or [combo.strip().lower()]
+    modifiers = sorted({key for key in keys if key in MODIFIER_ORDER}, key=MODIFIER_ORDER.index)
+    others = [key for key in keys if key not in MODIFIER_ORDER]
+    return "+".join(modifiers + others)
+
+
+@dataclass(slots=True)
+class HotkeyBinding:
+    combo: str
+    owner: str
+    callback: Callable[[], None]
+    label: str = ""
+    trigger_on_release: bool = True
+    suppress: bool = False
+    handle: Any = None
+
+
+@dataclass(slots=True)
+class HotkeyConflict:
+    combo: str
+    owner: str        # who has the combo
+    label: str
+    rejected_owner: str
+    rejected_label: str
+
+
+@dataclass(slots=True)
+class RegistrationStats:
+    registrations: int = 0
+    removals: int = 0
+    seconds: float = 0.0
+    slowest: float = 0.0
+    slowest_combo: str = ""
+    failures: list[str] = field(default_factory=list)
+
+
+class HotkeyRegistry:
+    """All global hotkeys, by normalized combo."""
+
+    def __init__(self) -> None:
+        self._bindings: dict[str, HotkeyBinding] = {}
+        self._owners: dict[str, set[str]] = {}
+        self._conflicts: dict[tuple[str, str], HotkeyConflict] = {}  # (combo, rejected owner) -> conflict
+        self._stats = RegistrationStats()
+        self._lock = threading.RLock()
+
+    def bind(
+        self,
+        owner: str,
+        combo: str,
+        callback: Callable[[], None],
+        label: str = "",
+        *,
+        trigger_on_release: bool = True,
+        suppress: bool = False,
+    ) -> bool:
+        """Bind ``combo`` for ``owner``; ``False`` if another owner already has it (or it could not be hooked)."""
+        key = normalize_combo(combo)
+        label = label or getattr(callback, "__name__", "")
+        with self._lock:
+            current = self._bindings.get(key)
+            if current is not None and current.owner != owner:
+                conflict = HotkeyConflict(key, current.owner, current.label, owner, label)
+                if (key, owner) not in self._conflicts:
+                    print(f"⚠️ Hotkey {key} for {owner} ({label}) is already taken by {current.owner} ({current.label})")
+                self._conflicts[(key, owner)] = conflict
+                return False
+            self._conflicts.pop((key, owner), None)
+            if current is not None and (current.trigger_on_release, current.suppress) == (trigger_on_release, suppress):
+                # Same hook, new action: no need to touch the OS registration.
+                current.callback, current.label = callback, label
+                return True
+            if current is not None:
+                self._unhook(current)
+            binding = HotkeyBinding(key, owner, callback, label, trigger_on_release, suppress)
+            if not self._hook(binding):
+                self._owners.get(owner, set()).discard(key)
+                self._bindings.pop(key, None)
+                return False
+            self._bindings[key] = binding
+            self._owners.setdefault(owner, set()).add(key)
+            return True
+
+    def unbind(self, owner: str, combo: str) -> bool:
+        key = normalize_combo(combo)
+        with self._lock:
+            self._conflicts.pop((key, owner), None)
+            binding = self._bindings.get(key)
+            if binding is None or binding.owner != owner:
+                return False
+            self._unhook(binding)
+            del self._bindings[key]
+            self._owners[owner].discard(key)
+            return True
+
+    def sync(self, owner: str, wanted: dict[str, tuple[Callable[[], None], str]], **options: bool) -> tuple[int, int]:
+        """Make ``owner``'s hotkeys exactly ``wanted`` (combo -> (callback, label)); returns (bound, removed)."""
+        wanted_keys = {normalize_combo(combo): value for combo, value in wanted.items()}
+        with self._lock:
+            stale = [key for key in self._owners.get(owner, ()) if key not in wanted_keys]
+            for key in stale:
+                self.unbind(owner, key)
+            for key, rejected in list(self._conflicts):
+                if rejected == owner and key not in wanted_keys:
+                    del self._conflicts[(key, rejected)]
+            bound = sum(self.bind(owner, key, callback, label, **options) for key, (callback, label) in wanted_keys.items())
+        return bound, len(stale)
+
+    def unbind_owner(self, owner: str) -> None:
+        self.sync(owner, {})
+
+    def owner_of(self, combo: str) -> Optional[str]:
+        binding = self._bindings.get(normalize_combo(combo))
+        return binding.owner if binding is not None else None
+
+    def bindings(self) -> list[HotkeyBinding]:
+        with self._lock:
+            return list(self._bindings.values())
+
+    def conflicts(self) -> list[HotkeyConflict]:
+        with self._lock:
+            return list(self._conflicts.values())
+
+    def stats(self) -> RegistrationStats:
+        return self._stats
+
+    def report(self) -> None:
+        """Print what registration cost and which hotkeys conflicted."""
+        stats = self._stats
+        conflicts = self.conflicts()
+        print(f"⌨️ {len(self._bindings)} hotkeys bound: {stats.registrations} registrations and {stats.removals} "
+              f"removals took {stats.seconds * 1000:.1f} ms (slowest {stats.slowest_combo or '-'}: "
+              f"{stats.slowest * 1000:.1f} ms); {len(conflicts)} conflicts")
+        for conflict in conflicts:
+            print(f"⚠️ Hotkey conflict: {conflict.combo} is {conflict.owner} ({conflict.label}); "
+                  f"{conflict.rejected_owner} ({conflict.rejected_label}) was not bound")
+        for failure in stats.failures:
+            print(f"⚠️ Could not register hotkey {failure}")
+
+    def _fire(self, key: str) -> None:
+        binding = self._bindings.get(key)
+        if binding is not None:
+            binding.callback()
+
+    def _hook(self, binding: HotkeyBinding) -> bool:
+        if not HAVE_KEYBOARD:
+            return True
+        key = binding.combo
+        callback = get_dispatcher().wrap(lambda: self._fire(key), f"hotkey {key}")
+        started = time.perf_counter()
+        try:
+            binding.handle = keyboard.add_hotkey(
+                key, callback, suppress=binding.suppress, trigger_on_release=binding.trigger_on_release
+            )
+        except Exception as e:
+            self._stats.failures.append(f"{key} ({binding.owner}): {e}")
+            print(f"⚠️ Could not register hotkey {key} for {binding.owner}: {e}")
+            return False
+        elapsed = time.perf_counter() - started
+        self._stats.registrations += 1
+        self._stats.seconds += elapsed
+        if elapsed > self._stats.slowest:
+            self._stats.slowest, self._stats.slowest_combo = elapsed, key
+        return True
+
+    def _unhook(self, binding: HotkeyBinding) -> None:
+        if not HAVE_KEYBOARD or binding.handle is None:
+            return
+        started = time.perf_counter()
+        try:
+            keyboard.remove_hotkey(binding.handle)
+        except (KeyError, ValueError):
+            pass
+        self._stats.removals += 1
+        self._stats.seconds += time.perf_counter() - started
+        binding.handle = None
+
+
+_registry = HotkeyRegistry()
+
+
+def get_hotkey_registry() -> HotkeyRegistry:
+    return _registry
@@ -0,0 +1,334 @@
+"""Shared keep-alive HTTP transport used by every AI provider client."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+    HAVE_HTTPX = True
+except Exception:  # pragma: no cover - optional dependency
+    HAVE_HTTPX = False
+
+try:
+    import h2  # noqa: F401 - only needed so httpx can negotiate HTTP/2
+    HAVE_H2 = True
+except Exception:  # pragma: no cover - optional dependency
+    HAVE_H2 = False
+
+from ..config import HTTPSettings
+
+
+class _HTTPXResponse:
+    """Adapts an ``httpx.Response`` to the subset of ``requests.Response`` the clients use."""
+
+    def __init__(self, response: "httpx.Response"):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    @property
+    def text(self) -> str:
+        return self._response.text
+
+    @property
+    def content(self) -> bytes:
+        return self._response.content
+
+    def json(self) -> Any:
+        return self._response.json()
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(
+                f"{self.status_code} {self._response.reason_phrase} for url: {self._response.url}",
+                response=self,
+            )
+
+    def iter_lines(self, decode_unicode: bool = True) -> Iterator[str]:
+        try:
+            yield from self._response.iter_lines()
+        except httpx.HTTPError as exc:
+            raise requests.ConnectionError(str(exc)) from exc
+
+    def close(self) -> None:
+        self._response.close()
+
+    async def aclose(self) -> None:
+        """Close a response from ``apost``; ``close`` raises on httpx's async responses."""
+        await self._response.aclose()
+
+
+@dataclass(slots=True)
+class _PooledSession:
+    client: Any
+    last_used: float
+    in_flight: int = 0  # requests (and open streamed responses) using the session
+
+
+@dataclass(slots=True)
+class _Lease:
+    pooled: _PooledSession
+    active: bool = True
+
+
+class HTTPTransport:
+    """Process-wide pool of keep-alive sessions, one per endpoint host.
+
+    Reusing a session per ``scheme://host`` skips the DNS lookup and the
+    TCP+TLS handshake on every hotkey after the first one. Sessions that sit
+    idle for longer than ``keep_alive`` seconds are closed by a background
+    reaper so sockets are not held open forever.
+    """
+
+    def __init__(self, settings: Optional[HTTPSettings] = None):
+        self._settings = settings or HTTPSettings()
+        self._sessions: dict[str, _PooledSession] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        # httpx.AsyncClient is bound to the loop it was first used on.
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Any]] = weakref.WeakKeyDictionary()
+
+    @property
+    def settings(self) -> HTTPSettings:
+        return self._settings
+
+    @property
+    def uses_http2(self) -> bool:
+        return self._settings.http2 and HAVE_HTTPX and HAVE_H2
+
+    def post(
+        self,
+        url: str,
+        *,
+        headers: Optional[dict[str, str]] = None,
+        json: Any = None,
+        timeout: float | None = None,
+        stream: bool = False,
+    ) -> Any:
+        """POST ``json`` to ``url`` over a pooled connection.
+
+        Returns a ``requests.Response`` (or an object with the same interface
+        when HTTP/2 is enabled). Transport failures raise
+        ``requests.RequestException`` subclasses in both modes.
+        """
+        lease = self._acquire(url)
+        try:
+            response = self._send(lease.pooled.client, url, headers, json, timeout, stream)
+        except BaseException:
+            self._release(lease)
+            raise
+        if stream:
+            # The session stays busy until the body has been read and the response closed.
+            self._release_on_close(response, lease)
+        else:
+            self._release(lease)
+        return response
+
+    def _send(self, client: Any, url: str, headers: Optional[dict[str, str]], json: Any,
+              timeout: float | None, stream: bool) -> Any:
+        if not self.uses_http2:
+            return client.post(url, headers=headers, json=json, timeout=timeout, stream=stream)
+
+        try:
+            request = client.build_request("POST", url, headers=headers, json=json, timeout=timeout)
+            return _HTTPXResponse(client.send(request, stream=stream))
+        except httpx.TimeoutException as exc:
+            raise requests.Timeout(str(exc)) from exc
+        except httpx.HTTPError as exc:
+            raise requests.ConnectionError(str(exc)) from exc
+
+    async def apost(
+        self,
+        url: str,
+        *,
+        headers: Optional[dict[str, str]] = None,
+        json: Any = None,
+        timeout: float | None = None,
+    ) -> Any:
+        """Asynchronous ``post`` sharing one pooled ``httpx.AsyncClient`` per host and event loop.
+
+        Without httpx installed the blocking ``post`` runs in the default
+        executor instead, so the event loop is still never stalled.
+        """
+        if not HAVE_HTTPX:
+            return await asyncio.to_thread(self.post, url, headers=headers, json=json, timeout=timeout)
+
+        client = self._async_client_for(url)
+        try:
+            return _HTTPXResponse(await client.post(url, headers=headers, json=json, timeout=timeout))
+        except httpx.TimeoutException as exc:
+            raise requests.Timeout(str(exc)) from exc
+        except httpx.HTTPError as exc:
+            raise requests.ConnectionError(str(exc)) from exc
+
+    async def aclose(self) -> None:
+        """Close the async clients that belong to the running event loop."""
+        clients = self._async_clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await client.aclose()
+
+    def reap_idle(self) -> int:
+        """Close sessions idle for longer than ``keep_alive``; return how many were closed.
+
+        A session with a request or an open streamed response is never idle,
+        however long ago that request started.
+        """
+        cutoff = time.monotonic() - self._settings.keep_alive
+        with self._lock:
+            stale = [
+                key for key, pooled in self._sessions.items()
+                if pooled.in_flight == 0 and pooled.last_used < cutoff
+            ]
+            clients = [self._sessions.pop(key).client for key in stale]
+        for client in clients:
+            client.close()
+        return len(clients)
+
+    def close(self) -> None:
+        """Close every pooled session and stop the reaper."""
+        self._closed.set()
+        with self._lock:
+            clients = [pooled.client for pooled in self._sessions.values()]
+            self._sessions.clear()
+        for client in clients:
+            client.close()
+
+    def _acquire(self, url: str) -> _Lease:
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        now = time.monotonic()
+        with self._lock:
+            pooled = self._sessions.get(key)
+            if pooled is None:
+                pooled = _PooledSession(self._create_client(), now)
+                self._sessions[key] = pooled
+                self._ensure_reaper()
+            pooled.last_used = now
+            pooled.in_flight += 1
+            return _Lease(pooled)
+
+    def _release(self, lease: _Lease) -> None:
+        """End ``lease`` (only the first call counts); the session's idle time starts now."""
+        with self._lock:
+            if not lease.active:
+                return
+            lease.active = False
+            lease.pooled.in_flight -= 1
+            lease.pooled.last_used = time.monotonic()
+
+    def _release_on_close(self, response: Any, lease: _Lease) -> None:
+        """Release ``lease`` when ``response`` is closed, or garbage collected without being closed."""
+        close = type(response).close
+        ref = weakref.ref(response)  # no reference cycle, so an unclosed response is still freed at once
+
+        def close_and_release() -> None:
+            try:
+                target = ref()
+                if target is not None:
+                    close(target)
+            finally:
+                self._release(lease)
+
+        response.close = close_and_release
+        weakref.finalize(response, self._release, lease)
+
+    def _async_client_for(self, url: str) -> Any:
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(key)
+            if client is None:
+                client = httpx.AsyncClient(http2=self.uses_http2, limits=self._httpx_limits())
+                clients[key] = client
+            return client
+
+    def _httpx_limits(self) -> Any:
+        return httpx.Limits(
+            max_connections=self._settings.pool_size,
+            max_keepalive_connections=self._settings.pool_size,
+            keepalive_expiry=self._settings.keep_alive,
+        )
+
+    def _create_client(self) -> Any:
+        pool_size = self._settings.pool_size
+        if self.uses_http2:
+            return httpx.Client(http2=True, limits=self._httpx_limits())
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is not None or self._settings.keep_alive <= 0:
+            return
+
+        interval = max(1.0, self._settings.keep_alive / 2)
+
+        def run() -> None:
+            while not self._closed.wait(interval):
+                self.reap_idle()
+
+        self._reaper = threading.Thread(target=run, name="ai-hub-http-reaper", daemon=True)
+        self._reaper.start()
+
+
+def abort_response(response: Any) -> None:
+    """Close ``response`` and shut its socket down.
+
+    Plain ``close`` does not wake a thread blocked reading the body; shutting
+    the socket down does, so a cancelled stream stops straight away.
+    """
+    sock = None
+    try:
+        if isinstance(response, _HTTPXResponse):
+            if response._response.is_closed:
+                return  # its connection may already be serving another request
+            stream = response._response.extensions.get("network_stream")
+            sock = stream.get_extra_info("socket") if stream is not None else None
+        else:
+            sock = getattr(getattr(response.raw, "connection", None), "sock", None)
+        if sock is not None:
+            sock.shutdown(socket.SHUT_RDWR)
+    except (AttributeError, OSError):
+        pass
+    response.close()
+
+
+_transport: Optional[HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def configure_transport(settings: HTTPSettings) -> HTTPTransport:
+    """Replace the shared transport with one built from ``settings``."""
+    global _transport
+    with _transport_lock:
+        previous = _transport
+        _transport = HTTPTransport(settings)
+    if previous is not None:
+        previous.close()
+    return _transport
+
+
+def get_transport() -> HTTPTransport:
+    """Return the shared transport, creating one with default settings if needed."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HTTPTransport()
+        return _transport
@@ -0,0 +1,136 @@
+"""Run hotkey and hotstring actions on a worker thread instead of the keyboard hook thread.
+
+The ``keyboard`` library calls hooks and hotkey callbacks on its listener
+thread; while a callback runs (sending backspaces, copying the selection,
+and so on) no other key is processed, and with suppressing
+hooks typing stalls system-wide. ``KeyDispatcher.hook`` and ``.wrap`` turn a
+callback into one that only queues the call and returns; a single worker
+runs the queued calls in the order the keys arrived.
+
+Everything on the worker delays the keys queued behind it, so actions must
+be short: matching, expansion, reading the selection. Anything that waits
+on the network hands off to its own thread (``GlobalHotkeys._run_spelling``
+is the pattern); ``SLOW_ACTION`` flags those that don't.
+
+Time spent in the hook callbacks, time queued and time running are kept as
+rolling percentiles (``dispatch_stats()``), shown in the Settings tab.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+SLOW_ACTION = 2.0
+
+
+@dataclass(slots=True)
+class DispatchStats:
+    events: int
+    hook_p50: float
+    hook_p95: float
+    hook_max: float
+    wait_p50: float
+    wait_p95: float
+    run_p95: float
+    backlog: int
+
+
+def _percentile(samples: list[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+class KeyDispatcher:
+    """One worker thread running key-triggered actions in order."""
+
+    def __init__(self, window: int = 1000):
+        self._queue: queue.SimpleQueue[tuple[float, str, Callable[..., Any], tuple]] = queue.SimpleQueue()
+        self._hook_times: deque[float] = deque(maxlen=window)
+        self._wait_times: deque[float] = deque(maxlen=window)
+        self._run_times: deque[float] = deque(maxlen=window)
+        self._events = 0
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def post(self, action: Callable[..., Any], *args: Any, label: str = "") -> None:
+        """Queue ``action(*args)`` for the worker."""
+        if self._worker is None:
+            self._start()
+        self._queue.put((time.perf_counter(), label, action, args))
+
+    def wrap(self, action: Callable[..., Any], label: str = "") -> Callable[..., None]:
+        """A callback for ``keyboard.add_hotkey`` that queues ``action`` and returns at once."""
+        label = label or getattr(action, "__name__", "")
+
+        def callback(*args: Any) -> None:
+            started = time.perf_counter()
+            self.post(action, *args, label=label)
+            self._hook_times.append(time.perf_counter() - started)
+
+        return callback
+
+    def hook(self, on_event: Callable[[Any], None]) -> Callable[[Any], None]:
+        """A ``keyboard.hook`` callback that hands every key event to ``on_event`` on the worker."""
+        return self.wrap(on_event, getattr(on_event, "__qualname__", ""))
+
+    def idle(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far has run."""
+        done = threading.Event()
+        self.post(done.set, label="idle")
+        return done.wait(timeout)
+
+    def stats(self) -> DispatchStats:
+        with self._lock:
+            waits, runs, events = list(self._wait_times), list(self._run_times), self._events
+        hooks = list(self._hook_times)
+        return DispatchStats(
+            events=events,
+            hook_p50=_percentile(hooks, 0.50),
+            hook_p95=_percentile(hooks, 0.95),
+            hook_max=max(hooks, default=0.0),
+            wait_p50=_percentile(waits, 0.50),
+            wait_p95=_percentile(waits, 0.95),
+            run_p95=_percentile(runs, 0.95),
+            backlog=self._queue.qsize(),
+        )
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="key-dispatch", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            queued, label, action, args = self._queue.get()
+            started = time.perf_counter()
+            try:
+                action(*args)
+            except Exception as e:
+                print(f"⚠️ Error in {label or 'key action'}: {e}")
+            finished = time.perf_counter()
+            with self._lock:
+                self._events += 1
+                self._wait_times.append(started - queued)
+                self._run_times.append(finished - started)
+            if finished - started > SLOW_ACTION:
+                print(f"⚠️ {label or 'Key action'} held the key worker for {finished - started:.1f} s")
+
+
+_dispatcher = KeyDispatcher()
+
+
+def get_dispatcher() -> KeyDispatcher:
+    return _dispatcher
+
+
+def dispatch_stats() -> DispatchStats:
+    return _dispatcher.stats()
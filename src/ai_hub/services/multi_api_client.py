@@ -2,12 +2,36 @@
 
 from __future__ import annotations
 
-from typing import Optional, Literal
-import requests
+import contextvars
+import json
+import queue
+import threading
+import time
+from collections import deque
+from typing import Iterator, Optional, Literal, Sequence
+from urllib.parse import urlsplit
+
+from .cancellation import CancelToken, RequestCancelled
+from .http_transport import abort_response, get_transport
+from .openai_client import ErrorReply, collect_stream
+from .rate_limiter import estimate_request_tokens, get_rate_limiter, send_with_retries
+from .sse import iter_sse_events
+from .telemetry import RequestTrace, error_kind
+from .tokens import context_error, count_message_tokens, count_tokens, output_budget
+from .usage import anthropic_usage, openai_usage
 
 
 class MultiAPIClient:
-    """Unified client for multiple AI APIs."""
+    """Unified client for multiple AI APIs.
+
+    Requests put the static system prompt first and byte-identical across
+    calls, so providers can serve it from their prompt-prefix cache: OpenAI
+    does so automatically, Claude is given a ``cache_control`` breakpoint.
+    Cached-token counts are recorded in the usage log (see ``usage.py``).
+    """
+
+    # Anthropic only caches prefixes at least this long (Haiku needs 2048).
+    CLAUDE_CACHE_MIN_TOKENS = 1024
 
     def __init__(
         self,
@@ -15,13 +39,19 @@ class MultiAPIClient:
         api_key: Optional[str] = None,
         model: Optional[str] = None,
         endpoint: Optional[str] = None,
+        max_retries: Optional[int] = None,
     ):
-        """Initialize multi-API client."""
+        """Initialize multi-API client.
+
+        ``max_retries`` overrides the ``[rate_limit]`` retry count, e.g. 0 for
+        clients behind a ``ProviderRouter`` so failures hand over at once.
+        """
         self.provider = provider
         self.api_key = api_key
         self.model = model
         self.endpoint = endpoint
         self.timeout = 120
+        self.max_retries = max_retries
 
         # Set defaults based on provider
         if provider == "openai" and not model:
@@ -31,20 +61,64 @@ class MultiAPIClient:
             self.model = "claude-3-5-sonnet-20241022"
             self.endpoint = "https://api.anthropic.com/v1/messages"
 
-    def chat(self, system: Optional[str], user: str, temperature: float = 0.2) -> str:
-        """Send chat message."""
+    def chat(
+        self,
+        system: Optional[str],
+        user: str,
+        temperature: float = 0.2,
+        cancel: Optional[CancelToken] = None,
+    ) -> str:
+        """Send chat message.
+
+        With a ``cancel`` token the reply is streamed under the hood so
+        cancelling closes the connection mid-generation.
+        """
         if not self.api_key:
-            return "Missing API key for provider: " + self.provider
+            return ErrorReply("Missing API key for provider: " + self.provider)
 
+        if cancel is not None:
+            return collect_stream(self.chat_stream(system, user, temperature, cancel), cancel, f"{self.provider} request")
+        too_long = self._context_error(system, user)
+        if too_long is not None:
+            return too_long
         if self.provider == "openai":
             return self._openai_chat(system, user, temperature)
         elif self.provider == "claude":
             return self._claude_chat(system, user, temperature)
         else:
-            return "Unknown provider: " + self.provider
+            return ErrorReply("Unknown provider: " + self.provider)
 
-    def _openai_chat(self, system: Optional[str], user: str, temperature: float) -> str:
-        """OpenAI API call."""
+    def chat_stream(
+        self,
+        system: Optional[str],
+        user: str,
+        temperature: float = 0.2,
+        cancel: Optional[CancelToken] = None,
+    ) -> Iterator[str]:
+        """Send chat message and yield the reply as text deltas."""
+        if not self.api_key:
+            return iter([ErrorReply("Missing API key for provider: " + self.provider)])
+        too_long = self._context_error(system, user)
+        if too_long is not None:
+            return iter([too_long])
+
+        # Traced from here, not from the generator's first step, so the
+        # request keeps the caller's prompt label and includes queueing time.
+        trace = RequestTrace(self.provider, self.model, stream=True)
+        if self.provider == "openai":
+            return self._openai_stream(system, user, temperature, trace, cancel)
+        elif self.provider == "claude":
+            return self._claude_stream(system, user, temperature, trace, cancel)
+        else:
+            return iter([ErrorReply("Unknown provider: " + self.provider)])
+
+    def _context_error(self, system: Optional[str], user: str) -> Optional[ErrorReply]:
+        """Refuse locally, without a round trip, a prompt the model cannot take."""
+        error = context_error(count_message_tokens(system, user, self.model), self.model)
+        return ErrorReply(error) if error else None
+
+    def _openai_request(self, system: Optional[str], user: str, temperature: float) -> tuple[dict, dict]:
+        """Build OpenAI payload and headers."""
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
@@ -60,60 +134,228 @@ class MultiAPIClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        return payload, headers
 
-        try:
-            response = requests.post(
-                self.endpoint,
-                headers=headers,
-                json=payload,
-                timeout=self.timeout,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            choices = data.get("choices", [])
-            if choices:
-                return choices[0].get("message", {}).get("content", "No response")
-            return "No choices in response"
-        except Exception as e:
-            return f"OpenAI error: {str(e)}"
-
-    def _claude_chat(self, system: Optional[str], user: str, temperature: float) -> str:
-        """Claude (Anthropic) API call."""
+    def _claude_request(self, system: Optional[str], user: str, temperature: float) -> tuple[dict, dict]:
+        """Build Claude (Anthropic) payload and headers."""
         messages = [{"role": "user", "content": user}]
+        prompt_tokens = count_message_tokens(system, user, self.model)
 
         payload = {
             "model": self.model,
-            "max_tokens": 1024,
+            # Claude requires a cap; size it for a rewrite of the input.
+            "max_tokens": output_budget(prompt_tokens, self.model, count_tokens(user, self.model)),
             "messages": messages,
             "temperature": temperature,
         }
 
         if system:
-            payload["system"] = system
+            minimum = self.CLAUDE_CACHE_MIN_TOKENS * (2 if "haiku" in self.model else 1)
+            if count_tokens(system, self.model) >= minimum:
+                payload["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+            else:
+                payload["system"] = system
 
         headers = {
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01",
             "content-type": "application/json",
         }
+        return payload, headers
+
+    def _openai_chat(self, system: Optional[str], user: str, temperature: float) -> str:
+        """OpenAI API call."""
+        payload, headers = self._openai_request(system, user, temperature)
+        trace = RequestTrace(self.provider, self.model)
 
         try:
-            response = requests.post(
-                self.endpoint,
-                headers=headers,
-                json=payload,
-                timeout=self.timeout,
+            response = send_with_retries(
+                get_rate_limiter(self.provider, self.model),
+                lambda: get_transport().post(
+                    self.endpoint,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout,
+                ),
+                tokens=estimate_request_tokens(payload),
+                max_retries=self.max_retries,
+                on_retry=trace.retried,
+            )
+            trace.first_token()
+            trace.received(len(response.content))
+            response.raise_for_status()
+            data = response.json()
+            trace.usage(openai_usage(data.get("usage")))
+
+            choices = data.get("choices", [])
+            if choices:
+                reply = choices[0].get("message", {}).get("content", "No response")
+                trace.finish(output=reply)
+                return reply
+            trace.finish("unexpected response")
+            return ErrorReply("No choices in response")
+        except Exception as e:
+            trace.finish(error_kind(e))
+            return ErrorReply(f"OpenAI error: {str(e)}")
+
+    def _claude_chat(self, system: Optional[str], user: str, temperature: float) -> str:
+        """Claude (Anthropic) API call."""
+        payload, headers = self._claude_request(system, user, temperature)
+        trace = RequestTrace(self.provider, self.model)
+
+        try:
+            response = send_with_retries(
+                get_rate_limiter(self.provider, self.model),
+                lambda: get_transport().post(
+                    self.endpoint,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout,
+                ),
+                tokens=estimate_request_tokens(payload),
+                max_retries=self.max_retries,
+                on_retry=trace.retried,
             )
+            trace.first_token()
+            trace.received(len(response.content))
             response.raise_for_status()
             data = response.json()
+            trace.usage(anthropic_usage(data.get("usage")))
 
             content = data.get("content", [])
             if content:
-                return content[0].get("text", "No response")
-            return "No content in response"
+                reply = content[0].get("text", "No response")
+                trace.finish(output=reply)
+                return reply
+            trace.finish("unexpected response")
+            return ErrorReply("No content in response")
+        except Exception as e:
+            trace.finish(error_kind(e))
+            return ErrorReply(f"Claude error: {str(e)}")
+
+    def _send_stream(self, payload: dict, headers: dict, cancel: Optional[CancelToken], trace: RequestTrace):
+        """POST a streaming request; cancelling ``cancel`` aborts the response."""
+        response = send_with_retries(
+            get_rate_limiter(self.provider, self.model),
+            lambda: get_transport().post(
+                self.endpoint,
+                headers=headers,
+                json=payload,
+                timeout=self.timeout,
+                stream=True,
+            ),
+            tokens=estimate_request_tokens(payload),
+            cancel=cancel,
+            max_retries=self.max_retries,
+            on_retry=trace.retried,
+        )
+        if cancel is not None:
+            cancel.on_cancel(lambda: abort_response(response))
+        return response
+
+    def _openai_stream(
+        self, system: Optional[str], user: str, temperature: float, trace: RequestTrace,
+        cancel: Optional[CancelToken] = None,
+    ) -> Iterator[str]:
+        """OpenAI streaming call (Chat Completions SSE)."""
+        payload, headers = self._openai_request(system, user, temperature)
+        payload["stream"] = True
+        if urlsplit(self.endpoint or "").netloc.endswith("openai.com"):
+            # Only OpenAI is known to accept this; it adds a final chunk with token usage.
+            payload["stream_options"] = {"include_usage": True}
+
+        try:
+            response = self._send_stream(payload, headers, cancel, trace)
+            response.raise_for_status()
+        except RequestCancelled:
+            trace.finish("cancelled")
+            return
+        except Exception as e:
+            trace.finish("cancelled" if cancel is not None and cancel.cancelled else error_kind(e))
+            if cancel is None or not cancel.cancelled:
+                yield ErrorReply(f"OpenAI error: {str(e)}")
+            return
+
+        parts: list[str] = []
+        error = ""
+        try:
+            for event in iter_sse_events(trace.count_lines(response.iter_lines())):
+                if event.data == "[DONE]":
+                    break
+                data = json.loads(event.data)
+                if data.get("usage"):
+                    trace.usage(openai_usage(data["usage"]))
+                for choice in data.get("choices") or []:
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        trace.first_token()
+                        parts.append(text)
+                        yield text
+        except Exception as e:
+            if cancel is None or not cancel.cancelled:
+                error = error_kind(e)
+                yield ErrorReply(f"\n\nOpenAI error: {str(e)}")
+        finally:
+            response.close()
+            if cancel is not None and cancel.cancelled:
+                error = "cancelled"
+            trace.finish(error, "".join(parts))
+
+    def _claude_stream(
+        self, system: Optional[str], user: str, temperature: float, trace: RequestTrace,
+        cancel: Optional[CancelToken] = None,
+    ) -> Iterator[str]:
+        """Claude (Anthropic) streaming call (Messages SSE)."""
+        payload, headers = self._claude_request(system, user, temperature)
+        payload["stream"] = True
+        usage: dict = {}
+
+        try:
+            response = self._send_stream(payload, headers, cancel, trace)
+            response.raise_for_status()
+        except RequestCancelled:
+            trace.finish("cancelled")
+            return
+        except Exception as e:
+            trace.finish("cancelled" if cancel is not None and cancel.cancelled else error_kind(e))
+            if cancel is None or not cancel.cancelled:
+                yield ErrorReply(f"Claude error: {str(e)}")
+            return
+
+        parts: list[str] = []
+        error = ""
+        try:
+            for event in iter_sse_events(trace.count_lines(response.iter_lines())):
+                data = json.loads(event.data)
+                kind = data.get("type", event.event)
+                if kind == "message_start":
+                    # Prompt and cache counts arrive first; the output count in message_delta.
+                    usage.update(data.get("message", {}).get("usage") or {})
+                elif kind == "message_delta":
+                    usage.update(data.get("usage") or {})
+                elif kind == "content_block_delta":
+                    text = data.get("delta", {}).get("text")
+                    if text:
+                        trace.first_token()
+                        parts.append(text)
+                        yield text
+                elif kind == "error":
+                    error = "stream error"
+                    yield ErrorReply(f"\n\nClaude error: {data.get('error', {}).get('message', 'unknown error')}")
+                    break
+                elif kind == "message_stop":
+                    break
         except Exception as e:
-            return f"Claude error: {str(e)}"
+            if cancel is None or not cancel.cancelled:
+                error = error_kind(e)
+                yield ErrorReply(f"\n\nClaude error: {str(e)}")
+        finally:
+            response.close()
+            if cancel is not None and cancel.cancelled:
+                error = "cancelled"
+            if usage:
+                trace.usage(anthropic_usage(usage))
+            trace.finish(error, "".join(parts))
 
     @staticmethod
     def list_providers() -> list[str]:
@@ -141,3 +383,124 @@ class MultiAPIClient:
         return models.get(provider, [])
 
 
+class ProviderRouter:
+    """Routes one chat across an ordered list of providers with hedging and failover.
+
+    The first provider is asked straight away. If it has not answered once
+    its usual latency (``hedge_percentile`` of recent successful calls) has
+    passed, the next provider is asked too and whichever answers first wins;
+    the other requests are cancelled. A provider that fails hands over to
+    the next one immediately. Hedging trades some extra spend for a shorter
+    tail on interactive hotkeys when one vendor is slow.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[MultiAPIClient],
+        hedge_percentile: float = 0.95,
+        initial_hedge_delay: float = 2.0,
+        min_samples: int = 10,
+        window: int = 100,
+    ):
+        if not clients:
+            raise ValueError("ProviderRouter needs at least one client")
+        self._clients = list(clients)
+        self._hedge_percentile = hedge_percentile
+        self._initial_hedge_delay = initial_hedge_delay
+        self._min_samples = min_samples
+        self._latencies = [deque(maxlen=window) for _ in self._clients]
+        self._lock = threading.Lock()
+
+    @property
+    def clients(self) -> list[MultiAPIClient]:
+        return list(self._clients)
+
+    def hedge_delay(self, index: int) -> float:
+        """Seconds to wait on provider ``index`` before hedging to the next one."""
+        with self._lock:
+            samples = sorted(self._latencies[index])
+        if len(samples) < self._min_samples:
+            return self._initial_hedge_delay
+        return samples[min(len(samples) - 1, int(len(samples) * self._hedge_percentile))]
+
+    def chat(
+        self,
+        system: Optional[str],
+        user: str,
+        temperature: float = 0.2,
+        cancel: Optional[CancelToken] = None,
+    ) -> str:
+        """Return the first successful reply, or the last provider's ``ErrorReply``."""
+        replies: queue.Queue[tuple[int, str, float]] = queue.Queue()
+        tokens: list[CancelToken] = []
+        started_at: list[float] = []
+        finished: set[int] = set()
+
+        def launch(index: int) -> float:
+            token = CancelToken()
+            tokens.append(token)
+            if cancel is not None and cancel.cancelled:
+                # cancel_all may have run before the token was in the list.
+                token.cancel()
+            started = time.monotonic()
+            started_at.append(started)
+
+            def run() -> None:
+                try:
+                    reply = self._clients[index].chat(system, user, temperature, cancel=token)
+                except Exception as e:
+                    reply = ErrorReply(f"{self._clients[index].provider} error: {str(e)}")
+                replies.put((index, reply, time.monotonic() - started))
+
+            # Copy the context so the hedged request keeps the caller's prompt label.
+            context = contextvars.copy_context()
+            threading.Thread(target=context.run, args=(run,), name=f"ai-hub-route-{index}", daemon=True).start()
+            return started + self.hedge_delay(index)
+
+        def cancel_all(keep: int = -1) -> None:
+            for index, token in enumerate(list(tokens)):
+                if index != keep:
+                    token.cancel()
+
+        def cancelled() -> bool:
+            return cancel is not None and cancel.cancelled
+
+        if cancelled():
+            return ErrorReply("Request cancelled.")
+        hedge_at = launch(0)
+        if cancel is not None:
+            cancel.on_cancel(cancel_all)
+        next_index, pending = 1, 1
+        last_error: str = ErrorReply("No provider answered")
+        while pending:
+            timeout = None
+            if next_index < len(self._clients) and not cancelled():
+                timeout = max(0.0, hedge_at - time.monotonic())
+            try:
+                index, reply, elapsed = replies.get(timeout=timeout)
+            except queue.Empty:
+                if cancelled():
+                    continue
+                hedge_at = launch(next_index)
+                next_index, pending = next_index + 1, pending + 1
+                continue
+
+            pending -= 1
+            finished.add(index)
+            if not isinstance(reply, ErrorReply):
+                now = time.monotonic()
+                with self._lock:
+                    self._latencies[index].append(elapsed)
+                    # Losers took at least this long; recording that keeps the
+                    # percentile from drifting down to only the fast answers.
+                    for loser, started in enumerate(started_at):
+                        if loser not in finished:
+                            self._latencies[loser].append(now - started)
+                cancel_all(keep=index)
+                return reply
+
+            last_error = reply
+            if next_index < len(self._clients) and not cancelled():
+                hedge_at = launch(next_index)
+                next_index, pending = next_index + 1, pending + 1
+        return last_error
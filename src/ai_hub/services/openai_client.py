@@ -1,12 +1,42 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
+from urllib.parse import urlsplit
 
 import requests
 
 from ..config import OpenAISettings
+from .cancellation import CancelToken, RequestCancelled
+from .http_transport import abort_response, get_transport
+from .rate_limiter import RateLimiter, asend_with_retries, estimate_request_tokens, get_rate_limiter, send_with_retries
+from .response_cache import ResponseCache, make_cache_key
+from .sse import iter_sse_events
+from .telemetry import RequestTrace, error_kind, record_cache_hit
+from .tokens import MESSAGE_OVERHEAD, context_error, count_tokens
+from .usage import openai_usage
+
+
+class ErrorReply(str):
+    """Error text returned in place of a completion.
+
+    It is still a ``str`` so chat views can show it, but paste-back paths
+    check for it so an error never ends up in the user's document.
+    """
+
+
+def collect_stream(chunks: Iterable[str], cancel: CancelToken, label: str = "Request") -> str:
+    """Join streamed deltas into one reply; errors and cancellation become an ``ErrorReply``."""
+    parts: list[str] = []
+    for chunk in chunks:
+        if isinstance(chunk, ErrorReply):
+            return ErrorReply(chunk.strip())
+        parts.append(chunk)
+    if cancel.cancelled:
+        return ErrorReply(f"{label} cancelled.")
+    return "".join(parts)
 
 
 @dataclass(slots=True)
@@ -18,8 +48,17 @@ class Message:
 class OpenAIClient:
     """Thin wrapper around the Chat Completions REST API."""
 
-    def __init__(self, settings: OpenAISettings):
+    def __init__(self, settings: OpenAISettings, cache: Optional[ResponseCache] = None):
         self._settings = settings
+        self._cache = cache
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        return self._cache
+
+    @property
+    def model(self) -> str:
+        return self._settings.model
 
     @staticmethod
     def _build_messages(system: Optional[str], user: str) -> list[Message]:
@@ -29,46 +68,272 @@ class OpenAIClient:
         messages.append(Message("user", user))
         return messages
 
-    def chat(self, system: Optional[str], user: str, temperature: float = 0.2) -> str:
+    def chat(
+        self,
+        system: Optional[str],
+        user: str,
+        temperature: float = 0.2,
+        cancel: Optional[CancelToken] = None,
+    ) -> str:
+        """Return the full completion.
+
+        With a ``cancel`` token the reply is streamed under the hood, so
+        cancelling closes the connection mid-generation and returns an
+        ``ErrorReply`` instead of a stale result.
+        """
+        cache_key = self._cache_key(system, user, temperature)
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                record_cache_hit(self._provider(), self._settings.model, stream=cancel is not None)
+                return cached
         messages = self._build_messages(system, user)
-        return self._request(messages, temperature)
+        if cancel is None:
+            return self._request(messages, temperature, cache_key)
+        trace = RequestTrace(self._provider(), self._settings.model, stream=True)
+        return collect_stream(self._request_stream(messages, temperature, cache_key, trace, cancel), cancel, "OpenAI request")
 
-    def _request(self, messages: Iterable[Message], temperature: float) -> str:
-        if not self._settings.api_key:
-            return "Missing OpenAI API key. Set OPENAI_API_KEY or configure settings.ini."
+    def chat_stream(
+        self,
+        system: Optional[str],
+        user: str,
+        temperature: float = 0.2,
+        cancel: Optional[CancelToken] = None,
+    ) -> Iterator[str]:
+        """Yield the completion as text deltas while it is being generated.
+
+        Cancelling ``cancel`` (or closing the iterator) closes the stream.
+        """
+        cache_key = self._cache_key(system, user, temperature)
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                record_cache_hit(self._provider(), self._settings.model, stream=True)
+                return iter([cached])
+        messages = self._build_messages(system, user)
+        # Traced from here, not from the generator's first step, so the
+        # request keeps the caller's prompt label.
+        trace = RequestTrace(self._provider(), self._settings.model, stream=True)
+        return self._request_stream(messages, temperature, cache_key, trace, cancel)
 
-        payload = {
+    async def achat(self, system: Optional[str], user: str, temperature: float = 0.2) -> str:
+        """Coroutine version of ``chat`` that never blocks the event loop."""
+        cache_key = self._cache_key(system, user, temperature)
+        if cache_key is not None:
+            # The cache is SQLite; a read can wait on the disk or another writer.
+            cached = await asyncio.to_thread(self._cache.get, cache_key)
+            if cached is not None:
+                record_cache_hit(self._provider(), self._settings.model)
+                return cached
+        messages = self._build_messages(system, user)
+        return await self._arequest(messages, temperature, cache_key)
+
+    def _cache_key(self, system: Optional[str], user: str, temperature: float) -> Optional[str]:
+        if self._cache is None or not self._cache.enabled or not ResponseCache.is_cacheable(temperature):
+            return None
+        return make_cache_key(self._settings.endpoint, self._settings.model, system, user, temperature)
+
+    def _provider(self) -> str:
+        return urlsplit(self._settings.endpoint).netloc
+
+    def _rate_limiter(self) -> RateLimiter:
+        return get_rate_limiter(self._provider(), self._settings.model)
+
+    def _payload(self, messages: Iterable[Message], temperature: float) -> dict:
+        # The system prompt stays first and unchanged between calls, so the
+        # provider's automatic prefix cache can reuse it for repeated hotkeys.
+        return {
             "model": self._settings.model,
             "messages": [{"role": msg.role, "content": msg.content} for msg in messages],
             "temperature": temperature,
         }
-        headers = {
+
+    def _stream_payload(self, messages: Iterable[Message], temperature: float) -> dict:
+        payload = self._payload(messages, temperature)
+        payload["stream"] = True
+        if urlsplit(self._settings.endpoint).netloc.endswith("openai.com"):
+            # Only OpenAI is known to accept this; it adds a final chunk with token usage.
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    def _context_error(self, messages: Iterable[Message]) -> Optional[ErrorReply]:
+        """Refuse locally, without a round trip, a prompt the model cannot take."""
+        prompt_tokens = sum(count_tokens(msg.content, self._settings.model) + MESSAGE_OVERHEAD for msg in messages)
+        error = context_error(prompt_tokens, self._settings.model)
+        return ErrorReply(error) if error else None
+
+    def _headers(self) -> dict[str, str]:
+        return {
             "Authorization": f"Bearer {self._settings.api_key}",
             "Content-Type": "application/json",
         }
 
+    def _request(self, messages: Iterable[Message], temperature: float, cache_key: Optional[str] = None) -> str:
+        if not self._settings.api_key:
+            return ErrorReply("Missing OpenAI API key. Set OPENAI_API_KEY or configure settings.ini.")
+        too_long = self._context_error(messages)
+        if too_long is not None:
+            return too_long
+
+        payload = self._payload(messages, temperature)
+        trace = RequestTrace(self._provider(), self._settings.model)
         try:
-            response = requests.post(
-                self._settings.endpoint,
-                headers=headers,
-                json=payload,
-                timeout=self._settings.timeout,
+            response = send_with_retries(
+                self._rate_limiter(),
+                lambda: get_transport().post(
+                    self._settings.endpoint,
+                    headers=self._headers(),
+                    json=payload,
+                    timeout=self._settings.timeout,
+                ),
+                tokens=estimate_request_tokens(payload),
+                on_retry=trace.retried,
             )
+            trace.first_token()
+            trace.received(len(response.content))
             response.raise_for_status()
             data = response.json()
         except requests.RequestException as exc:
-            return f"OpenAI request failed: {exc}"
+            trace.finish(error_kind(exc))
+            return ErrorReply(f"OpenAI request failed: {exc}")
         except json.JSONDecodeError as exc:
-            return f"Unable to parse OpenAI response: {exc}"
+            trace.finish(error_kind(exc))
+            return ErrorReply(f"Unable to parse OpenAI response: {exc}")
+
+        return self._finish(trace, data, cache_key)
 
+    async def _arequest(self, messages: Iterable[Message], temperature: float, cache_key: Optional[str] = None) -> str:
+        if not self._settings.api_key:
+            return ErrorReply("Missing OpenAI API key. Set OPENAI_API_KEY or configure settings.ini.")
+        too_long = self._context_error(messages)
+        if too_long is not None:
+            return too_long
+
+        payload = self._payload(messages, temperature)
+        trace = RequestTrace(self._provider(), self._settings.model)
+        try:
+            response = await asend_with_retries(
+                self._rate_limiter(),
+                lambda: get_transport().apost(
+                    self._settings.endpoint,
+                    headers=self._headers(),
+                    json=payload,
+                    timeout=self._settings.timeout,
+                ),
+                tokens=estimate_request_tokens(payload),
+                on_retry=trace.retried,
+            )
+            trace.first_token()
+            trace.received(len(response.content))
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as exc:
+            trace.finish(error_kind(exc))
+            return ErrorReply(f"OpenAI request failed: {exc}")
+        except json.JSONDecodeError as exc:
+            trace.finish(error_kind(exc))
+            return ErrorReply(f"Unable to parse OpenAI response: {exc}")
+
+        if cache_key is not None:
+            # _finish stores the reply in the cache, off the event loop like the lookup.
+            return await asyncio.to_thread(self._finish, trace, data, cache_key)
+        return self._finish(trace, data, cache_key)
+
+    def _finish(self, trace: RequestTrace, data: dict, cache_key: Optional[str]) -> str:
+        trace.usage(openai_usage(data.get("usage")))
+        reply = self._parse_response(data, cache_key)
+        trace.finish("unexpected response" if isinstance(reply, ErrorReply) else "", reply)
+        return reply
+
+    def _parse_response(self, data: dict, cache_key: Optional[str]) -> str:
         choices = data.get("choices")
         if not choices:
-            return f"Unexpected OpenAI response: {json.dumps(data, indent=2)}"
+            return ErrorReply(f"Unexpected OpenAI response: {json.dumps(data, indent=2)}")
 
         first = choices[0]
         message = first.get("message")
         if isinstance(message, dict) and "content" in message:
-            return str(message["content"])
+            return self._store(cache_key, str(message["content"]))
         if "text" in first:
-            return str(first["text"])
-        return f"Unexpected OpenAI response structure: {json.dumps(first, indent=2)}"
+            return self._store(cache_key, str(first["text"]))
+        return ErrorReply(f"Unexpected OpenAI response structure: {json.dumps(first, indent=2)}")
+
+    def _request_stream(
+        self,
+        messages: Iterable[Message],
+        temperature: float,
+        cache_key: Optional[str],
+        trace: RequestTrace,
+        cancel: Optional[CancelToken] = None,
+    ) -> Iterator[str]:
+        if not self._settings.api_key:
+            yield ErrorReply("Missing OpenAI API key. Set OPENAI_API_KEY or configure settings.ini.")
+            return
+        too_long = self._context_error(messages)
+        if too_long is not None:
+            yield too_long
+            return
+
+        payload = self._stream_payload(messages, temperature)
+        try:
+            response = send_with_retries(
+                self._rate_limiter(),
+                lambda: get_transport().post(
+                    self._settings.endpoint,
+                    headers=self._headers(),
+                    json=payload,
+                    timeout=self._settings.timeout,
+                    stream=True,
+                ),
+                tokens=estimate_request_tokens(payload),
+                cancel=cancel,
+                on_retry=trace.retried,
+            )
+            response.raise_for_status()
+        except RequestCancelled:
+            trace.finish("cancelled")
+            return
+        except requests.RequestException as exc:
+            trace.finish(error_kind(exc))
+            yield ErrorReply(f"OpenAI request failed: {exc}")
+            return
+
+        if cancel is not None:
+            cancel.on_cancel(lambda: abort_response(response))
+        parts: list[str] = []
+        error = ""
+        try:
+            for event in iter_sse_events(trace.count_lines(response.iter_lines())):
+                if event.data == "[DONE]":
+                    self._store(cache_key, "".join(parts))
+                    break
+                data = json.loads(event.data)
+                if data.get("usage"):
+                    trace.usage(openai_usage(data["usage"]))
+                for choice in data.get("choices") or []:
+                    delta = choice.get("delta") or {}
+                    if delta.get("content"):
+                        trace.first_token()
+                        parts.append(str(delta["content"]))
+                        yield parts[-1]
+        except Exception as exc:
+            # A cancelled stream fails with whatever the closed socket raises; stay silent.
+            if cancel is not None and cancel.cancelled:
+                return
+            error = error_kind(exc)
+            if isinstance(exc, requests.RequestException):
+                yield ErrorReply(f"\n\nOpenAI stream interrupted: {exc}")
+            elif isinstance(exc, json.JSONDecodeError):
+                yield ErrorReply(f"\n\nUnable to parse OpenAI stream: {exc}")
+            else:
+                raise
+        finally:
+            response.close()
+            if cancel is not None and cancel.cancelled:
+                error = "cancelled"
+            trace.finish(error, "".join(parts))
+
+    def _store(self, cache_key: Optional[str], text: str) -> str:
+        if cache_key is not None and text.strip():
+            self._cache.put(cache_key, text)
+        return text
@@ -12,6 +12,7 @@ class Prompt:
     suffix: str
     replace: bool
     temperature: float = 0.2
+    edit_list: bool = False  # long text may be answered with an edit list (see services.edit_list)
 
     def build_message(self, text: str) -> str:
         return f"{self.prefix}{text}{self.suffix}"
@@ -26,6 +27,7 @@ def default_prompts() -> Sequence[Prompt]:
             suffix="",
             replace=True,
             temperature=0.0,
+            edit_list=True,
         ),
         Prompt(
             name="Rewrite for clarity",
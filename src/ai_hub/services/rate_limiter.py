@@ -0,0 +1,299 @@
+"""Client-side rate limiting and 429-aware retries shared by every provider."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Mapping, Optional
+
+import requests
+
+from ..config import RateLimitSettings
+from .cancellation import CancelToken, RequestCancelled
+from .tokens import MESSAGE_OVERHEAD, count_tokens
+
+
+RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of refusing requests.
+
+    ``reserve`` always takes the tokens and returns how long the caller must
+    wait for them, so concurrent callers queue up in arrival order rather
+    than failing. A rate of 0 disables the bucket.
+    """
+
+    def __init__(self, per_minute: float):
+        self._rate = per_minute / 60.0
+        self._capacity = float(per_minute)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        if self._rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= min(amount, self._capacity)
+            return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    def drain(self) -> None:
+        """Mark the bucket empty, e.g. when the server says the budget is spent."""
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = time.monotonic()
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budget for one provider/model."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve one request plus ``tokens``; return the seconds to wait before sending."""
+        wait = max(self._requests.reserve(1), self._tokens.reserve(tokens))
+        with self._lock:
+            return max(wait, self._blocked_until - time.monotonic())
+
+    def acquire(self, tokens: int = 0, cancel: Optional[CancelToken] = None) -> None:
+        _sleep(self.reserve(tokens), cancel)
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every queued request for ``seconds`` (used after a 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Sync with the server's ``x-ratelimit-*`` / ``anthropic-ratelimit-*`` headers."""
+        for prefix in ("x-ratelimit", "anthropic-ratelimit"):
+            for kind, bucket in (("requests", self._requests), ("tokens", self._tokens)):
+                remaining = headers.get(f"{prefix}-remaining-{kind}")
+                if remaining is None or not remaining.strip().isdigit() or int(remaining) > 0:
+                    continue
+                bucket.drain()
+                reset = parse_reset(headers.get(f"{prefix}-reset-{kind}"))
+                if reset:
+                    self.pause(reset)
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Seconds until reset from ``6m0s`` / ``1.5s`` / ``120ms`` durations or RFC 3339 timestamps."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        pass
+
+    total, number = 0.0, ""
+    units = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char.isdigit() or char == ".":
+            number += char
+            i += 1
+            continue
+        unit = "ms" if value.startswith("ms", i) else char
+        if unit not in units or not number:
+            return None
+        total += float(number) * units[unit]
+        number = ""
+        i += len(unit)
+    if number:
+        total += float(number)
+    return total
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Server-requested delay from ``retry-after-ms`` or ``Retry-After`` (seconds or HTTP date)."""
+    retry_ms = headers.get("retry-after-ms")
+    if retry_ms:
+        try:
+            return float(retry_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def estimate_request_tokens(payload: Mapping[str, Any]) -> int:
+    """Token count of a request body (prompt plus ``max_tokens``) for the tokens-per-minute budget."""
+    model = payload.get("model")
+    system = payload.get("system") or ""
+    if not isinstance(system, str):
+        system = "".join(block.get("text", "") for block in system)
+    total = count_tokens(system, model)
+    for message in payload.get("messages") or ():
+        content = message.get("content", "")
+        if not isinstance(content, str):
+            content = json.dumps(content, ensure_ascii=False)
+        total += count_tokens(content, model) + MESSAGE_OVERHEAD
+    return total + int(payload.get("max_tokens", 0) or 0)
+
+
+_settings = RateLimitSettings()
+_limiters: dict[tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def configure_rate_limits(settings: RateLimitSettings) -> None:
+    global _settings
+    with _limiters_lock:
+        _settings = settings
+        _limiters.clear()
+
+
+def get_rate_limiter(provider: str, model: str) -> RateLimiter:
+    """Shared limiter for ``provider``/``model``; created on first use."""
+    key = (provider, model)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(_settings.requests_per_minute, _settings.tokens_per_minute)
+            _limiters[key] = limiter
+        return limiter
+
+
+def _sleep(seconds: float, cancel: Optional[CancelToken]) -> None:
+    if seconds <= 0:
+        return
+    if cancel is None:
+        time.sleep(seconds)
+    elif cancel.wait(seconds):
+        raise RequestCancelled()
+
+
+def _next_delay(response: Any, limiter: RateLimiter, attempt: int) -> float:
+    delay = retry_after_seconds(response.headers)
+    if delay is None:
+        delay = backoff_delay(attempt, cap=_settings.max_backoff)
+    else:
+        delay = min(delay, _settings.max_backoff) + random.uniform(0, 0.25)
+    if response.status_code == 429:
+        limiter.pause(delay)
+    return delay
+
+
+def send_with_retries(
+    limiter: RateLimiter,
+    send: Callable[[], Any],
+    *,
+    tokens: int = 0,
+    cancel: Optional[CancelToken] = None,
+    max_retries: Optional[int] = None,
+    on_retry: Optional[Callable[[], None]] = None,
+) -> Any:
+    """Call ``send`` under ``limiter``, retrying 429s, 5xx and dropped connections.
+
+    Returns the last response; callers still ``raise_for_status`` so a
+    request that exhausts its retries surfaces as before. ``tokens`` are
+    taken from the budget once, not again on every retry. Waiting for the
+    limiter or a backoff raises ``RequestCancelled`` as soon as ``cancel`` fires.
+    ``max_retries`` overrides the configured limit for this call; ``on_retry``
+    is called before each retry (e.g. to count them for telemetry).
+    """
+    retries = _settings.max_retries if max_retries is None else max_retries
+    attempt = 0
+    while True:
+        # The prompt's tokens are reserved once; a retry only needs another request slot.
+        limiter.acquire(tokens if attempt == 0 else 0, cancel)
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        try:
+            response = send()
+        except requests.ConnectionError:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            if attempt >= retries:
+                raise
+            _sleep(backoff_delay(attempt, cap=_settings.max_backoff), cancel)
+            attempt += 1
+            if on_retry is not None:
+                on_retry()
+            continue
+
+        limiter.update_from_headers(response.headers)
+        if response.status_code not in RETRYABLE_STATUS or attempt >= retries:
+            return response
+        delay = _next_delay(response, limiter, attempt)
+        response.close()
+        if response.status_code != 429:
+            _sleep(delay, cancel)
+        attempt += 1
+        if on_retry is not None:
+            on_retry()
+
+
+async def asend_with_retries(
+    limiter: RateLimiter,
+    send: Callable[[], Awaitable[Any]],
+    *,
+    tokens: int = 0,
+    max_retries: Optional[int] = None,
+    on_retry: Optional[Callable[[], None]] = None,
+) -> Any:
+    """Coroutine counterpart of ``send_with_retries``."""
+    retries = _settings.max_retries if max_retries is None else max_retries
+    attempt = 0
+    while True:
+        await limiter.acquire_async(tokens if attempt == 0 else 0)
+        try:
+            response = await send()
+        except requests.ConnectionError:
+            if attempt >= retries:
+                raise
+            await asyncio.sleep(backoff_delay(attempt, cap=_settings.max_backoff))
+            attempt += 1
+            if on_retry is not None:
+                on_retry()
+            continue
+
+        limiter.update_from_headers(response.headers)
+        if response.status_code not in RETRYABLE_STATUS or attempt >= retries:
+            return response
+        delay = _next_delay(response, limiter, attempt)
+        aclose = getattr(response, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        else:
+            response.close()  # a requests.Response from the thread fallback
+        if response.status_code != 429:
+            await asyncio.sleep(delay)
+        attempt += 1
+        if on_retry is not None:
+            on_retry()
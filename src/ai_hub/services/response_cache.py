@@ -0,0 +1,175 @@
+"""Two-tier (memory LRU + SQLite) cache for deterministic chat responses."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Optional
+
+from ..config import CacheSettings
+
+
+@dataclass(slots=True)
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def make_cache_key(endpoint: str, model: str, system: Optional[str], message: str, temperature: float) -> str:
+    """Stable key for one request; any change to the inputs yields a new key."""
+    raw = json.dumps([endpoint, model, system or "", message, round(temperature, 4)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Caches chat replies for temperature-0 requests.
+
+    Lookups hit an in-memory LRU first and fall back to an SQLite file, so
+    answers survive restarts. Entries expire after ``ttl`` seconds and the
+    least recently used rows are evicted once ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, settings: Optional[CacheSettings] = None):
+        self._settings = settings or CacheSettings()
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self._db: Optional[sqlite3.Connection] = None
+        if self._settings.enabled and self._settings.path:
+            self._db = self._open_db(Path(self._settings.path))
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.enabled
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return replace(self._stats)
+
+    @staticmethod
+    def is_cacheable(temperature: float) -> bool:
+        return temperature == 0.0
+
+    def get(self, key: str) -> Optional[str]:
+        if not self._settings.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at <= self._settings.ttl:
+                    self._memory.move_to_end(key)
+                    self._stats.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            value = self._db_get(key, now)
+            if value is None:
+                self._stats.misses += 1
+                return None
+            self._stats.disk_hits += 1
+            self._remember(key, value[0], value[1])
+            return value[0]
+
+    def put(self, key: str, value: str) -> None:
+        if not self._settings.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self._stats.stores += 1
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                        (key, value, now, now),
+                    )
+                    self._evict(now)
+                    self._db.commit()
+                except sqlite3.Error as exc:
+                    print(f"⚠️ Response cache write failed: {exc}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._settings.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _db_get(self, key: str, now: float) -> Optional[tuple[str, float]]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self._settings.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            return row[0], row[1]
+        except sqlite3.Error as exc:
+            print(f"⚠️ Response cache read failed: {exc}")
+            return None
+
+    def _evict(self, now: float) -> None:
+        expired = self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self._settings.ttl,)).rowcount
+        (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self._settings.max_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+        self._stats.evictions += max(expired, 0) + max(overflow, 0)
+
+    @staticmethod
+    def _open_db(path: Path) -> Optional[sqlite3.Connection]:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            db.commit()
+            return db
+        except sqlite3.Error as exc:
+            print(f"⚠️ Response cache disabled on disk: {exc}")
+            return None
@@ -1,26 +1,31 @@
+"""Reading the selection from, and pasting text into, the focused application.
+
+Everything that copies or pastes on the user's behalf goes through here, so
+it all shares one capture/restore algorithm on top of the configured
+keyboard and clipboard drivers (``backends``):
+
+* capture: snapshot the clipboard, clear it, send Ctrl+C and read the
+  clipboard as soon as it changes (``clipboard_watch``), then put the
+  user's clipboard back;
+* paste: snapshot the clipboard, put the text on it, send Ctrl+V, and
+  restore the user's clipboard only once the application has had time to
+  read it (a few times its learned copy delay), and only if nobody has
+  copied something else in the meantime.
+
+Snapshots keep images, HTML and RTF where the driver can, and are put back
+in the background (``clipboard_snapshot``), so neither path waits for it.
+"""
+
 from __future__ import annotations
 
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass
+from typing import Optional
 
-try:
-    import win32clipboard as wcb
-    import win32con
-    HAVE_WIN32 = True
-except Exception:  # pragma: no cover - fallback on non-Windows
-    HAVE_WIN32 = False
-
-try:
-    import pyperclip
-    HAVE_PYPERCLIP = True
-except Exception:  # pragma: no cover - optional dependency
-    HAVE_PYPERCLIP = False
-
-try:
-    import keyboard
-except ImportError as exc:  # pragma: no cover
-    raise RuntimeError("The 'keyboard' package is required for selection helpers.") from exc
+from .backends import KeyboardBackend, get_clipboard, get_keyboard
+from .clipboard_snapshot import get_snapshots
+from .clipboard_watch import foreground_app, get_clipboard_watcher
 
 
 @dataclass(slots=True)
@@ -30,91 +35,86 @@ class SelectionResult:
 
 @contextmanager
 def _preserve_clipboard():
-    original = ""
-    if HAVE_WIN32:
-        try:
-            wcb.OpenClipboard()
-            if wcb.IsClipboardFormatAvailable(win32con.CF_UNICODETEXT):
-                original = wcb.GetClipboardData(win32con.CF_UNICODETEXT)
-        finally:
-            wcb.CloseClipboard()
-    elif HAVE_PYPERCLIP:
-        original = pyperclip.paste()
-
+    snapshots = get_snapshots()
+    snapshots.wait_restored()
+    original = snapshots.take()
     try:
         yield
     finally:
-        if HAVE_WIN32:
-            try:
-                wcb.OpenClipboard()
-                wcb.EmptyClipboard()
-                wcb.SetClipboardText(original)
-            finally:
-                wcb.CloseClipboard()
-        elif HAVE_PYPERCLIP:
-            pyperclip.copy(original)
+        snapshots.restore_later(original, get_clipboard_watcher().mark())
 
 
 def _clear_clipboard():
-    if HAVE_WIN32:
-        try:
-            wcb.OpenClipboard()
-            wcb.EmptyClipboard()
-        finally:
-            wcb.CloseClipboard()
-    elif HAVE_PYPERCLIP:
-        pyperclip.copy("")
+    get_clipboard().clear()
 
 
 def _read_clipboard_text() -> str:
-    if HAVE_WIN32:
-        try:
-            wcb.OpenClipboard()
-            if wcb.IsClipboardFormatAvailable(win32con.CF_UNICODETEXT):
-                return wcb.GetClipboardData(win32con.CF_UNICODETEXT)
-        finally:
-            wcb.CloseClipboard()
-        return ""
-    if HAVE_PYPERCLIP:
-        return pyperclip.paste()
-    return ""
-
-
-def get_selection() -> SelectionResult:
+    return get_clipboard().get_text()
+
+
+def _copy(keys: KeyboardBackend, app: str, patient: bool = False) -> Optional[str]:
+    """Send Ctrl+C and return the clipboard once the application has updated it; ``None`` if it did not.
+
+    The wait is normally cut short at a few times ``app``'s learned copy
+    delay. With ``patient`` a copy that has not landed by then is given the
+    rest of the configured ``copy_timeout``.
+    """
+    watcher = get_clipboard_watcher()
+    mark = watcher.mark()
+    started = time.perf_counter()
+    keys.send("ctrl+c")
+    if not watcher.wait_for_change(mark, app=app):
+        remaining = watcher.copy_timeout - (time.perf_counter() - started)
+        # A copy landing now is recorded with its real delay, so the learned timeout grows.
+        if not patient or remaining <= 0 or not watcher.wait_for_change(mark, remaining, app, since=started):
+            return None
+    return _read_clipboard_text()
+
+
+def get_selection(select_all_fallback: bool = True) -> SelectionResult:
+    """The selected text; with nothing selected, the whole field if ``select_all_fallback``.
+
+    Select-all is only sent once the copy landed empty, or nothing landed
+    within the full ``copy_timeout``. After a learned timeout alone the copy
+    may still be on its way; it could then be read back in place of the
+    select-all copy, and a paste-back would replace the whole field.
+    """
+    keys = get_keyboard()
+    app = foreground_app()
     with _preserve_clipboard():
         _clear_clipboard()
-        keyboard.send("ctrl+c")
-        time.sleep(0.08)
-        text = _read_clipboard_text()
-        if text.strip():
-            return SelectionResult(text)
+        text = _copy(keys, app, patient=select_all_fallback)
+        if (text is not None and text.strip()) or not select_all_fallback:
+            return SelectionResult(text or "")
 
-        keyboard.send("ctrl+a")
-        time.sleep(0.06)
-        keyboard.send("ctrl+c")
-        time.sleep(0.08)
-        text = _read_clipboard_text()
-        return SelectionResult(text)
+        # No wait needed in between: the application handles its keys in order.
+        keys.send("ctrl+a")
+        text = _copy(keys, app)
+        return SelectionResult(text or "")
 
 
-def replace_selection(text: str) -> None:
+def select_all_text() -> str:
+    """Select everything in the focused field and return it."""
+    keys = get_keyboard()
     with _preserve_clipboard():
-        if HAVE_WIN32:
-            wcb.OpenClipboard()
-            wcb.EmptyClipboard()
-            wcb.SetClipboardText(text)
-            wcb.CloseClipboard()
-        elif HAVE_PYPERCLIP:
-            pyperclip.copy(text)
-        keyboard.send("ctrl+v")
-        time.sleep(0.04)
+        _clear_clipboard()
+        keys.send("ctrl+a")
+        return _copy(keys, foreground_app()) or ""
+
+
+def replace_selection(text: str) -> None:
+    """Paste ``text`` over the selection; the user's clipboard comes back once the paste has settled."""
+    watcher = get_clipboard_watcher()
+    snapshots = get_snapshots()
+    snapshots.wait_restored()
+    original = snapshots.take()
+    get_clipboard().set_text(text)
+    pasted = watcher.mark()
+    get_keyboard().send("ctrl+v")
+    # The application reads the clipboard when it gets to the Ctrl+V, not when it is sent.
+    snapshots.restore_later(original, pasted, delay=watcher.paste_settle(foreground_app()))
 
 
 def copy_to_clipboard(text: str) -> None:
-    if HAVE_WIN32:
-        wcb.OpenClipboard()
-        wcb.EmptyClipboard()
-        wcb.SetClipboardText(text)
-        wcb.CloseClipboard()
-    elif HAVE_PYPERCLIP:
-        pyperclip.copy(text)
+    get_snapshots().wait_restored()
+    get_clipboard().set_text(text)
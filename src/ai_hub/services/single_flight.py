@@ -0,0 +1,87 @@
+"""Coalesces duplicate in-flight requests, e.g. from a double-tapped hotkey."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+from .cancellation import CancelToken, get_paste_scope
+
+
+T = TypeVar("T")
+
+
+def flight_key(prompt_id: str, selection: str) -> tuple[str, str]:
+    """Key identifying one prompt run against one selection."""
+    return prompt_id, hashlib.sha256(selection.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time.
+
+    The first caller for a key (the leader) executes the work; callers that
+    arrive while it is still running wait on the same future and receive its
+    result instead of starting a second request. Once the call finishes the
+    key is released, so a later, deliberate re-run goes through normally.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[Hashable, Future[Any]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Return ``(result, is_leader)``; only the leader should act on the result."""
+        with self._lock:
+            future = self._pending.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._pending[key] = future
+        if not leader:
+            return future.result(), False
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._release(key)
+            future.set_exception(exc)
+            raise
+        self._release(key)
+        future.set_result(result)
+        return result, True
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._pending
+
+    def _release(self, key: Hashable) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+
+
+_flights = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide group shared by hotkeys, hotstrings and the prompt navigator."""
+    return _flights
+
+
+def run_paste_request(key: Hashable, request: Callable[[CancelToken], T]) -> Optional[T]:
+    """Run a request whose result will be pasted over the selection.
+
+    Duplicates of the live request attach to it; any other live paste
+    request is cancelled first. Returns ``None`` when the caller must not
+    paste: it was a duplicate, or it was cancelled by a newer request.
+    """
+    scope = get_paste_scope()
+    cancel = scope.begin(key)
+    try:
+        output, leader = _flights.do(key, lambda: request(cancel))
+    finally:
+        scope.finish(cancel)
+    if not leader or cancel.cancelled:
+        return None
+    return output
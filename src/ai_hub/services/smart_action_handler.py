@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
 import subprocess
-from typing import Callable
-
-from .openai_client import OpenAIClient
+from typing import Callable, Optional
+
+from ..config import ChunkingSettings
+from .backends import get_keyboard
+from .chunking import TextChunk, map_chunks, split_text
+from .http_transport import get_transport
+from .openai_client import ErrorReply, OpenAIClient
+from .telemetry import prompt_label
 from .text_selector import TextSelector
+from .tokens import max_rewrite_input
 
 
 class SmartActionHandler:
     """Handles your specific workflow: select all → rewrite → paste back."""
 
-    def __init__(self, client: OpenAIClient):
+    def __init__(self, client: OpenAIClient, chunking: Optional[ChunkingSettings] = None):
         self._client = client
+        self._chunking = chunking or ChunkingSettings()
         self._text_selector = TextSelector()
 
     def rewrite_all_in_window(self, on_progress: Callable[[str], None] = None) -> bool:
@@ -47,9 +55,12 @@ Fix any grammatical issues.
 Improve sentence structure for clarity.
 Return ONLY the rewritten text, nothing else."""
 
-            rewritten_text = self._client.chat(
-                system=rewrite_prompt, user=text, temperature=0.3
-            )
+            rewritten_text = self._rewrite(rewrite_prompt, text, on_progress)
+
+            if isinstance(rewritten_text, ErrorReply):
+                if on_progress:
+                    on_progress(f"Error: {rewritten_text.strip()}")
+                return False
 
             if on_progress:
                 on_progress("Pasting back to window...")
@@ -104,9 +115,15 @@ Return ONLY the rewritten text, nothing else."""
             if on_progress:
                 on_progress(f"Executing prompt...")
 
-            result = self._client.chat(
-                system=prompt.get("prompt", ""), user=text, temperature=0.2
-            )
+            with prompt_label(prompt.get("name", "Smart action")):
+                result = self._client.chat(
+                    system=prompt.get("prompt", ""), user=text, temperature=0.2
+                )
+
+            if isinstance(result, ErrorReply):
+                if on_progress:
+                    on_progress(f"Error: {result.strip()}")
+                return False, ""
 
             if on_progress:
                 on_progress("Done!")
@@ -118,6 +135,38 @@ Return ONLY the rewritten text, nothing else."""
                 on_progress(f"Error: {str(e)}")
             return False, ""
 
+    def _rewrite(self, system: str, text: str, on_progress: Callable[[str], None] = None) -> str:
+        """
+        Rewrite text in one request, or section by section when it is too large.
+        Sections are rewritten concurrently and stitched back in order, and
+        are never larger than the model can rewrite in one reply.
+        """
+        max_tokens = min(self._chunking.max_chunk_tokens, max_rewrite_input(self._client.model, system))
+        chunks = split_text(text, max_tokens)
+        with prompt_label("Smart rewrite"):
+            if len(chunks) == 1:
+                return self._client.chat(system=system, user=text, temperature=0.3)
+
+            if on_progress:
+                on_progress(f"Rewriting {len(chunks)} sections, {self._chunking.concurrency} at a time...")
+            return asyncio.run(self._rewrite_chunks(system, chunks))
+
+    async def _rewrite_chunks(self, system: str, chunks: list[TextChunk]) -> str:
+        section_system = f"{system}\nThe text is one section of a longer document: rewrite only this section."
+        try:
+            results = await map_chunks(
+                chunks,
+                lambda body: self._client.achat(section_system, body, temperature=0.3),
+                self._chunking.concurrency,
+            )
+        finally:
+            await get_transport().aclose()
+
+        for result in results:
+            if isinstance(result, ErrorReply):
+                return result
+        return "".join(chunk.wrap(result) for chunk, result in zip(chunks, results))
+
     @staticmethod
     def _paste_to_notepad(text: str) -> bool:
         """
@@ -137,12 +186,7 @@ Return ONLY the rewritten text, nothing else."""
             time.sleep(0.5)
 
             # Paste (Ctrl+V)
-            import pynput.keyboard as keyboard
-
-            controller = keyboard.Controller()
-            with controller.pressed(keyboard.Key.ctrl):
-                controller.press(keyboard.Key.v)
-                controller.release(keyboard.Key.v)
+            get_keyboard().send("ctrl+v")
 
             return True
         except Exception as e:
@@ -0,0 +1,168 @@
+"""Speculative execution of the prompt the user is most likely to pick.
+
+When the prompt navigator opens, the prompt picked most often so far is
+started against the selection straight away. Its reply is buffered; if the
+user then picks that prompt the buffered text is replayed and the stream
+continues live, otherwise the speculative request is cancelled.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Hashable, Iterator, Optional, Sequence
+
+from .cancellation import CancelToken
+from .edit_list import run_prompt
+from .openai_client import ErrorReply, OpenAIClient, collect_stream
+from .prompt_manager import Prompt
+from .single_flight import flight_key
+from .telemetry import prompt_label
+
+
+class PromptHistory:
+    """How often, and how recently, each prompt was picked; persisted as JSON."""
+
+    def __init__(self, path: str | Path):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._picks: dict[str, dict[str, float]] = {}
+        if self._path.exists():
+            try:
+                with open(self._path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._picks = data if isinstance(data, dict) else {}
+            except Exception as e:
+                print(f"⚠️ Could not load prompt history: {e}")
+
+    def record(self, name: str) -> None:
+        with self._lock:
+            entry = self._picks.setdefault(name, {"count": 0, "last": 0.0})
+            entry["count"] = int(entry.get("count", 0)) + 1
+            entry["last"] = time.time()
+            picks = json.dumps(self._picks, indent=2)
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._path.write_text(picks, encoding="utf-8")
+        except Exception as e:
+            print(f"⚠️ Could not save prompt history: {e}")
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return int(self._picks.get(name, {}).get("count", 0))
+
+    def ranked(self, names: Sequence[str]) -> list[str]:
+        """``names`` ordered by pick count, then by last pick; unpicked names keep their order."""
+        with self._lock:
+            picks = {name: self._picks.get(name, {}) for name in names}
+        return sorted(names, key=lambda name: (-int(picks[name].get("count", 0)), -float(picks[name].get("last", 0.0))))
+
+
+class SpeculativeRequest:
+    """A streamed request started before anyone asked for it; its chunks are kept for replay."""
+
+    def __init__(self, key: Hashable, start: Callable[[CancelToken], Iterator[str]]):
+        self.key = key
+        self.cancel = CancelToken()
+        self._chunks: list[str] = []
+        self._done = False
+        self._cond = threading.Condition()
+        self.cancel.on_cancel(self._finish)
+        threading.Thread(target=self._run, args=(start,), daemon=True).start()
+
+    def _run(self, start: Callable[[CancelToken], Iterator[str]]) -> None:
+        try:
+            for chunk in start(self.cancel):
+                with self._cond:
+                    if self._done:
+                        return
+                    self._chunks.append(chunk)
+                    self._cond.notify_all()
+        except Exception as exc:
+            with self._cond:
+                self._chunks.append(ErrorReply(f"Request failed: {exc}"))
+        finally:
+            self._finish()
+
+    def _finish(self) -> None:
+        with self._cond:
+            self._done = True
+            self._cond.notify_all()
+
+    def stream(self) -> Iterator[str]:
+        """Everything received so far, then the rest as it arrives."""
+        index = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: index < len(self._chunks) or self._done)
+                chunks = self._chunks[index:]
+                done = self._done
+            index += len(chunks)
+            yield from chunks
+            if done and index >= len(self._chunks):
+                return
+
+    def result(self) -> str:
+        """The full reply, or an ``ErrorReply`` if it failed or was cancelled."""
+        return collect_stream(self.stream(), self.cancel, "Speculative request")
+
+
+class Speculator:
+    """Runs at most one speculative prompt and hands it over when the user picks it."""
+
+    def __init__(self, client: OpenAIClient, history: PromptHistory, min_picks: int = 3):
+        self._client = client
+        self._history = history
+        self._min_picks = min_picks
+        self._lock = threading.Lock()
+        self._pending: Optional[SpeculativeRequest] = None
+
+    @property
+    def history(self) -> PromptHistory:
+        return self._history
+
+    def likely(self, prompts: Sequence[Prompt]) -> Optional[Prompt]:
+        """The prompt picked most often, if it was picked at least ``min_picks`` times."""
+        if not prompts:
+            return None
+        by_name = {prompt.name: prompt for prompt in prompts}
+        top = self._history.ranked(list(by_name))[0]
+        return by_name[top] if self._history.count(top) >= self._min_picks else None
+
+    def start(self, prompts: Sequence[Prompt], selection: str) -> Optional[Prompt]:
+        """Cancel any pending speculation and start the likeliest prompt; returns it."""
+        self.cancel()
+        prompt = self.likely(prompts)
+        if prompt is None or not selection.strip():
+            return None
+        if prompt.replace:
+            # Pasted prompts are read whole, so they can use an edit-list reply.
+            start = lambda cancel: iter([run_prompt(self._client, prompt, selection, cancel)])
+        else:
+            def start(cancel: CancelToken) -> Iterator[str]:
+                with prompt_label(prompt.name):
+                    return self._client.chat_stream(prompt.system or None, prompt.build_message(selection), prompt.temperature, cancel)
+        request = SpeculativeRequest(flight_key(prompt.name, selection), start)
+        with self._lock:
+            self._pending = request
+        print(f"🔮 Speculatively running '{prompt.name}'")
+        return prompt
+
+    def take(self, prompt: Prompt, selection: str) -> Optional[SpeculativeRequest]:
+        """The pending request if it is ``prompt`` on ``selection``; otherwise cancel it."""
+        with self._lock:
+            request, self._pending = self._pending, None
+        if request is None:
+            return None
+        if request.key == flight_key(prompt.name, selection) and not request.cancel.cancelled:
+            return request
+        request.cancel.cancel()
+        return None
+
+    def cancel(self) -> None:
+        with self._lock:
+            request, self._pending = self._pending, None
+        if request is not None:
+            request.cancel.cancel()
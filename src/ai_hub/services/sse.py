@@ -0,0 +1,37 @@
+"""Minimal Server-Sent Events parser for streaming chat responses."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+
+@dataclass(slots=True)
+class SSEEvent:
+    event: str
+    data: str
+
+
+def iter_sse_events(lines: Iterable[bytes | str]) -> Iterator[SSEEvent]:
+    """Group raw response lines into events, following the SSE wire format."""
+    event = "message"
+    data: list[str] = []
+    for raw in lines:
+        line = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        line = line.rstrip("\r")
+        if not line:
+            if data:
+                yield SSEEvent(event, "\n".join(data))
+            event, data = "message", []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+    if data:
+        yield SSEEvent(event, "\n".join(data))
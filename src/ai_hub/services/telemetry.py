@@ -0,0 +1,253 @@
+"""Per-request telemetry for every LLM call.
+
+Each call is timed by a ``RequestTrace``: time to first token, total
+latency, retries, bytes received, token usage, response-cache hits and the
+kind of error, if any. Finished records go to an in-memory ring buffer
+(read by the Settings tab) and, when configured, to a size-rotated JSONL
+file for offline analysis. The file is written by a background thread so a
+request (often running on the asyncio loop) never waits on the disk.
+
+The prompt a call belongs to is taken from ``prompt_label``, set by the
+code that runs the prompt, so the clients themselves stay prompt-agnostic.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from ..config import TelemetrySettings
+from .tokens import count_tokens
+from .usage import record_usage
+
+
+_prompt: contextvars.ContextVar[str] = contextvars.ContextVar("ai_hub_prompt", default="")
+
+
+@contextmanager
+def prompt_label(name: str) -> Iterator[None]:
+    """Attribute the LLM calls made inside this block (on this thread) to prompt ``name``."""
+    token = _prompt.set(name)
+    try:
+        yield
+    finally:
+        _prompt.reset(token)
+
+
+@dataclass(slots=True)
+class RequestRecord:
+    provider: str
+    model: str
+    prompt: str = ""
+    stream: bool = False
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    ttft: Optional[float] = None  # seconds to the first token (streams) or to the whole reply
+    latency: float = 0.0
+    retries: int = 0
+    cache_hit: bool = False       # answered from the local response cache, no request made
+    bytes_received: int = 0
+    error: str = ""               # "" on success, else e.g. "HTTP 429", "ConnectionError", "cancelled"
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def tokens_per_sec(self) -> float:
+        """Generation speed: after the first token for streams, over the whole call otherwise."""
+        generating = self.latency - (self.ttft or 0.0) if self.stream else self.latency
+        return self.output_tokens / generating if self.output_tokens and generating > 0 else 0.0
+
+
+@dataclass(slots=True)
+class LatencySummary:
+    prompt: str
+    provider: str
+    count: int
+    errors: int
+    cache_hits: int
+    latency_p50: float
+    latency_p95: float
+    ttft_p50: float
+    tokens_per_sec: float
+
+
+def error_kind(exc: BaseException) -> str:
+    """Short, groupable description of why a request failed."""
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    return f"HTTP {status}" if status else type(exc).__name__
+
+
+class RequestTrace:
+    """Times one request; clients report progress and call ``finish`` exactly once."""
+
+    def __init__(self, provider: str, model: str, stream: bool = False):
+        self.record = RequestRecord(provider, model, _prompt.get(), stream)
+        self._started = time.perf_counter()
+        self._finished = False
+
+    def first_token(self) -> None:
+        if self.record.ttft is None:
+            self.record.ttft = time.perf_counter() - self._started
+
+    def retried(self) -> None:
+        self.record.retries += 1
+
+    def received(self, size: int) -> None:
+        self.record.bytes_received += size
+
+    def count_lines(self, lines: Iterable[bytes | str]) -> Iterator[bytes | str]:
+        """Pass ``lines`` through, counting their size."""
+        for line in lines:
+            self.record.bytes_received += len(line) + 1
+            yield line
+
+    def usage(self, tokens: tuple[int, int, int]) -> None:
+        """``(prompt, cached, output)`` tokens as reported by the server."""
+        self.record.prompt_tokens, self.record.cached_tokens, self.record.output_tokens = tokens
+
+    def finish(self, error: str = "", output: Optional[str] = None) -> None:
+        """Record the request. ``output`` lets the output tokens be counted locally if the server did not."""
+        if self._finished:
+            return
+        self._finished = True
+        record = self.record
+        record.latency = time.perf_counter() - self._started
+        record.error = error
+        if not record.output_tokens and output:
+            record.output_tokens = count_tokens(output, record.model)
+        record_usage(record.provider, record.model,
+                     (record.prompt_tokens, record.cached_tokens, record.output_tokens), record.latency)
+        _telemetry.record(record)
+
+
+def record_cache_hit(provider: str, model: str, stream: bool = False) -> None:
+    """Record a reply served from the local response cache."""
+    record = RequestRecord(provider, model, _prompt.get(), stream, ttft=0.0, cache_hit=True)
+    _telemetry.record(record)
+
+
+def _percentile(samples: list[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+class Telemetry:
+    """Ring buffer of recent request records, mirrored to a rotating JSONL file."""
+
+    def __init__(self, settings: Optional[TelemetrySettings] = None):
+        self._settings = settings or TelemetrySettings()
+        self._records: deque[RequestRecord] = deque(maxlen=max(1, self._settings.buffer_size))
+        self._lock = threading.Lock()
+        self._path = Path(self._settings.path) if self._settings.path else None
+        self._pending: queue.SimpleQueue[RequestRecord] = queue.SimpleQueue()
+        self._unwritten = 0
+        self._written = threading.Condition(self._lock)
+        self._writer: Optional[threading.Thread] = None
+
+    @property
+    def settings(self) -> TelemetrySettings:
+        return self._settings
+
+    def record(self, record: RequestRecord) -> None:
+        if not self._settings.enabled:
+            return
+        with self._lock:
+            self._records.append(record)
+            if self._path is None:
+                return
+            self._unwritten += 1
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._drain, name="ai-hub-telemetry", daemon=True)
+                self._writer.start()
+        self._pending.put(record)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued record is on disk; False if ``timeout`` ran out first."""
+        with self._written:
+            return self._written.wait_for(lambda: self._unwritten == 0, timeout)
+
+    def recent(self) -> list[RequestRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def summary(self) -> list[LatencySummary]:
+        """Rolling latency per prompt and provider over the records in the buffer, slowest p95 first."""
+        groups: dict[tuple[str, str], list[RequestRecord]] = {}
+        for record in self.recent():
+            groups.setdefault((record.prompt, record.provider), []).append(record)
+        rows = []
+        for (prompt, provider), records in groups.items():
+            answered = [r for r in records if not r.error and not r.cache_hit]
+            speeds = [r.tokens_per_sec for r in answered if r.tokens_per_sec]
+            rows.append(LatencySummary(
+                prompt=prompt,
+                provider=provider,
+                count=len(records),
+                errors=sum(1 for r in records if r.error),
+                cache_hits=sum(1 for r in records if r.cache_hit),
+                latency_p50=_percentile([r.latency for r in answered], 0.50),
+                latency_p95=_percentile([r.latency for r in answered], 0.95),
+                ttft_p50=_percentile([r.ttft for r in answered if r.ttft is not None], 0.50),
+                tokens_per_sec=sum(speeds) / len(speeds) if speeds else 0.0,
+            ))
+        rows.sort(key=lambda row: row.latency_p95, reverse=True)
+        return rows
+
+    def _drain(self) -> None:
+        while True:
+            record = self._pending.get()
+            if self._path is not None:
+                self._write(json.dumps(asdict(record), separators=(",", ":")) + "\n")
+            with self._written:
+                self._unwritten -= 1
+                self._written.notify_all()
+
+    def _write(self, line: str) -> None:
+        try:
+            path = self._path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists() and path.stat().st_size + len(line) > self._settings.max_bytes:
+                self._rotate(path)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            print(f"⚠️ Could not write telemetry: {e}")
+            self._path = None
+
+    def _rotate(self, path: Path) -> None:
+        backups = self._settings.backups
+        if backups <= 0:
+            path.unlink()
+            return
+        oldest = path.with_name(f"{path.name}.{backups}")
+        if oldest.exists():
+            oldest.unlink()
+        for index in range(backups - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{index}")
+            if older.exists():
+                older.replace(path.with_name(f"{path.name}.{index + 1}"))
+        path.replace(path.with_name(f"{path.name}.1"))
+
+
+_telemetry = Telemetry(TelemetrySettings(path=""))
+
+
+def configure_telemetry(settings: TelemetrySettings) -> None:
+    global _telemetry
+    _telemetry = Telemetry(settings)
+
+
+def get_telemetry() -> Telemetry:
+    """Process-wide telemetry shared by every client."""
+    return _telemetry
@@ -2,20 +2,21 @@
 
 from __future__ import annotations
 
-import pyperclip
-import time
-from typing import Optional
+from .selection import copy_to_clipboard, get_selection, replace_selection, select_all_text
 
 
 class TextSelector:
-    """Handles text selection and clipboard operations."""
+    """Handles text selection and clipboard operations.
+
+    A thin facade over ``selection``, which does the actual capture and
+    paste-back (including giving the user's clipboard back).
+    """
 
     @staticmethod
     def get_selected_text() -> str:
-        """Get currently selected text from clipboard."""
+        """Get the currently selected text (empty if nothing is selected)."""
         try:
-            # Try to get from clipboard (Ctrl+C copies selection)
-            return pyperclip.paste()
+            return get_selection(select_all_fallback=False).text
         except Exception:
             return ""
 
@@ -23,35 +24,15 @@ class TextSelector:
     def select_all_in_window() -> str:
         """
         Select all text in the current window.
-        
+
         Does:
         1. Sends Ctrl+A to select all
         2. Sends Ctrl+C to copy
-        3. Waits for clipboard
+        3. Waits for the clipboard to change
         4. Returns selected text
         """
         try:
-            import pynput.keyboard as keyboard
-            
-            controller = keyboard.Controller()
-            
-            # Select all (Ctrl+A)
-            with controller.pressed(keyboard.Key.ctrl):
-                controller.press(keyboard.Key.a)
-                controller.release(keyboard.Key.a)
-            
-            time.sleep(0.1)  # Wait for selection
-            
-            # Copy (Ctrl+C)
-            with controller.pressed(keyboard.Key.ctrl):
-                controller.press(keyboard.Key.c)
-                controller.release(keyboard.Key.c)
-            
-            time.sleep(0.2)  # Wait for copy
-            
-            # Get from clipboard
-            text = pyperclip.paste()
-            return text
+            return select_all_text()
         except Exception as e:
             print(f"Error selecting all text: {e}")
             return ""
@@ -60,26 +41,15 @@ class TextSelector:
     def paste_to_window(text: str) -> bool:
         """
         Paste text back to the current window.
-        
+
         Does:
         1. Puts text in clipboard
         2. Sends Ctrl+V to paste
-        3. Returns success
+        3. Restores the clipboard once the window has read it
+        4. Returns success
         """
         try:
-            import pynput.keyboard as keyboard
-            
-            # Put text in clipboard
-            pyperclip.copy(text)
-            time.sleep(0.1)
-            
-            controller = keyboard.Controller()
-            
-            # Paste (Ctrl+V)
-            with controller.pressed(keyboard.Key.ctrl):
-                controller.press(keyboard.Key.v)
-                controller.release(keyboard.Key.v)
-            
+            replace_selection(text)
             return True
         except Exception as e:
             print(f"Error pasting text: {e}")
@@ -89,8 +59,7 @@ class TextSelector:
     def copy_text_to_clipboard(text: str) -> bool:
         """Copy text to clipboard."""
         try:
-            pyperclip.copy(text)
+            copy_to_clipboard(text)
             return True
         except Exception:
             return False
-
@@ -14,7 +14,7 @@ if TYPE_CHECKING:
     from .audio_engine import AudioEngine
     from ..ui.widgets.floating_player import FloatingPlayer
 
-from .selection import get_selection
+from .selection import copy_to_clipboard, get_selection
 
 
 class TTSHotkeyService:
@@ -29,8 +29,6 @@ class TTSHotkeyService:
         Get selected text, copy it to clipboard, and speak it.
         This is the function called by the hotkey.
         """
-        import pyperclip
-        
         # Get selected text
         selection = get_selection().text
         
@@ -46,7 +44,7 @@ class TTSHotkeyService:
 
         # Auto-copy to clipboard
         try:
-            pyperclip.copy(selection)
+            copy_to_clipboard(selection)
             print(f"📋 Copied to clipboard: {selection[:50]}...")
         except Exception as e:
             print(f"⚠️ Could not copy to clipboard: {e}")
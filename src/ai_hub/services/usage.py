@@ -0,0 +1,94 @@
+"""Per-request token usage, including prompt tokens served from the provider's prefix cache."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+
+@dataclass(slots=True)
+class RequestUsage:
+    provider: str
+    model: str
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    latency: float = 0.0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+def openai_usage(usage: Optional[Mapping[str, Any]]) -> tuple[int, int, int]:
+    """``(prompt, cached, output)`` tokens from a Chat Completions ``usage`` object."""
+    if not usage:
+        return 0, 0, 0
+    details = usage.get("prompt_tokens_details") or {}
+    return (
+        int(usage.get("prompt_tokens") or 0),
+        int(details.get("cached_tokens") or 0),
+        int(usage.get("completion_tokens") or 0),
+    )
+
+
+def anthropic_usage(usage: Optional[Mapping[str, Any]]) -> tuple[int, int, int]:
+    """``(prompt, cached, output)`` tokens from a Messages ``usage`` object.
+
+    Anthropic reports cache reads and writes separately from ``input_tokens``;
+    all three are prompt tokens.
+    """
+    if not usage:
+        return 0, 0, 0
+    cached = int(usage.get("cache_read_input_tokens") or 0)
+    prompt = int(usage.get("input_tokens") or 0) + cached + int(usage.get("cache_creation_input_tokens") or 0)
+    return prompt, cached, int(usage.get("output_tokens") or 0)
+
+
+class UsageLog:
+    """Recent request usage plus running totals, to check that prefix caching pays off."""
+
+    def __init__(self, size: int = 500):
+        self._recent: deque[RequestUsage] = deque(maxlen=size)
+        self._totals: dict[tuple[str, str], RequestUsage] = {}
+        self._lock = threading.Lock()
+
+    def record(self, usage: RequestUsage) -> None:
+        with self._lock:
+            self._recent.append(usage)
+            total = self._totals.setdefault((usage.provider, usage.model), RequestUsage(usage.provider, usage.model))
+            total.prompt_tokens += usage.prompt_tokens
+            total.cached_tokens += usage.cached_tokens
+            total.output_tokens += usage.output_tokens
+            total.latency += usage.latency
+
+    def recent(self) -> list[RequestUsage]:
+        with self._lock:
+            return list(self._recent)
+
+    def totals(self) -> list[RequestUsage]:
+        """One summed ``RequestUsage`` per provider/model (``latency`` is the total seconds)."""
+        with self._lock:
+            return [RequestUsage(t.provider, t.model, t.prompt_tokens, t.cached_tokens, t.output_tokens, t.latency)
+                    for t in self._totals.values()]
+
+
+_log = UsageLog()
+
+
+def get_usage_log() -> UsageLog:
+    """Process-wide usage log shared by every client."""
+    return _log
+
+
+def record_usage(
+    provider: str,
+    model: str,
+    tokens: tuple[int, int, int],
+    latency: float,
+) -> None:
+    """Record one request's ``(prompt, cached, output)`` tokens; skipped when the server reported none."""
+    if any(tokens):
+        _log.record(RequestUsage(provider, model, *tokens, latency=latency))
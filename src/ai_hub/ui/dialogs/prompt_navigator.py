@@ -12,17 +12,24 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 
-from ...services.openai_client import OpenAIClient
+from ...services.openai_client import ErrorReply, OpenAIClient
 from ...services.prompt_manager import Prompt
 from ...services.selection import get_selection, replace_selection
+from ...services.cancellation import CancelToken
+from ...services.edit_list import run_prompt
+from ...services.single_flight import flight_key, get_single_flight, run_paste_request
+from ...services.speculation import Speculator
+from ...services.telemetry import prompt_label
 from .result_popup import ResultPopup
 
 
 class PromptNavigator(QDialog):
-    def __init__(self, client: OpenAIClient, prompts: list[Prompt]):
+    def __init__(self, client: OpenAIClient, prompts: list[Prompt], speculator: Speculator | None = None):
         super().__init__()
         self._client = client
         self._prompts = prompts
+        self._speculator = speculator
+        self._selection: str | None = None
         self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.Tool | Qt.FramelessWindowHint)
         self.setWindowTitle("Prompt Navigator")
         self._build_ui()
@@ -38,6 +45,13 @@ class PromptNavigator(QDialog):
         self.prompt_list.setCurrentRow(0)
 
     def show_near_cursor(self) -> None:
+        if self._speculator is not None:
+            # Copy the selection before the navigator takes focus, and start the
+            # usual prompt on it while the user is still choosing.
+            self._selection = get_selection().text
+            likely = self._speculator.start(self._prompts, self._selection)
+            if likely is not None:
+                self.prompt_list.setCurrentRow(self._prompts.index(likely))
         pos = QCursor.pos()
         self.move(pos)
         self.show()
@@ -54,25 +68,54 @@ class PromptNavigator(QDialog):
             return
         super().keyPressEvent(event)
 
+    def closeEvent(self, event):  # pragma: no cover - Qt
+        if self._speculator is not None:
+            self._speculator.cancel()
+        self._selection = None
+        super().closeEvent(event)
+
     def run_selected(self) -> None:
         index = self.prompt_list.currentRow()
         if index < 0:
             self.close()
             return
         prompt = self._prompts[index]
-        selection = get_selection().text
+        selection = self._selection if self._selection is not None else get_selection().text
         if not selection.strip():
             self.close()
             return
+        speculative = None
+        if self._speculator is not None:
+            self._speculator.history.record(prompt.name)
+            speculative = self._speculator.take(prompt, selection)
 
         def run() -> None:
-            output = self._client.chat(prompt.system or None, prompt.build_message(selection), prompt.temperature)
-            if not output.strip():
+            if not prompt.replace:
+                cancel = speculative.cancel if speculative else CancelToken()
+                with prompt_label(prompt.name):
+                    get_single_flight().do(
+                        flight_key(prompt.name, selection),
+                        lambda: ResultPopup.show_stream(
+                            prompt.name,
+                            speculative.stream() if speculative else self._client.chat_stream(prompt.system or None, prompt.build_message(selection), prompt.temperature, cancel),
+                            cancel,
+                        ),
+                    )
+                return
+
+            def request(cancel: CancelToken) -> str:
+                if speculative is None:
+                    return run_prompt(self._client, prompt, selection, cancel)
+                cancel.on_cancel(speculative.cancel.cancel)
+                return speculative.result()
+
+            output = run_paste_request(flight_key(prompt.name, selection), request)
+            if output is None:
                 return
-            if prompt.replace:
+            if isinstance(output, ErrorReply):
+                print(f"⚠️ {output.strip()}")
+            elif output.strip():
                 replace_selection(output)
-            else:
-                ResultPopup.show_text(prompt.name, output)
 
         threading.Thread(target=run, daemon=True).start()
         self.close()
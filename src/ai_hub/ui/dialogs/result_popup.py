@@ -1,31 +1,105 @@
 from __future__ import annotations
 
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QDialog, QPushButton, QTextEdit, QVBoxLayout
+import threading
+from typing import Iterable, Optional
 
+from PySide6.QtCore import QThread, QTimer, Qt, Signal, Slot
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import QApplication, QDialog, QPushButton, QTextEdit, QVBoxLayout
+
+from ...services.cancellation import CancelToken
 from ...services.selection import copy_to_clipboard
 
 
-class ResultPopup:
-    @staticmethod
-    def show_text(title: str, content: str) -> None:
-        dialog = QDialog()
-        dialog.setWindowTitle(title)
-        dialog.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.Tool)
-        layout = QVBoxLayout(dialog)
+class ResultPopup(QDialog):
+    text_received = Signal(str)
+
+    # Keeps modeless popups alive until the user closes them.
+    _open_popups: set["ResultPopup"] = set()
+
+    def __init__(self, title: str, content: str = ""):
+        super().__init__()
+        self._content = content
+        self.setWindowTitle(title)
+        self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.Tool)
+        layout = QVBoxLayout(self)
 
-        text = QTextEdit(dialog)
-        text.setReadOnly(True)
-        text.setPlainText(content)
-        layout.addWidget(text)
+        self._text = QTextEdit(self)
+        self._text.setReadOnly(True)
+        self._text.setPlainText(content)
+        layout.addWidget(self._text)
 
-        button = QPushButton("Copy & Close", dialog)
+        button = QPushButton("Copy & Close", self)
         layout.addWidget(button)
+        button.clicked.connect(self._on_copy)
 
-        def on_copy() -> None:
-            copy_to_clipboard(content)
-            dialog.accept()
+        self.text_received.connect(self.append_text)
+        self.finished.connect(lambda _: ResultPopup._open_popups.discard(self))
+        self.resize(680, 420)
 
-        button.clicked.connect(on_copy)
-        dialog.resize(680, 420)
+    @Slot(str)
+    def append_text(self, delta: str) -> None:
+        self._content += delta
+        cursor = self._text.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(delta)
+
+    def _on_copy(self) -> None:
+        copy_to_clipboard(self._content)
+        self.accept()
+
+    @staticmethod
+    def show_text(title: str, content: str) -> None:
+        dialog = ResultPopup(title, content)
         dialog.exec()
+
+    @staticmethod
+    def show_stream(title: str, chunks: Iterable[str], cancel: Optional[CancelToken] = None) -> str:
+        """Open a popup on the first chunk and append the rest as they arrive.
+
+        Meant to be called from a worker thread: the dialog itself is created
+        on the GUI thread and fed through a queued signal. Closing the popup
+        cancels ``cancel`` so the stream stops. Returns the text received.
+        """
+        popup: ResultPopup | None = None
+        opened = False
+        parts: list[str] = []
+        for delta in chunks:
+            if not delta:
+                continue
+            parts.append(delta)
+            if opened:
+                if popup is not None:
+                    popup.text_received.emit(delta)
+            elif "".join(parts).strip():
+                opened = True
+                popup = ResultPopup._open_on_gui_thread(title, cancel)
+                if popup is not None:
+                    popup.text_received.emit("".join(parts))
+        return "".join(parts)
+
+    @staticmethod
+    def _open_on_gui_thread(title: str, cancel: Optional[CancelToken] = None) -> "ResultPopup | None":
+        app = QApplication.instance()
+        if app is None:
+            return None
+
+        created: list[ResultPopup] = []
+        ready = threading.Event()
+
+        def create() -> None:
+            popup = ResultPopup(title)
+            if cancel is not None:
+                popup.finished.connect(lambda _: cancel.cancel())
+            ResultPopup._open_popups.add(popup)
+            popup.show()
+            popup.raise_()
+            created.append(popup)
+            ready.set()
+
+        if QThread.currentThread() == app.thread():
+            create()
+        else:
+            QTimer.singleShot(0, app, create)
+            ready.wait(5.0)
+        return created[0] if created else None
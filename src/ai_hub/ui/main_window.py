@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import threading
 from typing import Callable
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QAction, QIcon
 from PySide6.QtWidgets import QApplication, QMainWindow, QMenu, QMessageBox, QSystemTrayIcon, QTabWidget
 
 from ..config import AppSettings
 from ..hotkeys.global_hotkeys import GlobalHotkeys, HotkeyCallbacks
 from ..hotkeys.hotstrings import AIHotstrings, HotstringEngine
+from ..services.clipboard_watch import watch_qt_clipboard
+from ..services.hotkey_registry import get_hotkey_registry
 from ..services.openai_client import OpenAIClient
 from ..services.prompt_manager import Prompt, default_prompts
+from ..services.response_cache import ResponseCache
+from ..services.speculation import PromptHistory, Speculator
 from ..services.window_manager import get_window_settings
 from ..ui.tabs.audio_tab import AudioTab
 from ..ui.tabs.chat_tab import ChatTab
@@ -27,8 +32,12 @@ from pathlib import Path
 
 
 class MainWindow(QMainWindow):
+    # Hotkeys fire on the key dispatcher's worker; widgets may only be touched on the GUI thread.
+    _ui_call = Signal(object)
+
     def __init__(self, settings: AppSettings):
         super().__init__()
+        self._ui_call.connect(self._run_ui_call)  # queued: the window lives on the GUI thread
         self.setWindowTitle("AI Hub")
         self.resize(1000, 720)
 
@@ -36,7 +45,7 @@ class MainWindow(QMainWindow):
         self._apply_dark_theme()
 
         self._settings = settings
-        self._client = OpenAIClient(settings.openai)
+        self._client = OpenAIClient(settings.openai, cache=ResponseCache(settings.cache))
         
         # Show warning if API key is missing
         if not settings.openai.api_key or settings.openai.api_key.startswith("sk-your"):
@@ -83,6 +92,12 @@ class MainWindow(QMainWindow):
 
         self._tabs.currentChanged.connect(self._on_tab_changed)
 
+        self._hotstrings_engine = HotstringEngine(
+            buffer_size=settings.hotstrings.buffer_size,
+            enabled=settings.hotstrings.enabled_by_default,
+        )
+        self._register_default_hotstrings()
+
         self._hotkeys = GlobalHotkeys(
             client=self._client,
             prompts=self._prompts,
@@ -91,66 +106,31 @@ class MainWindow(QMainWindow):
             prompt_hotkey=settings.hotkeys.prompt_navigator,
             spelling_hotkey=settings.hotkeys.spelling,
             goto_hotkey=settings.hotkeys.goto_hub,
+            speculator=(
+                Speculator(self._client, PromptHistory(settings.speculation.history_path), settings.speculation.min_picks)
+                if settings.speculation.enabled else None
+            ),
+            hotstrings=self._hotstrings_engine,  # plus the Hotstring entries of config/shortcuts.json
         )
-        self._hotkeys.start()
+        # The app's own hotkeys first, so they win over shortcuts.json and clipboard item hotkeys.
+        registry = get_hotkey_registry()
+        # Window actions go to the GUI thread and TTS (which copies the selection) to its own
+        # thread, so neither holds up the key worker.
+        registry.bind("main window", settings.hotkeys.toggle_hotstrings, self._on_ui_thread(self._toggle_hotstrings), "Toggle hotstrings")
+        # TTS hotkey (CapsLock+A); CapsLock acts as a modifier when held down
+        registry.bind("main window", "capslock+a", self._speak_selection_hotkey, "Speak selection")
+        registry.bind("main window", "ctrl+alt+g", self._on_ui_thread(self.toggle_window_visibility), "Show/hide window")
+        registry.bind("main window", "ctrl+alt+c", self._on_ui_thread(self._show_clipboard_manager), "Clipboard manager")
 
-        self._hotstrings_engine = HotstringEngine(
-            buffer_size=settings.hotstrings.buffer_size,
-            enabled=settings.hotstrings.enabled_by_default,
-        )
-        self._register_default_hotstrings()
+        self._hotkeys.start()
         self._hotstrings_engine.start()
 
-        keyboard = __import__("keyboard")
-        keyboard.add_hotkey(
-            settings.hotkeys.toggle_hotstrings,
-            self._toggle_hotstrings,
-            suppress=False,
-            trigger_on_release=True,
-        )
-        
-        # Register TTS hotkey (CapsLock+A)
-        # Note: CapsLock acts as a modifier when held down
-        try:
-            keyboard.add_hotkey(
-                "capslock+a",
-                self._trigger_tts_from_selection,
-                suppress=False,
-                trigger_on_release=True,
-            )
-            print("✅ TTS Hotkey registered: CapsLock+A")
-        except Exception as e:
-            print(f"⚠️ Could not register TTS hotkey: {e}")
-        
-        # Register Ctrl+Alt+G hotkey to show/hide main window
-        try:
-            keyboard.add_hotkey(
-                "ctrl+alt+g",
-                self.toggle_window_visibility,
-                suppress=False,
-                trigger_on_release=True,
-            )
-            print("✅ Window Toggle Hotkey registered: Ctrl+Alt+G")
-        except Exception as e:
-            print(f"⚠️ Could not register window toggle hotkey: {e}")
-        
         # Clipboard Manager
         clipboard_storage = Path("config/clipboard_history.json")
         self._clipboard_window = ClipboardWindow(clipboard_storage)
         self._clipboard_hotkey_service = ClipboardHotkeyService(self._clipboard_window.manager)
         self._clipboard_hotkey_service.register_all()
-        
-        # Register Ctrl+Alt+C hotkey to show clipboard manager
-        try:
-            keyboard.add_hotkey(
-                "ctrl+alt+c",
-                self._show_clipboard_manager,
-                suppress=False,
-                trigger_on_release=True,
-            )
-            print("✅ Clipboard Manager Hotkey registered: Ctrl+Alt+C")
-        except Exception as e:
-            print(f"⚠️ Could not register clipboard manager hotkey: {e}")
+        registry.report()
         
         # Connect window manager signals
         self.window_control_panel.always_on_top_changed.connect(self._apply_always_on_top)
@@ -272,6 +252,20 @@ class MainWindow(QMainWindow):
         self.activateWindow()
         self._tabs.setCurrentIndex(0)
 
+    def _on_ui_thread(self, action: Callable[[], None]) -> Callable[[], None]:
+        """A hotkey callback that queues ``action`` for the GUI thread and returns at once."""
+        def callback() -> None:
+            self._ui_call.emit(action)
+
+        callback.__name__ = getattr(action, "__name__", "ui action")
+        return callback
+
+    def _run_ui_call(self, action: Callable[[], None]) -> None:
+        action()
+
+    def _speak_selection_hotkey(self) -> None:
+        threading.Thread(target=self._trigger_tts_from_selection, daemon=True).start()
+
     def _toggle_hotstrings(self) -> None:
         new_state = not self._hotstrings_engine.enabled
         self._hotstrings_engine.set_enabled(new_state)
@@ -463,6 +457,7 @@ class MainWindow(QMainWindow):
 
 def run_app(settings: AppSettings) -> None:
     app = QApplication.instance() or QApplication([])
+    watch_qt_clipboard()
     window = MainWindow(settings)
     window.show()
     app.exec()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import threading
 
 from PySide6.QtCore import Signal, Slot
+from PySide6.QtGui import QTextCursor
 from PySide6.QtWidgets import QLabel, QPushButton, QTextEdit, QVBoxLayout
 
 from ...services.openai_client import OpenAIClient
@@ -11,6 +12,7 @@ from ..tabs.base import BaseTab
 
 class ChatTab(BaseTab):
     request_started = Signal()
+    request_delta = Signal(str)
     request_finished = Signal(str)
 
     def __init__(self, client: OpenAIClient, system_default: str = "You are a helpful assistant."):
@@ -18,7 +20,9 @@ class ChatTab(BaseTab):
         self._client = client
         self._system_default = system_default
         self._build_ui()
+        self._received_delta = False
         self.request_started.connect(self._on_request_started)
+        self.request_delta.connect(self._on_request_delta)
         self.request_finished.connect(self._on_request_finished)
 
     def _build_ui(self) -> None:
@@ -53,16 +57,30 @@ class ChatTab(BaseTab):
 
         def run() -> None:
             self.request_started.emit()
-            reply = self._client.chat(system, message)
-            self.request_finished.emit(reply)
+            parts: list[str] = []
+            for delta in self._client.chat_stream(system, message):
+                parts.append(delta)
+                self.request_delta.emit(delta)
+            self.request_finished.emit("".join(parts))
 
         threading.Thread(target=run, daemon=True).start()
 
     @Slot()
     def _on_request_started(self) -> None:
+        self._received_delta = False
         self.response_output.setPlainText("Thinking...")
         self.send_button.setEnabled(False)
 
+    @Slot(str)
+    def _on_request_delta(self, delta: str) -> None:
+        if not self._received_delta:
+            self._received_delta = True
+            self.response_output.clear()
+        cursor = self.response_output.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(delta)
+        self.response_output.setTextCursor(cursor)
+
     @Slot(str)
     def _on_request_finished(self, reply: str) -> None:
         self.response_output.setPlainText(reply)
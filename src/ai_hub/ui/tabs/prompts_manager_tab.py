@@ -30,7 +30,7 @@ from PySide6.QtWidgets import (
     QDoubleSpinBox,
 )
 
-from ...services.openai_client import OpenAIClient
+from ...services.openai_client import ErrorReply, OpenAIClient
 from ...services.selection import get_selection, replace_selection
 from ..dialogs.result_popup import ResultPopup
 from .base import BaseTab
@@ -479,6 +479,9 @@ class PromptsManagerTab(BaseTab):
                 # Call AI
                 output = self._client.chat(system, user_message, temperature)
                 
+                if isinstance(output, ErrorReply):
+                    self.status_label.setText(f"❌ {output.strip()}")
+                    return
                 if not output.strip():
                     self.status_label.setText("❌ No response from AI")
                     return
@@ -10,9 +10,10 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 
-from ...services.openai_client import OpenAIClient
+from ...services.openai_client import ErrorReply, OpenAIClient
 from ...services.prompt_manager import Prompt
 from ...services.selection import get_selection, replace_selection
+from ...services.telemetry import prompt_label
 from ..dialogs.result_popup import ResultPopup
 from ..tabs.base import BaseTab
 
@@ -47,12 +48,14 @@ class PromptsTab(BaseTab):
             return
 
         def run() -> None:
-            output = self._client.chat(prompt.system or None, prompt.build_message(selection), prompt.temperature)
-            if not output.strip():
-                return
-            if prompt.replace:
+            with prompt_label(prompt.name):
+                if not prompt.replace:
+                    ResultPopup.show_stream(prompt.name, self._client.chat_stream(prompt.system or None, prompt.build_message(selection), prompt.temperature))
+                    return
+                output = self._client.chat(prompt.system or None, prompt.build_message(selection), prompt.temperature)
+            if isinstance(output, ErrorReply):
+                print(f"⚠️ {output.strip()}")
+            elif output.strip():
                 replace_selection(output)
-            else:
-                ResultPopup.show_text(prompt.name, output)
 
         threading.Thread(target=run, daemon=True).start()
@@ -350,8 +350,8 @@ class SearchScraperTab(QWidget):
             QMessageBox.warning(self, "No Results", "No results to copy!")
             return
         
-        import pyperclip
-        pyperclip.copy('\n'.join(self._results))
+        from ...services.selection import copy_to_clipboard
+        copy_to_clipboard('\n'.join(self._results))
         self.status_label.setText(f"✅ Copied {len(self._results)} links to clipboard!")
     
     def _save_results(self, format: str):
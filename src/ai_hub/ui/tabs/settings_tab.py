@@ -6,19 +6,28 @@ Centralized settings panel for all toggleable options.
 
 from __future__ import annotations
 
-from PySide6.QtCore import Signal
+from PySide6.QtCore import Signal, QTimer
 from PySide6.QtWidgets import (
     QCheckBox,
     QGroupBox,
+    QHeaderView,
     QLabel,
     QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
+from ...services.clipboard_snapshot import snapshot_stats
+from ...services.key_dispatcher import dispatch_stats
+from ...services.telemetry import get_telemetry
 from ..tabs.base import BaseTab
 
 
+PERFORMANCE_COLUMNS = ("Prompt", "Provider", "Calls", "Errors", "Cached", "p50 (ms)", "p95 (ms)", "TTFT p50 (ms)", "Tokens/s")
+
+
 class SettingsTab(BaseTab):
     """Settings and preferences tab."""
 
@@ -101,6 +110,41 @@ class SettingsTab(BaseTab):
         hotkeys_group.setLayout(hotkeys_layout)
         layout.addWidget(hotkeys_group)
 
+        # --- PERFORMANCE ---
+        performance_group = QGroupBox("📊 Performance")
+        performance_layout = QVBoxLayout()
+
+        self.performance_table = QTableWidget(0, len(PERFORMANCE_COLUMNS))
+        self.performance_table.setHorizontalHeaderLabels(PERFORMANCE_COLUMNS)
+        self.performance_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.performance_table.verticalHeader().setVisible(False)
+        self.performance_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.performance_table.setToolTip("Rolling latency of recent AI requests, slowest first")
+        performance_layout.addWidget(self.performance_table)
+
+        self.clipboard_performance_label = QLabel()
+        self.clipboard_performance_label.setToolTip("Time spent saving and restoring your clipboard around hotkeys")
+        performance_layout.addWidget(self.clipboard_performance_label)
+
+        self.keyboard_performance_label = QLabel()
+        self.keyboard_performance_label.setToolTip(
+            "Time the keyboard hook spends on each key (should stay well under a millisecond), "
+            "and how long hotkey actions wait for and hold the worker that runs them"
+        )
+        performance_layout.addWidget(self.keyboard_performance_label)
+
+        refresh_performance_btn = QPushButton("🔄 Refresh")
+        refresh_performance_btn.clicked.connect(self.refresh_performance)
+        performance_layout.addWidget(refresh_performance_btn)
+
+        performance_group.setLayout(performance_layout)
+        layout.addWidget(performance_group)
+
+        self._performance_timer = QTimer(self)
+        self._performance_timer.timeout.connect(self.refresh_performance)
+        self._performance_timer.start(5000)
+        self.refresh_performance()
+
         # --- ACTIONS ---
         actions_group = QGroupBox("🔧 Actions")
         actions_layout = QVBoxLayout()
@@ -135,6 +179,41 @@ class SettingsTab(BaseTab):
         # For now, using defaults
         pass
 
+    def refresh_performance(self) -> None:
+        """Fill the performance table from the recent request telemetry."""
+        if not self.isVisible() and self.performance_table.rowCount():
+            return
+        rows = get_telemetry().summary()
+        self.performance_table.setRowCount(len(rows))
+        for row, summary in enumerate(rows):
+            values = (
+                summary.prompt or "(other)",
+                summary.provider,
+                str(summary.count),
+                str(summary.errors),
+                str(summary.cache_hits),
+                f"{summary.latency_p50 * 1000:.0f}",
+                f"{summary.latency_p95 * 1000:.0f}",
+                f"{summary.ttft_p50 * 1000:.0f}",
+                f"{summary.tokens_per_sec:.0f}",
+            )
+            for column, value in enumerate(values):
+                self.performance_table.setItem(row, column, QTableWidgetItem(value))
+
+        clipboard = snapshot_stats()
+        self.clipboard_performance_label.setText(
+            f"Clipboard: {clipboard.snapshots} snapshots, p50 {clipboard.snapshot_p50 * 1000:.1f} ms / "
+            f"p95 {clipboard.snapshot_p95 * 1000:.1f} ms; {clipboard.restores} restores, "
+            f"p50 {clipboard.restore_p50 * 1000:.1f} ms / p95 {clipboard.restore_p95 * 1000:.1f} ms "
+            f"({clipboard.skipped_restores} skipped); largest {clipboard.largest_bytes / 1024:.0f} KB"
+        )
+        keys = dispatch_stats()
+        self.keyboard_performance_label.setText(
+            f"Keyboard hook: p50 {keys.hook_p50 * 1e6:.0f} µs / p95 {keys.hook_p95 * 1e6:.0f} µs / "
+            f"max {keys.hook_max * 1e6:.0f} µs over {keys.events} events; actions queued p95 "
+            f"{keys.wait_p95 * 1000:.0f} ms, ran p95 {keys.run_p95 * 1000:.0f} ms; {keys.backlog} waiting"
+        )
+
     def _on_auto_copy_changed(self, state: int) -> None:
         """Handle auto-copy toggle."""
         from PySide6.QtCore import Qt
@@ -5,7 +5,8 @@ import threading
 from PySide6.QtWidgets import QLabel, QPushButton, QVBoxLayout, QTextEdit, QHBoxLayout
 from PySide6.QtCore import Qt
 
-from ...services.openai_client import OpenAIClient
+from ...services.edit_list import run_prompt
+from ...services.openai_client import ErrorReply, OpenAIClient
 from ...services.prompt_manager import Prompt
 from ...services.selection import get_selection, replace_selection
 from ..tabs.base import BaseTab
@@ -56,12 +57,10 @@ class SpellingTab(BaseTab):
         self._original_text = text
         
         def run() -> None:
-            output = self._client.chat(
-                self._prompt.system or None, 
-                self._prompt.build_message(text), 
-                self._prompt.temperature
-            )
-            if output.strip():
+            output = run_prompt(self._client, self._prompt, text)
+            if isinstance(output, ErrorReply):
+                print(f"⚠️ {output.strip()}")
+            elif output.strip():
                 # Update text field with fixed version
                 self._text_edit.setPlainText(output)
 
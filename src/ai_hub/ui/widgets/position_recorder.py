@@ -174,10 +174,10 @@ class PositionRecorder(QWidget):
         if not self.recorded_positions:
             return
         
-        import pyperclip
+        from ...services.selection import copy_to_clipboard
         x, y = self.recorded_positions[-1]
         text = f"{x}, {y}"
-        pyperclip.copy(text)
+        copy_to_clipboard(text)
         
         self.recorded_label.setText(
             self.recorded_label.text() + 
@@ -360,8 +360,8 @@ class ClipboardWindow(QWidget):
         """Copy preview content to clipboard."""
         content = self.preview_text.toPlainText()
         if content:
-            import pyperclip
-            pyperclip.copy(content)
+            from ...services.selection import copy_to_clipboard
+            copy_to_clipboard(content)
             self.status_label.setText("✅ Preview copied to clipboard!")
     
     def _clear_unpinned(self):
@@ -0,0 +1,94 @@
+"""The async request path: a 429 is retried, not raised, and cached replies are reused."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from ai_hub.config import CacheSettings, HTTPSettings, OpenAISettings, RateLimitSettings
+from ai_hub.services import http_transport
+from ai_hub.services.openai_client import ErrorReply, OpenAIClient
+from ai_hub.services.rate_limiter import RateLimiter, asend_with_retries, configure_rate_limits, send_with_retries
+from ai_hub.services.response_cache import ResponseCache
+
+
+ENDPOINT = "http://api.test/v1/chat/completions"
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    configure_rate_limits(RateLimitSettings(requests_per_minute=0, tokens_per_minute=0))
+    transport = http_transport.configure_transport(HTTPSettings())
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"retry-after": "0"}, json={"error": {"message": "slow down"}})
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Fixed."}}]})
+
+    monkeypatch.setattr(http_transport, "HAVE_HTTPX", True)
+    monkeypatch.setattr(
+        transport, "_async_client_for", lambda url: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    yield calls
+    configure_rate_limits(RateLimitSettings())
+
+
+def test_achat_retries_after_429(transport):
+    client = OpenAIClient(OpenAISettings(api_key="sk-test", endpoint=ENDPOINT, model="gpt-4o-mini", timeout=10))
+
+    reply = asyncio.run(client.achat(None, "Their going home."))
+
+    assert not isinstance(reply, ErrorReply), reply
+    assert reply == "Fixed."
+    assert len(transport) == 2
+
+
+def test_achat_serves_repeat_from_cache(transport, tmp_path):
+    cache = ResponseCache(CacheSettings(path=str(tmp_path / "cache.sqlite3")))
+    client = OpenAIClient(OpenAISettings(api_key="sk-test", endpoint=ENDPOINT, model="gpt-4o-mini", timeout=10), cache)
+
+    first = asyncio.run(client.achat(None, "Their going home.", temperature=0.0))
+    second = asyncio.run(client.achat(None, "Their going home.", temperature=0.0))
+
+    assert first == second == "Fixed."
+    assert len(transport) == 2  # the 429 and the one answer; the repeat never reached the server
+
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.headers = {"retry-after": "0"}
+
+    def close(self) -> None:
+        pass
+
+
+class RecordingLimiter(RateLimiter):
+    def __init__(self) -> None:
+        super().__init__(0, 0)
+        self.reserved: list[int] = []
+
+    def reserve(self, tokens: int = 0) -> float:
+        self.reserved.append(tokens)
+        return super().reserve(tokens)
+
+
+def test_retries_take_the_prompt_tokens_once(transport):
+    limiter = RecordingLimiter()
+    responses = iter([FakeResponse(503), FakeResponse(502), FakeResponse(200)])
+    assert send_with_retries(limiter, lambda: next(responses), tokens=1200).status_code == 200
+    assert limiter.reserved == [1200, 0, 0]
+
+    limiter = RecordingLimiter()
+    responses = iter([FakeResponse(429), FakeResponse(200)])
+
+    async def send():
+        return next(responses)
+
+    assert asyncio.run(asend_with_retries(limiter, send, tokens=1200)).status_code == 200
+    assert limiter.reserved == [1200, 0]
@@ -0,0 +1,92 @@
+"""Waiting for a copy to land on a clipboard with a sequence number."""
+
+from __future__ import annotations
+
+import pytest
+
+from ai_hub.config import ClipboardSettings
+from ai_hub.services.backends import configure_backends
+from ai_hub.services.clipboard_watch import ClipboardWatcher
+
+
+class EmptiedClipboard:
+    """A clipboard whose number moves at EmptyClipboard, before the new text is set."""
+
+    def __init__(self) -> None:
+        self.text = "old"
+        self.number = 1
+        self.holds_text = True
+
+    def get_text(self) -> str:
+        return self.text if self.holds_text else ""
+
+    def set_text(self, text: str) -> None:
+        self.empty()
+        self.text, self.holds_text = text, True
+        self.number += 1
+
+    def clear(self) -> None:
+        self.empty()
+
+    def empty(self) -> None:
+        self.holds_text = False
+        self.number += 1
+
+    def sequence(self) -> int:
+        return self.number
+
+    def has_text(self) -> bool:
+        return self.holds_text
+
+
+@pytest.fixture
+def clipboard():
+    clipboard = EmptiedClipboard()
+    configure_backends(clipboard_backend=clipboard)
+    yield clipboard
+    configure_backends()
+
+
+def test_copy_has_not_landed_while_clipboard_is_only_emptied(clipboard):
+    watcher = ClipboardWatcher(ClipboardSettings())
+    mark = watcher.mark()
+
+    clipboard.empty()
+    assert not watcher.changed(mark)
+    assert not watcher.wait_for_change(mark, timeout=0.01)
+
+    clipboard.set_text("new")
+    assert watcher.changed(mark)
+    assert watcher.wait_for_change(mark, timeout=0.01)
+
+
+@pytest.fixture
+def slow_desktop():
+    from ai_hub.services import clipboard_watch
+    from ai_hub.services.fake_desktop import FakeApp, FakeClipboard, FakeKeyboard
+
+    app = FakeApp("Their going home. The rest of the document.", select_all=False)
+    app.selection = (0, 17)
+    clipboard = FakeClipboard()
+    keyboard = FakeKeyboard(app, clipboard, reaction_delay=0.1)
+    configure_backends(keyboard, clipboard)
+    clipboard_watch.configure_clipboard(ClipboardSettings(copy_timeout=0.5))
+    watcher = clipboard_watch.get_clipboard_watcher()
+    for _ in range(10):
+        watcher.delays.record(clipboard_watch.foreground_app(), 0.002)  # fast until now
+    yield app, watcher
+    keyboard.idle()
+    configure_backends()
+    clipboard_watch.configure_clipboard(ClipboardSettings())
+
+
+def test_slow_copy_is_not_mistaken_for_an_empty_selection(slow_desktop):
+    from ai_hub.services.clipboard_watch import foreground_app
+    from ai_hub.services.selection import get_selection
+
+    app, watcher = slow_desktop
+    learned = watcher.delays.learned(foreground_app())
+
+    assert get_selection().text == "Their going home."
+    assert app.selection == (0, 17)  # no select-all was sent
+    assert watcher.delays.learned(foreground_app()) > learned
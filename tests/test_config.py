@@ -0,0 +1,43 @@
+"""Paths in settings.ini are relative to the settings file."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from ai_hub.config import load_settings
+
+
+def test_cache_path_is_relative_to_settings_file(tmp_path, monkeypatch):
+    settings = tmp_path / "settings.ini"
+    settings.write_text("[cache]\npath = data/cache.sqlite3\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path.parent)
+
+    assert Path(load_settings(Path(tmp_path.name) / "settings.ini").cache.path) == tmp_path.resolve() / "data" / "cache.sqlite3"
+
+
+def test_default_cache_path_sits_next_to_settings_file(tmp_path):
+    settings = tmp_path / "settings.ini"
+
+    assert Path(load_settings(settings).cache.path) == tmp_path.resolve() / "config" / "response_cache.sqlite3"
+
+
+def test_absolute_cache_path_is_kept(tmp_path):
+    target = tmp_path / "elsewhere" / "cache.sqlite3"
+    settings = tmp_path / "settings.ini"
+    settings.write_text(f"[cache]\npath = {target}\n", encoding="utf-8")
+
+    assert Path(load_settings(settings).cache.path) == target
+
+
+def test_prompt_history_path_is_relative_to_settings_file(tmp_path):
+    settings = tmp_path / "settings.ini"
+
+    assert Path(load_settings(settings).speculation.history_path) == tmp_path.resolve() / "config" / "prompt_history.json"
+
+
+def test_empty_telemetry_path_stays_empty(tmp_path):
+    settings = tmp_path / "settings.ini"
+    settings.write_text("[telemetry]\npath =\n", encoding="utf-8")
+
+    assert load_settings(settings).telemetry.path == ""
+    assert Path(load_settings(tmp_path / "missing.ini").telemetry.path) == tmp_path.resolve() / "config" / "telemetry.jsonl"
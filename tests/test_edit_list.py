@@ -0,0 +1,53 @@
+"""Parsing and applying edit-list replies."""
+
+from __future__ import annotations
+
+from ai_hub.services.edit_list import Edit, apply_edits, parse_edits
+
+
+TEXT = "Their going home. Their car is red."
+
+
+def test_parse_edits_reads_fenced_json():
+    reply = '```json\n[{"offset": 0, "original": "Their", "replacement": "They\'re"}]\n```'
+
+    assert parse_edits(reply) == [Edit(0, "Their", "They're")]
+
+
+def test_parse_edits_drops_no_op_edits_and_bad_offsets():
+    reply = '[{"offset": 3, "original": "a", "replacement": "a"}, {"offset": "x", "original": "b", "replacement": "c"}]'
+
+    assert parse_edits(reply) == [Edit(0, "b", "c")]
+
+
+def test_parse_edits_rejects_malformed_replies():
+    assert parse_edits("Here are the fixes: none") is None
+    assert parse_edits('{"offset": 0}') is None
+    assert parse_edits('[{"offset": 0, "original": "", "replacement": "x"}]') is None
+    assert parse_edits('[{"offset": 0, "original": "x"}]') is None
+
+
+def test_apply_edits_ignores_offset_of_unique_original():
+    assert apply_edits(TEXT, [Edit(99, "red", "blue")]) == "Their going home. Their car is blue."
+
+
+def test_apply_edits_uses_exact_offset_between_occurrences():
+    edits = [Edit(0, "Their", "They're")]
+
+    assert apply_edits(TEXT, edits) == "They're going home. Their car is red."
+
+
+def test_apply_edits_rejects_ambiguous_original_with_wrong_offset():
+    # Nearest to offset 16 is the second "Their", which is the wrong one.
+    assert apply_edits(TEXT, [Edit(16, "Their", "They're")]) is None
+
+
+def test_apply_edits_rejects_missing_and_overlapping_edits():
+    assert apply_edits(TEXT, [Edit(0, "There", "Their")]) is None
+    assert apply_edits(TEXT, [Edit(6, "going home", "went"), Edit(12, "home.", "home!")]) is None
+
+
+def test_apply_edits_applies_several_edits():
+    edits = [Edit(30, "red", "blue"), Edit(0, "Their going", "They're going")]
+
+    assert apply_edits(TEXT, edits) == "They're going home. Their car is blue."
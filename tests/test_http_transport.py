@@ -0,0 +1,63 @@
+"""The idle reaper never closes a session that is still in use."""
+
+from __future__ import annotations
+
+import gc
+
+from ai_hub.config import HTTPSettings
+from ai_hub.services.http_transport import HTTPTransport
+
+
+URL = "http://api.test/v1/chat/completions"
+
+
+class FakeResponse:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def post(self, url, **kwargs) -> FakeResponse:
+        return FakeResponse()
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def make_transport(monkeypatch) -> HTTPTransport:
+    # A negative keep_alive makes every idle session stale at once, and starts no reaper thread.
+    transport = HTTPTransport(HTTPSettings(http2=False, keep_alive=-1))
+    monkeypatch.setattr(transport, "_create_client", FakeSession)
+    return transport
+
+
+def test_open_stream_is_not_reaped(monkeypatch):
+    transport = make_transport(monkeypatch)
+    response = transport.post(URL, stream=True)
+
+    assert transport.reap_idle() == 0
+
+    response.close()
+    assert response.closed
+    assert transport.reap_idle() == 1
+
+
+def test_unclosed_stream_is_released_when_collected(monkeypatch):
+    transport = make_transport(monkeypatch)
+    transport.post(URL, stream=True)
+    gc.collect()
+
+    assert transport.reap_idle() == 1
+
+
+def test_finished_request_is_reaped(monkeypatch):
+    transport = make_transport(monkeypatch)
+    transport.post(URL)
+
+    assert transport.reap_idle() == 1
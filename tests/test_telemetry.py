@@ -0,0 +1,42 @@
+"""Telemetry records are written to disk off the request path."""
+
+from __future__ import annotations
+
+import json
+import threading
+
+from ai_hub.config import TelemetrySettings
+from ai_hub.services.telemetry import RequestRecord, Telemetry
+
+
+def test_record_does_not_wait_for_the_disk(tmp_path, monkeypatch):
+    telemetry = Telemetry(TelemetrySettings(path=str(tmp_path / "telemetry.jsonl")))
+    release = threading.Event()
+    write = telemetry._write
+    callers = []
+
+    def slow_write(line: str) -> None:
+        callers.append(threading.current_thread())
+        release.wait(5)
+        write(line)
+
+    monkeypatch.setattr(telemetry, "_write", slow_write)
+    telemetry.record(RequestRecord("openai", "gpt-4o-mini", "summarize", False, latency=0.5))
+
+    assert len(telemetry.recent()) == 1
+    assert not telemetry.flush(timeout=0.05)
+    release.set()
+    assert telemetry.flush(timeout=5)
+    assert callers and callers[0] is not threading.current_thread()
+    lines = (tmp_path / "telemetry.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["prompt"] for line in lines] == ["summarize"]
+
+
+def test_rotates_on_the_writer_thread(tmp_path):
+    path = tmp_path / "telemetry.jsonl"
+    telemetry = Telemetry(TelemetrySettings(path=str(path), max_bytes=300, backups=1))
+    for _ in range(5):
+        telemetry.record(RequestRecord("openai", "gpt-4o-mini", "chat", True))
+    assert telemetry.flush(timeout=5)
+    assert path.exists() and path.with_name("telemetry.jsonl.1").exists()
+    assert path.stat().st_size <= 300
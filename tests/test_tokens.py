@@ -0,0 +1,68 @@
+"""Loading tiktoken encodings off the request path."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from ai_hub.services import tokens
+
+
+class FakeEncoding:
+    name = "fake"
+
+    def encode(self, text: str, disallowed_special=()) -> list[str]:
+        return text.split()
+
+
+class FakeTiktoken:
+    def __init__(self, fail: bool = False) -> None:
+        self.release = threading.Event()
+        self.calls = 0
+        self.fail = fail
+
+    def encoding_for_model(self, model: str) -> FakeEncoding:
+        self.calls += 1
+        self.release.wait(5)
+        if self.fail:
+            raise OSError("could not download the BPE file")
+        return FakeEncoding()
+
+
+def _install(monkeypatch, fake: FakeTiktoken) -> None:
+    monkeypatch.setattr(tokens, "HAVE_TIKTOKEN", True)
+    monkeypatch.setattr(tokens, "tiktoken", fake, raising=False)
+    monkeypatch.setattr(tokens, "_encodings", {})
+    monkeypatch.setattr(tokens, "_encodings_loading", set())
+
+
+def _wait_loaded(model: str) -> None:
+    deadline = time.monotonic() + 5
+    while model not in tokens._encodings and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_count_estimates_while_encoding_loads(monkeypatch):
+    fake = FakeTiktoken()
+    _install(monkeypatch, fake)
+    text = "one two three four five six seven eight"
+
+    assert tokens.count_tokens(text, "gpt-4o-mini") == tokens._estimate(text)
+    assert tokens.count_tokens(text + " nine", "gpt-4o-mini") == tokens._estimate(text + " nine")
+
+    fake.release.set()
+    _wait_loaded("gpt-4o-mini")
+    assert tokens.count_tokens(text, "gpt-4o-mini") == 8
+    assert fake.calls == 1
+
+
+def test_failed_load_is_cached(monkeypatch):
+    fake = FakeTiktoken(fail=True)
+    fake.release.set()
+    _install(monkeypatch, fake)
+
+    tokens.preload_encoding("gpt-4o-mini")
+    _wait_loaded("gpt-4o-mini")
+
+    assert tokens.count_tokens("hello there", "gpt-4o-mini") == tokens._estimate("hello there")
+    assert fake.calls == 1